@@ -0,0 +1,108 @@
+"""
+Benchmark: set-based vs. per-row bulk delete and bulk category update
+Seeds a throwaway SQLite database and volume with images (each with two
+categories, three derivatives and files on disk), then times both versions
+of each operation at several selection sizes. Deletes include removing the
+files, so the set-based timing waits for its background removal too.
+Usage: python benchmarks/bench_bulk_operations.py [sizes, e.g. 10,100,1000]
+"""
+import os
+import sys
+import time
+import uuid
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Point the app at a scratch volume before anything reads the config
+VOLUME = tempfile.mkdtemp(prefix='bench-bulk-')
+os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = VOLUME
+
+from flask import Flask
+from concurrent.futures import wait
+
+from src.config import PHOTOGRAPHY_ASSETS_DIR, DERIVATIVES_DIR
+from src.models import db, Image, Category, ImageCategory, ImageDerivative
+import src.data_version  # noqa: F401 - same session events as the app
+from src.bulk_operations import (bulk_delete_images, bulk_delete_images_per_row,
+                                 bulk_set_categories, bulk_set_categories_per_row)
+
+DERIVATIVE_WIDTHS = (480, 960, 1600)
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(VOLUME, 'bench.db')}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(count, categories):
+    """Add `count` images with files, derivatives and two categories each; returns their ids"""
+    os.makedirs(DERIVATIVES_DIR, exist_ok=True)
+    ids = []
+    for _ in range(count):
+        image_id = str(uuid.uuid4())
+        filename = f"{image_id}.jpg"
+        open(os.path.join(PHOTOGRAPHY_ASSETS_DIR, filename), 'wb').close()
+        db.session.add(Image(id=image_id, filename=filename, title='Bench'))
+        for width in DERIVATIVE_WIDTHS:
+            derivative_name = f"{image_id}_{width}.jpg"
+            open(os.path.join(DERIVATIVES_DIR, derivative_name), 'wb').close()
+            db.session.add(ImageDerivative(image_id=image_id, width=width, filename=derivative_name))
+        for category in categories[:2]:
+            db.session.add(ImageCategory(image_id=image_id, category_id=category.id))
+        ids.append(image_id)
+    db.session.commit()
+    db.session.expire_all()
+    return ids
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def delete_set_based(ids):
+    _, futures = bulk_delete_images(ids)
+    wait(futures)
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10, 100, 1000]
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        categories = [Category(name=f"bench-{n}", display_name=f"Bench {n}") for n in range(4)]
+        db.session.add_all(categories)
+        db.session.commit()
+        new_category_ids = [categories[2].id, categories[3].id]
+
+        print(f"{'images':>7}  {'operation':<18} {'per-row':>10} {'set-based':>10} {'speedup':>8}")
+        for size in sizes:
+            ids = seed(size, categories)
+            per_row = timed(lambda: bulk_set_categories_per_row(ids, new_category_ids))
+            db.session.expire_all()
+            set_based = timed(lambda: bulk_set_categories(ids, new_category_ids))
+            print(f"{size:>7}  {'category update':<18} {per_row * 1000:>8.1f}ms {set_based * 1000:>8.1f}ms "
+                  f"{per_row / set_based:>7.1f}x")
+
+            per_row = timed(lambda: bulk_delete_images_per_row(ids))
+            db.session.expire_all()
+            ids = seed(size, categories)
+            set_based = timed(lambda: delete_set_based(ids))
+            print(f"{size:>7}  {'delete':<18} {per_row * 1000:>8.1f}ms {set_based * 1000:>8.1f}ms "
+                  f"{per_row / set_based:>7.1f}x")
+
+            assert Image.query.count() == 0 and ImageCategory.query.count() == 0
+            assert not os.listdir(DERIVATIVES_DIR)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(VOLUME, ignore_errors=True)
@@ -0,0 +1,182 @@
+"""
+Benchmark: public reads while a backup snapshots the database
+Reader processes run the portfolio query in a loop and a writer commits an
+admin-style edit now and then, while the main process copies the database
+back to back with each method: the old checkpoint + file copy, the backup
+API in page steps (src.sqlite_tuning.snapshot), the backup API in one step,
+and VACUUM INTO. Reports read throughput and latency, snapshots taken, and
+how many of them failed PRAGMA integrity_check.
+Usage: python benchmarks/bench_db_snapshot.py [readers] [seconds] [images]
+"""
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import tempfile
+import statistics
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+READ_QUERY = """
+    SELECT images.id, images.filename, images.title, categories.name
+    FROM images
+    LEFT JOIN image_categories ON image_categories.image_id = images.id
+    LEFT JOIN categories ON categories.id = image_categories.category_id
+    ORDER BY images.upload_date DESC
+    LIMIT 60
+"""
+
+
+def _connect(database_path):
+    from src.sqlite_tuning import configure_connection
+    connection = sqlite3.connect(database_path)
+    configure_connection(connection)
+    return connection
+
+
+def seed(database_path, count):
+    import uuid
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    import src.sqlite_tuning  # noqa: F401 - installs the connect hook
+    from src.models import db, Image, Category, ImageCategory
+
+    engine = create_engine(f"sqlite:///{database_path}")
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        categories = [Category(name=f"bench-{n}", display_name=f"Bench {n}") for n in range(5)]
+        session.add_all(categories)
+        session.flush()
+        for n in range(count):
+            image_id = str(uuid.uuid4())
+            # Descriptions pad the database out to a size where copying it takes a while
+            session.add(Image(id=image_id, filename=f"{image_id}.jpg", title=f"Image {n}",
+                              description=os.urandom(1024).hex()))
+            session.add(ImageCategory(image_id=image_id, category_id=categories[n % 5].id))
+        session.commit()
+    engine.dispose()
+
+
+def reader(database_path, seconds, results):
+    connection = _connect(database_path)
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.execute(READ_QUERY).fetchall()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    results.put(latencies)
+
+
+def writer(database_path, seconds, results):
+    connection = _connect(database_path)
+    commits = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        with connection:
+            connection.execute("UPDATE images SET title = ? WHERE rowid = ?", (f"edit {commits}", commits % 100 + 1))
+        commits += 1
+        time.sleep(0.05)
+    connection.close()
+    results.put(None)
+
+
+def copy_file(database_path, dest_path):
+    """The old backup: fold the WAL in, then copy the live file"""
+    connection = _connect(database_path)
+    connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    connection.close()
+    shutil.copy2(database_path, dest_path)
+
+
+def backup_stepped(database_path, dest_path):
+    from src.sqlite_tuning import snapshot
+    snapshot(database_path, dest_path)
+
+
+def backup_one_step(database_path, dest_path):
+    from src.sqlite_tuning import snapshot
+    snapshot(database_path, dest_path, pages=-1)
+
+
+def vacuum_into(database_path, dest_path):
+    connection = _connect(database_path)
+    connection.execute("VACUUM INTO ?", (dest_path,))
+    connection.close()
+
+
+METHODS = {
+    'none': None,
+    'copy': copy_file,
+    'backup': backup_stepped,
+    'one-step': backup_one_step,
+    'vacuum': vacuum_into,
+}
+
+
+def run_method(name, database_path, directory, readers, seconds):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    workers = [context.Process(target=reader, args=(database_path, seconds, results)) for _ in range(readers)]
+    workers.append(context.Process(target=writer, args=(database_path, seconds, results)))
+    for worker in workers:
+        worker.start()
+
+    durations, corrupt = [], 0
+    method = METHODS[name]
+    dest_path = os.path.join(directory, 'snapshot.db')
+    deadline = time.perf_counter() + seconds
+    time.sleep(0.5)  # Let the readers get going
+    while method and time.perf_counter() < deadline - 0.5:
+        start = time.perf_counter()
+        method(database_path, dest_path)
+        durations.append(time.perf_counter() - start)
+        check = sqlite3.connect(dest_path)
+        try:
+            corrupt += check.execute("PRAGMA integrity_check").fetchone()[0] != 'ok'
+        except sqlite3.DatabaseError:
+            corrupt += 1
+        finally:
+            check.close()
+        os.remove(dest_path)
+
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    latencies = sorted(latency for values in collected if values for latency in values)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:<9} {len(latencies) / seconds:>9.0f}/s {statistics.median(latencies) * 1000:>8.1f}ms "
+          f"{p99 * 1000:>8.1f}ms {latencies[-1] * 1000:>8.1f}ms {len(durations):>9} "
+          f"{statistics.mean(durations) * 1000 if durations else 0:>9.0f}ms {corrupt:>8}")
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    images = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+
+    directory = tempfile.mkdtemp(prefix='bench-snapshot-')
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = directory
+    try:
+        database_path = os.path.join(directory, 'bench.db')
+        seeder = multiprocessing.get_context('spawn').Process(target=seed, args=(database_path, images))
+        seeder.start()
+        seeder.join()
+
+        print(f"{readers} reader process(es) + 1 writer, {seconds:g}s per method, "
+              f"{images} images ({os.path.getsize(database_path) / 1024 / 1024:.0f} MB database)")
+        print(f"{'method':<9} {'reads':>11} {'p50':>10} {'p99':>10} {'max':>10} {'snapshots':>9} "
+              f"{'each':>11} {'corrupt':>8}")
+        for name in METHODS:
+            run_method(name, database_path, directory, readers, seconds)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark: header-only probe vs. the Pillow EXIF path
+Runs both over the images in data/ and reports per-image time and peak
+memory. Usage: python benchmarks/bench_image_probe.py [image dir] [rounds]
+"""
+import os
+import sys
+import glob
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image as PILImage
+from PIL.ExifTags import TAGS
+
+from src.image_probe import probe_image
+
+
+def pillow_path(path):
+    """What the featured endpoints used to do per request"""
+    with PILImage.open(path) as img:
+        size = img.size
+        exif = img._getexif() or {}
+        return size, {TAGS.get(tag_id, tag_id): value for tag_id, value in exif.items()}
+
+
+def probe_path(path):
+    result = probe_image(path)
+    return (result.width, result.height), result.exif
+
+
+def measure(fn, paths, rounds):
+    fn(paths[0])  # Warm imports and the page cache
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            fn(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for path in paths:
+        fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed / (rounds * len(paths)), peak
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    image_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(root, 'data')
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    paths = sorted(p for ext in ('*.jpg', '*.jpeg', '*.png', '*.webp') for p in glob.glob(os.path.join(image_dir, ext)))
+    if not paths:
+        print(f"No images found in {image_dir}")
+        return
+
+    total_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    print(f"{len(paths)} images, {total_mb:.1f} MB, {rounds} rounds")
+    results = {}
+    for name, fn in (('pillow _getexif', pillow_path), ('header probe', probe_path)):
+        per_image, peak = measure(fn, paths, rounds)
+        results[name] = per_image
+        print(f"{name:>16}: {per_image * 1e6:9.1f} µs/image   peak {peak / 1024:8.1f} KiB")
+    print(f"{'speedup':>16}: {results['pillow _getexif'] / results['header probe']:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
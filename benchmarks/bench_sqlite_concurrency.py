@@ -0,0 +1,151 @@
+"""
+Benchmark: public reads while an admin writes, SQLite defaults vs. the tuned profile
+Separate processes stand in for gunicorn workers: several run the portfolio
+query in a loop while one runs admin-style write transactions. Reports read
+throughput and latency, writes committed, and 'database is locked' errors.
+Usage: python benchmarks/bench_sqlite_concurrency.py [readers] [seconds] [images]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# SQLite's own defaults (the old setup; pysqlite's 5 s timeout is the busy timeout) vs. config's defaults
+PROFILES = {
+    'defaults': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_CACHE_SIZE_MB': '2',
+                 'SQLITE_MMAP_SIZE_MB': '0', 'SQLITE_TEMP_STORE': 'DEFAULT', 'SQLITE_BUSY_TIMEOUT_MS': '5000'},
+    'tuned': {},
+}
+
+READ_QUERY = """
+    SELECT images.id, images.filename, images.title, categories.name
+    FROM images
+    LEFT JOIN image_categories ON image_categories.image_id = images.id
+    LEFT JOIN categories ON categories.id = image_categories.category_id
+    ORDER BY images.upload_date DESC
+    LIMIT 60
+"""
+
+
+def _engine(database_path):
+    # Imported here so each process reads the profile from its environment
+    from sqlalchemy import create_engine
+    import src.sqlite_tuning  # noqa: F401 - installs the connect hook
+    return create_engine(f"sqlite:///{database_path}")
+
+
+def seed(database_path, count):
+    import uuid
+    from src.models import db, Image, Category, ImageCategory
+    from sqlalchemy.orm import Session
+
+    engine = _engine(database_path)
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        categories = [Category(name=f"bench-{n}", display_name=f"Bench {n}") for n in range(5)]
+        session.add_all(categories)
+        session.flush()
+        for n in range(count):
+            image_id = str(uuid.uuid4())
+            session.add(Image(id=image_id, filename=f"{image_id}.jpg", title=f"Image {n}"))
+            session.add(ImageCategory(image_id=image_id, category_id=categories[n % 5].id))
+        session.commit()
+    engine.dispose()
+
+
+def reader(database_path, seconds, results):
+    from sqlalchemy import text
+
+    engine = _engine(database_path)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text(READ_QUERY)).fetchall()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors += 1
+    results.put(('read', latencies, errors))
+
+
+def writer(database_path, seconds, results):
+    from sqlalchemy import text
+
+    engine = _engine(database_path)
+    commits, errors = 0, 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            with engine.begin() as connection:
+                # A dashboard edit: touch a batch of rows, then some request work before the commit
+                connection.execute(text("UPDATE images SET title = title || '' WHERE rowid % 20 = :n"),
+                                   {'n': commits % 20})
+                connection.execute(text("UPDATE images SET description = :d WHERE rowid = :n"),
+                                   {'d': f"edit {commits}", 'n': commits + 1})
+                time.sleep(0.005)
+            commits += 1
+        except Exception:
+            errors += 1
+    results.put(('write', commits, errors))
+
+
+def run_profile(name, readers, seconds, images):
+    directory = tempfile.mkdtemp(prefix=f'bench-sqlite-{name}-')
+    saved = {key: os.environ.get(key) for key in PROFILES['defaults']}
+    try:
+        for key in PROFILES['defaults']:
+            os.environ.pop(key, None)
+        os.environ.update(PROFILES[name])
+        os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = directory
+
+        context = multiprocessing.get_context('spawn')  # Fresh interpreters pick up the profile's environment
+        database_path = os.path.join(directory, 'bench.db')
+        seeder = context.Process(target=seed, args=(database_path, images))
+        seeder.start()
+        seeder.join()
+
+        results = context.Queue()
+        workers = [context.Process(target=reader, args=(database_path, seconds, results)) for _ in range(readers)]
+        workers.append(context.Process(target=writer, args=(database_path, seconds, results)))
+        for worker in workers:
+            worker.start()
+        collected = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(directory, ignore_errors=True)
+
+    latencies = sorted(latency for kind, values, _ in collected if kind == 'read' for latency in values)
+    read_errors = sum(errors for kind, _, errors in collected if kind == 'read')
+    commits, write_errors = next((values, errors) for kind, values, errors in collected if kind == 'write')
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+    print(f"{name:<9} {len(latencies) / seconds:>9.0f}/s {statistics.median(latencies) * 1000 if latencies else 0:>8.1f}ms "
+          f"{p99 * 1000:>8.1f}ms {latencies[-1] * 1000 if latencies else 0:>8.1f}ms {read_errors:>7} "
+          f"{commits / seconds:>9.0f}/s {write_errors:>7}")
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    images = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    print(f"{readers} reader process(es) + 1 writer, {seconds:g}s, {images} images")
+    print(f"{'profile':<9} {'reads':>11} {'p50':>10} {'p99':>10} {'max':>10} {'errors':>7} {'writes':>11} {'errors':>7}")
+    for name in PROFILES:
+        run_profile(name, readers, seconds, images)
+
+
+if __name__ == '__main__':
+    main()
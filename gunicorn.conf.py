@@ -0,0 +1,45 @@
+"""
+Gunicorn settings for Mind's Eye Photography on Railway
+The app is loaded once in the master (preload_app): migrations and volume
+housekeeping run a single time, and the imported code is shared copy-on-write
+with every forked worker. Each worker then opens its own database connections
+and starts its own job threads in post_fork. Threaded workers keep a slow
+upload or backup from tying up a whole process.
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+preload_app = True
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+
+# Recycle workers now and then so slow leaks (Pillow buffers, fragmentation) can't grow without bound;
+# the jitter keeps them from all restarting at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+timeout = 120  # Chunk uploads and backup downloads on a slow connection
+graceful_timeout = 30
+keepalive = 5
+
+# Worker heartbeats on tmpfs rather than the container's overlay filesystem
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+
+def pre_fork(server, worker):
+    # Everything loaded so far is long-lived: keep the collector from touching (and so copying) its pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # With preload the app is already imported; without it this loads it in the worker
+    from wsgi import app
+    from main import init_worker
+
+    init_worker(app)
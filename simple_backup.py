@@ -58,7 +58,9 @@ def create_simple_backup():
         # Copy database file
         db_source = "/data/mindseye.db"
         if os.path.exists(db_source):
-            shutil.copy2(db_source, backup_dir)
+            from src.sqlite_tuning import snapshot
+            # Consistent copy even while the site is writing to it
+            snapshot(db_source, os.path.join(backup_dir, 'mindseye.db'))
             print("✅ Database copied")
         else:
             print("⚠️  Database not found")
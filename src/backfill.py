@@ -0,0 +1,193 @@
+"""
+Metadata backfill for Mind's Eye Photography
+Fills width/height and EXIF for Image rows that predate upload-time
+extraction. Headers are probed in a process pool, results are written back
+one batch per transaction, and a checkpoint file lets an interrupted run
+pick up where it stopped.
+
+    python -m src.backfill [--batch-size 50] [--workers 4] [--restart]
+"""
+import os
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+from .config import PHOTOGRAPHY_ASSETS_DIR, BACKFILL_CHECKPOINT_FILE, BACKFILL_BATCH_SIZE
+from .exif import EXIF_FIELDS, format_exif
+from .image_probe import read_metadata
+
+
+def probe_metadata(path):
+    """
+    Dimensions and EXIF of one file, reading headers only (runs in a worker process)
+    Returns {'width', 'height', 'exif'} or {'error'}
+    """
+    try:
+        width, height, tags = read_metadata(path)
+        return {'width': width, 'height': height, 'exif': format_exif(tags)}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def load_checkpoint():
+    """Last saved progress, or None if no run has been recorded"""
+    try:
+        with open(BACKFILL_CHECKPOINT_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(state):
+    state['updated_at'] = datetime.utcnow().isoformat()
+    temp_path = BACKFILL_CHECKPOINT_FILE + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, BACKFILL_CHECKPOINT_FILE)
+
+
+@contextmanager
+def _run_lock():
+    """Only one backfill at a time across all workers; yields False if one is running"""
+    if fcntl is None:
+        yield True
+        return
+    os.makedirs(os.path.dirname(BACKFILL_CHECKPOINT_FILE), exist_ok=True)
+    with open(BACKFILL_CHECKPOINT_FILE + '.lock', 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _pending_query(after_id):
+    from .models import Image
+
+    query = Image.query.filter(
+        (Image.width == None) | (Image.height == None) | (Image.exif_extracted != True)
+    )
+    if after_id:
+        query = query.filter(Image.id > after_id)
+    return query.order_by(Image.id)
+
+
+def _apply(image, result):
+    """Copy probe results onto an Image row; returns False for unreadable files"""
+    if 'error' in result:
+        return False
+    if image.width is None or image.height is None:
+        image.width, image.height = result['width'], result['height']
+    exif = result['exif']
+    for field in EXIF_FIELDS:
+        setattr(image, field, exif.get(field))
+    image.exif_extracted = True
+    return True
+
+
+def run_backfill(batch_size=BACKFILL_BATCH_SIZE, workers=None, restart=False, progress=print):
+    """
+    Backfill every Image missing dimensions or EXIF
+    Resumes from the checkpoint unless restart is set or the last run finished.
+    Must be called inside an app context. Returns the final checkpoint state.
+    """
+    from .models import db
+
+    with _run_lock() as acquired:
+        if not acquired:
+            progress("⏳ Backfill already running in another process")
+            return load_checkpoint()
+
+        state = load_checkpoint()
+        if restart or not state or state.get('status') == 'complete':
+            state = {
+                'status': 'running',
+                'last_id': None,
+                'total': _pending_query(None).count(),
+                'processed': 0,
+                'updated': 0,
+                'failed': 0,
+                'started_at': datetime.utcnow().isoformat(),
+                'error': None
+            }
+        else:
+            state.update(status='running', error=None)
+            progress(f"↪️  Resuming backfill after {state['processed']}/{state['total']} image(s)")
+        save_checkpoint(state)
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                while True:
+                    batch = _pending_query(state['last_id']).limit(batch_size).all()
+                    if not batch:
+                        break
+
+                    paths = [os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename) for image in batch]
+                    for image, result in zip(batch, pool.map(probe_metadata, paths)):
+                        if _apply(image, result):
+                            state['updated'] += 1
+                        else:
+                            state['failed'] += 1
+                            print(f"⚠️  Backfill skipped {image.filename}: {result['error']}")
+                    last_id = batch[-1].id
+                    db.session.commit()
+
+                    state['processed'] += len(batch)
+                    state['last_id'] = last_id
+                    save_checkpoint(state)
+                    progress(f"📊 Backfill {state['processed']}/{state['total']} "
+                             f"({state['updated']} updated, {state['failed']} failed)")
+
+            state['status'] = 'complete'
+            progress(f"✅ Backfill complete: {state['updated']} updated, {state['failed']} failed")
+        except Exception as e:
+            db.session.rollback()
+            state.update(status='interrupted', error=str(e))
+            progress(f"❌ Backfill stopped: {e}")
+        save_checkpoint(state)
+        return state
+
+
+_job_thread = None
+
+
+def start_backfill_job(app, restart=False):
+    """Run the backfill in a background thread of this worker; False if one is already running"""
+    global _job_thread
+    if _job_thread and _job_thread.is_alive():
+        return False
+
+    def job():
+        with app.app_context():
+            run_backfill(restart=restart)
+
+    _job_thread = threading.Thread(target=job, name='metadata-backfill', daemon=True)
+    _job_thread.start()
+    return True
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Backfill image dimensions and EXIF')
+    parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint and rescan everything')
+    args = parser.parse_args()
+
+    from src.main import create_app
+    app = create_app()
+
+    with app.app_context():
+        run_backfill(batch_size=args.batch_size, workers=args.workers, restart=args.restart)
@@ -0,0 +1,133 @@
+"""
+Streaming backup archives for Mind's Eye Photography
+Backups used to copy the database and every original into a temp directory,
+tar that into a second temp file and only then start the download: twice the
+library's size on disk and nothing sent until all of it was done. Here the
+.tar.gz is produced as it is sent - each file is read straight from the volume
+in CHUNK_SIZE pieces, framed as tar and compressed on the fly, and the
+compressed bytes are yielded to the response as they come out. Memory and
+temp space stay constant however large the library gets.
+"""
+import os
+import tarfile
+import time
+import zlib
+from fnmatch import fnmatch
+from flask import Response, stream_with_context
+
+CHUNK_SIZE = 256 * 1024
+
+# Live SQLite companions - only meaningful next to the open database, never restored from a backup
+SQLITE_SIDECARS = ('-wal', '-shm', '-journal')
+
+
+def volume_entries(directory, prefix=''):
+    """(arcname, path) for the regular files directly in directory, SQLite sidecars left out"""
+    if not os.path.isdir(directory):
+        return []
+    return [
+        (prefix + name, os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if not name.endswith(SQLITE_SIDECARS) and os.path.isfile(os.path.join(directory, name))
+    ]
+
+
+def tree_entries(root, prefix='', ignore=()):
+    """(arcname, path) for every file under root, skipping names matching the ignore patterns"""
+    entries = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not any(fnmatch(d, pattern) for pattern in ignore))
+        relative = os.path.relpath(current, root)
+        for name in sorted(files):
+            if any(fnmatch(name, pattern) for pattern in ignore):
+                continue
+            arcname = name if relative == '.' else os.path.join(relative, name)
+            entries.append((prefix + arcname, os.path.join(current, name)))
+    return entries
+
+
+def _file_member(arcname, path):
+    info = tarfile.TarInfo(arcname)
+    stat = os.stat(path)
+    info.size = stat.st_size
+    info.mtime = stat.st_mtime
+    info.mode = stat.st_mode & 0o7777
+    return info
+
+
+def _read_exactly(handle, size, chunk_size):
+    """The header promised size bytes: stop there if the file grew, pad with NULs if it shrank"""
+    remaining = size
+    while remaining:
+        data = handle.read(min(chunk_size, remaining))
+        if not data:
+            print(f"⚠️ {handle.name} shrank while being archived - padding {remaining} bytes")
+            data = tarfile.NUL * min(chunk_size, remaining)
+        remaining -= len(data)
+        yield data
+
+
+def stream_tar_gz(entries, compresslevel=6, chunk_size=CHUNK_SIZE):
+    """
+    Yield a .tar.gz of entries, a compressed chunk at a time
+    entries is an iterable of (arcname, source): source is a file path (read
+    from disk as the archive is sent) or bytes (small generated files such as
+    restore instructions). Files that vanish before they are reached are skipped.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip framing
+    pending = bytearray()
+    offset = 0
+
+    def write(data):
+        nonlocal offset
+        offset += len(data)
+        pending.extend(compressor.compress(data))
+
+    for arcname, source in entries:
+        if isinstance(source, bytes):
+            info = tarfile.TarInfo(arcname)
+            info.size = len(source)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            write(info.tobuf(tarfile.PAX_FORMAT))
+            write(source)
+        else:
+            try:
+                info = _file_member(arcname, source)
+                handle = open(source, 'rb')
+            except FileNotFoundError:
+                print(f"⚠️ {source} disappeared before it could be archived - skipped")
+                continue
+            with handle:
+                write(info.tobuf(tarfile.PAX_FORMAT))
+                for data in _read_exactly(handle, info.size, chunk_size):
+                    write(data)
+                    if len(pending) >= chunk_size:
+                        yield bytes(pending)
+                        pending.clear()
+        remainder = info.size % tarfile.BLOCKSIZE
+        if remainder:
+            write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+        if len(pending) >= chunk_size:
+            yield bytes(pending)
+            pending.clear()
+
+    # End of archive: two empty blocks, then padding out to a whole record like tarfile writes
+    write(tarfile.NUL * (2 * tarfile.BLOCKSIZE))
+    remainder = offset % tarfile.RECORDSIZE
+    if remainder:
+        write(tarfile.NUL * (tarfile.RECORDSIZE - remainder))
+    pending.extend(compressor.flush())
+    yield bytes(pending)
+
+
+def archive_response(entries, download_name, compresslevel=6):
+    """Stream entries to the client as the download_name .tar.gz attachment"""
+    return Response(
+        stream_with_context(stream_tar_gz(entries, compresslevel)),
+        mimetype='application/gzip',
+        headers={
+            'Content-Disposition': f'attachment; filename="{download_name}"',
+            'X-Accel-Buffering': 'no',  # Let proxies pass chunks through instead of buffering the archive
+        },
+    )
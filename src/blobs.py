@@ -0,0 +1,217 @@
+"""
+Content-addressed storage of originals for Mind's Eye Photography
+Every distinct file is kept once under BLOBS_DIR, named by its SHA-256.
+Image filenames on the volume are hard links to their blob, so everything
+that opens PHOTOGRAPHY_ASSETS_DIR/<filename> keeps working while identical
+uploads share one copy on disk. image_blobs counts the Image rows per blob;
+the blob itself is removed when the last of them is deleted.
+
+    python -m src.blobs    # link existing originals into the store (dedupes the volume)
+"""
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import update, delete, select, bindparam
+from sqlalchemy.dialects.sqlite import insert
+
+from .config import PHOTOGRAPHY_ASSETS_DIR, BLOBS_DIR, FILE_REMOVAL_THREADS
+from .ingest import save_upload, spooled_digest, fsync_directory
+from .models import db, Image, ImageBlob
+
+
+def blob_path(content_hash):
+    return os.path.join(BLOBS_DIR, content_hash[:2], content_hash)
+
+
+def _link(source, dest):
+    """Atomically make dest a hard link to source (replacing whatever dest was)"""
+    directory = os.path.dirname(dest)
+    temp_path = os.path.join(directory, f".{os.path.basename(dest)}.link")
+    if os.path.lexists(temp_path):
+        os.remove(temp_path)
+    os.link(source, temp_path)
+    os.replace(temp_path, dest)
+    fsync_directory(directory)
+
+
+def attach_blob(path, content_hash):
+    """
+    Share path's storage with the blob for content_hash
+    The first file with some content becomes the blob; later copies are
+    swapped for links to it. Returns False if the volume can't hard link.
+    """
+    blob = blob_path(content_hash)
+    try:
+        if os.path.exists(blob):
+            if not os.path.samefile(blob, path):
+                _link(blob, path)
+            return True
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            # Another worker stored the same content first
+            _link(blob, path)
+        fsync_directory(os.path.dirname(blob))
+        return True
+    except OSError as e:
+        print(f"⚠️  Could not link {os.path.basename(path)} into the blob store: {e}")
+        return False
+
+
+def acquire_blob(content_hash, file_size=None):
+    """Count one more Image referencing content_hash (caller commits)"""
+    statement = insert(ImageBlob).values(content_hash=content_hash, file_size=file_size, ref_count=1)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['content_hash'], set_={'ref_count': ImageBlob.ref_count + 1}
+    ))
+
+
+def release_blob(content_hash):
+    """
+    Drop one reference to content_hash (caller commits)
+    Returns the blob path to delete once the transaction is committed if
+    that was the last reference, else None.
+    """
+    if not content_hash:
+        return None
+    result = db.session.execute(
+        update(ImageBlob).where(ImageBlob.content_hash == content_hash)
+        .values(ref_count=ImageBlob.ref_count - 1)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        return None  # Original predates the blob store
+    remaining = db.session.execute(
+        select(ImageBlob.ref_count).where(ImageBlob.content_hash == content_hash)
+    ).scalar()
+    if remaining > 0:
+        return None
+    db.session.execute(delete(ImageBlob).where(ImageBlob.content_hash == content_hash))
+    return blob_path(content_hash)
+
+
+def release_blobs(content_hashes):
+    """
+    Set-based release_blob for many images at once (caller commits)
+    content_hashes has one entry per image, so shared content is released once per image.
+    Returns the blob paths to delete after the commit.
+    """
+    counts = Counter(h for h in content_hashes if h)
+    if not counts:
+        return []
+    table = ImageBlob.__table__
+    db.session.execute(
+        update(table).where(table.c.content_hash == bindparam('hash'))
+        .values(ref_count=table.c.ref_count - bindparam('count')),
+        [{'hash': content_hash, 'count': count} for content_hash, count in counts.items()]
+    )
+    orphaned = [row[0] for row in db.session.execute(
+        select(table.c.content_hash).where(table.c.content_hash.in_(list(counts)), table.c.ref_count <= 0)
+    )]
+    if orphaned:
+        db.session.execute(delete(table).where(table.c.content_hash.in_(orphaned)))
+    return [blob_path(content_hash) for content_hash in orphaned]
+
+
+def store_original(file_storage, final_path):
+    """
+    Save an upload at final_path, sharing storage with identical originals
+    Content the store already has is linked in without writing the upload
+    again. Returns (size, content_hash); caller commits the reference.
+    """
+    digest = spooled_digest(file_storage)
+    if digest and os.path.exists(blob_path(digest[1])):
+        _link(blob_path(digest[1]), final_path)
+        size, content_hash = digest
+        print(f"♻️  {os.path.basename(final_path)} duplicates stored content {content_hash[:12]}")
+    else:
+        size, content_hash = save_upload(file_storage, final_path)
+        attach_blob(final_path, content_hash)
+    acquire_blob(content_hash, size)
+    return size, content_hash
+
+
+def release_original(image):
+    """
+    Drop an Image's claim on its original (caller commits)
+    Returns the files to delete after the commit: the image's own link, plus
+    the blob when no other Image shares it.
+    """
+    paths = [os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename)]
+    blob = release_blob(image.content_hash)
+    if blob:
+        paths.append(blob)
+    return paths
+
+
+def remove_files(paths, verbose=True):
+    """Delete files from the volume, logging (not raising) failures"""
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+            if verbose:
+                print(f"✅ Deleted file: {path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"❌ Error deleting file {path}: {e}")
+    return removed
+
+
+_removal_pool = None
+
+
+def remove_files_in_background(paths):
+    """
+    remove_files spread over a small thread pool, without waiting
+    For bulk operations - the request returns once the rows are committed.
+    Returns the futures, so callers that need the files gone can wait on them.
+    """
+    global _removal_pool
+    if not paths:
+        return []
+    if _removal_pool is None:  # Created on first use, so it is never inherited across a fork
+        _removal_pool = ThreadPoolExecutor(max_workers=FILE_REMOVAL_THREADS, thread_name_prefix='file-removal')
+    size = max(1, len(paths) // FILE_REMOVAL_THREADS + 1)
+    return [_removal_pool.submit(remove_files, paths[i:i + size], False) for i in range(0, len(paths), size)]
+
+
+def adopt_existing_originals():
+    """
+    Link every existing original into the store and recount references
+    Byte-identical files end up as links to one blob. Safe to run again.
+    """
+    from .http_cache import ensure_content_hash
+
+    linked = missing = 0
+    for image in Image.query.order_by(Image.upload_date).all():
+        path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename)
+        if not ensure_content_hash(image, path):
+            missing += 1
+            continue
+        if attach_blob(path, image.content_hash):
+            linked += 1
+
+    # Recount from the images table, which is the source of truth
+    counts = db.session.query(Image.content_hash, db.func.count(Image.id), db.func.max(Image.file_size)) \
+        .filter(Image.content_hash != None).group_by(Image.content_hash).all()
+    db.session.execute(delete(ImageBlob))
+    for content_hash, count, file_size in counts:
+        if os.path.exists(blob_path(content_hash)):
+            db.session.add(ImageBlob(content_hash=content_hash, file_size=file_size, ref_count=count))
+    db.session.commit()
+
+    shared = sum(count - 1 for _, count, _ in counts)
+    print(f"✅ Blob store: {linked} original(s) linked, {shared} duplicate(s) sharing storage, {missing} missing")
+    return {'linked': linked, 'duplicates': shared, 'missing': missing}
+
+
+if __name__ == '__main__':
+    from src.main import create_app
+    app = create_app()
+
+    with app.app_context():
+        adopt_existing_originals()
@@ -0,0 +1,116 @@
+"""
+Bulk image operations for Mind's Eye Photography
+Set-based versions of the dashboard's bulk delete and bulk category update:
+a fixed number of statements however many images are selected (IN (...)
+deletes, one executemany insert), with file removal moved after the commit
+onto a thread pool. The original one-image-at-a-time versions are kept
+(*_per_row) so benchmarks/bench_bulk_operations.py can compare the two.
+"""
+import os
+from sqlalchemy import delete, insert
+
+from .config import PHOTOGRAPHY_ASSETS_DIR, DERIVATIVES_DIR
+from .models import db, Image, ImageCategory, ImageDerivative
+from .blobs import release_blobs, release_original, remove_files, remove_files_in_background
+from .derivatives import derivative_paths
+
+# SQLite caps bound parameters per statement - stay well under it
+IN_CLAUSE_BATCH = 500
+
+
+def _batches(values, size=IN_CLAUSE_BATCH):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def bulk_delete_images(image_ids):
+    """
+    Delete images and everything hanging off them in a few statements
+    Commits, then removes originals, unshared blobs and derivatives in the
+    background. Returns (deleted count, futures for the file removal).
+    """
+    image_ids = list(dict.fromkeys(image_ids))
+    rows = []
+    derivative_files = []
+    for batch in _batches(image_ids):
+        rows.extend(db.session.query(Image.id, Image.filename, Image.content_hash).filter(Image.id.in_(batch)))
+        derivative_files.extend(
+            name for (name,) in db.session.query(ImageDerivative.filename).filter(ImageDerivative.image_id.in_(batch))
+        )
+    if not rows:
+        return 0, []
+
+    existing_ids = [row.id for row in rows]
+    files = [os.path.join(PHOTOGRAPHY_ASSETS_DIR, row.filename) for row in rows]
+    files += [os.path.join(DERIVATIVES_DIR, name) for name in derivative_files]
+    files += release_blobs([row.content_hash for row in rows])
+
+    for batch in _batches(existing_ids):
+        for model, column in ((ImageCategory, ImageCategory.image_id), (ImageDerivative, ImageDerivative.image_id),
+                              (Image, Image.id)):
+            db.session.execute(delete(model).where(column.in_(batch)).execution_options(synchronize_session=False))
+    db.session.commit()
+    db.session.expire_all()  # Rows deleted behind the identity map's back
+
+    return len(rows), remove_files_in_background(files)
+
+
+def bulk_set_categories(image_ids, category_ids):
+    """
+    Replace the categories of every existing image in image_ids with category_ids
+    One IN delete and one executemany insert per batch; an empty category_ids clears them.
+    Returns the number of images updated.
+    """
+    image_ids = list(dict.fromkeys(image_ids))
+    existing_ids = []
+    for batch in _batches(image_ids):
+        existing_ids.extend(image_id for (image_id,) in db.session.query(Image.id).filter(Image.id.in_(batch)))
+    if not existing_ids:
+        return 0
+
+    for batch in _batches(existing_ids):
+        db.session.execute(
+            delete(ImageCategory).where(ImageCategory.image_id.in_(batch)).execution_options(synchronize_session=False)
+        )
+        if category_ids:  # No categories just clears them - an empty executemany is a bare INSERT
+            db.session.execute(
+                insert(ImageCategory),
+                [{'image_id': image_id, 'category_id': category_id} for image_id in batch for category_id in category_ids]
+            )
+    db.session.commit()
+    db.session.expire_all()
+    return len(existing_ids)
+
+
+# ----------------------------------------------------------------------------
+# Previous per-row implementations, kept for comparison
+# ----------------------------------------------------------------------------
+
+def bulk_delete_images_per_row(image_ids):
+    """One lookup, one category delete and one row delete per image; files removed inline"""
+    deleted_count = 0
+    files_to_remove = []
+    for image_id in image_ids:
+        image = db.session.get(Image, image_id)
+        if image:
+            files_to_remove.extend(release_original(image) + derivative_paths(image))
+            ImageCategory.query.filter_by(image_id=image_id).delete()
+            db.session.delete(image)
+            deleted_count += 1
+    db.session.commit()
+    remove_files(files_to_remove, verbose=False)
+    return deleted_count
+
+
+def bulk_set_categories_per_row(image_ids, category_ids):
+    """One lookup, one delete and one insert per image and category"""
+    updated_count = 0
+    for image_id in image_ids:
+        image = db.session.get(Image, image_id)
+        if image:
+            ImageCategory.query.filter_by(image_id=image_id).delete()
+            for category_id in category_ids:
+                db.session.add(ImageCategory(image_id=image_id, category_id=category_id))
+            updated_count += 1
+    db.session.commit()
+    return updated_count
@@ -0,0 +1,207 @@
+"""
+Resumable chunked uploads for Mind's Eye Photography
+A large batch is sent file by file in fixed-size chunks, so no single
+request runs into a proxy timeout and a dropped connection only costs the
+chunk in flight. Each upload is a directory under CHUNKED_UPLOAD_DIR holding
+a manifest and one file per received chunk; any gunicorn worker can take any
+request. On completion the chunks are streamed, in order, into a
+HashingSpoolFile and handed to the normal upload path.
+
+    POST   /admin/uploads                      init -> {upload_id, chunk_size, chunk_count}
+    PUT    /admin/uploads/<id>/chunks/<index>  raw chunk bytes (retries just overwrite)
+    GET    /admin/uploads/<id>                 received chunk indices, for resuming
+    POST   /admin/uploads/<id>/complete        reassemble and create the Image
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+from .config import CHUNKED_UPLOAD_DIR, RESUMABLE_CHUNK_SIZE, RESUMABLE_MAX_SIZE, RESUMABLE_UPLOAD_TTL, UPLOAD_CHUNK_SIZE
+from .ingest import HashingSpoolFile, fsync_directory
+
+MANIFEST = 'manifest.json'
+
+
+class UploadError(ValueError):
+    """Invalid request against an upload session (reported to the client as a 400)"""
+
+
+def _session_dir(upload_id):
+    # Ids are uuid4 hex - anything else never touches the filesystem
+    if not upload_id or len(upload_id) != 32 or not all(ch in '0123456789abcdef' for ch in upload_id):
+        raise UploadError("Invalid upload id")
+    return os.path.join(CHUNKED_UPLOAD_DIR, upload_id)
+
+
+def _chunk_path(upload_id, index):
+    return os.path.join(_session_dir(upload_id), f"{index:06d}.part")
+
+
+def _write_json(path, data):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def create_session(filename, size, metadata, sha256=None):
+    """Start an upload of `size` bytes; metadata is stored for the complete step"""
+    if not filename:
+        raise UploadError("Missing filename")
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError("Invalid file size")
+    if size > RESUMABLE_MAX_SIZE:
+        raise UploadError(f"File is larger than {RESUMABLE_MAX_SIZE // (1024 * 1024)} MB")
+
+    upload_id = uuid.uuid4().hex
+    directory = _session_dir(upload_id)
+    os.makedirs(directory)
+    manifest = {
+        'upload_id': upload_id,
+        'filename': filename,
+        'size': size,
+        'sha256': sha256.lower() if sha256 else None,
+        'chunk_size': RESUMABLE_CHUNK_SIZE,
+        'chunk_count': (size + RESUMABLE_CHUNK_SIZE - 1) // RESUMABLE_CHUNK_SIZE,
+        'metadata': metadata,
+        'created_at': time.time(),
+        'image_id': None
+    }
+    _write_json(os.path.join(directory, MANIFEST), manifest)
+    fsync_directory(CHUNKED_UPLOAD_DIR)
+    return manifest
+
+
+def load_session(upload_id):
+    """Manifest of an upload, raising UploadError if it doesn't exist (or has expired)"""
+    try:
+        with open(os.path.join(_session_dir(upload_id), MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise UploadError("Unknown or expired upload")
+
+
+def _expected_length(manifest, index):
+    if index == manifest['chunk_count'] - 1:
+        return manifest['size'] - index * manifest['chunk_size']
+    return manifest['chunk_size']
+
+
+def received_chunks(manifest):
+    """Indices of the chunks stored so far"""
+    directory = _session_dir(manifest['upload_id'])
+    return sorted(int(name[:-5]) for name in os.listdir(directory) if name.endswith('.part'))
+
+
+def write_chunk(manifest, index, stream):
+    """Store chunk `index` read from stream; replaces any earlier copy of it"""
+    if not 0 <= index < manifest['chunk_count']:
+        raise UploadError("Chunk index out of range")
+    expected = _expected_length(manifest, index)
+
+    final_path = _chunk_path(manifest['upload_id'], index)
+    temp_path = f"{final_path}.{uuid.uuid4().hex[:8]}.tmp"
+    written = 0
+    try:
+        with open(temp_path, 'wb') as f:
+            while written <= expected:
+                data = stream.read(min(UPLOAD_CHUNK_SIZE, expected + 1 - written))
+                if not data:
+                    break
+                f.write(data)
+                written += len(data)
+            if written != expected:
+                raise UploadError(f"Chunk {index} should be {expected} bytes, got {written}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, final_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return written
+
+
+@contextmanager
+def completion_lock(manifest):
+    """Serialize complete requests for one upload (a retried complete must not create two images)"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(_session_dir(manifest['upload_id']), '.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def assemble(manifest):
+    """
+    Stream the chunks, in order, into a HashingSpoolFile
+    Verifies every chunk is present and the size (and SHA-256, when the
+    client sent one) matches. Caller closes or commits the returned file.
+    """
+    missing = set(range(manifest['chunk_count'])) - set(received_chunks(manifest))
+    if missing:
+        raise UploadError(f"{len(missing)} chunk(s) still missing")
+
+    spool = HashingSpoolFile()
+    try:
+        for index in range(manifest['chunk_count']):
+            with open(_chunk_path(manifest['upload_id'], index), 'rb') as part:
+                for data in iter(lambda: part.read(UPLOAD_CHUNK_SIZE), b''):
+                    spool.write(data)
+        if spool.size != manifest['size']:
+            raise UploadError(f"Assembled {spool.size} bytes, expected {manifest['size']}")
+        if manifest['sha256'] and spool.sha256.hexdigest() != manifest['sha256']:
+            raise UploadError("Checksum mismatch - the file was corrupted in transit")
+        spool.seek(0)
+        return spool
+    except BaseException:
+        spool.close()
+        raise
+
+
+def finish_session(manifest, image_id):
+    """Record the created image (so a retried complete returns it) and free the chunks"""
+    manifest['image_id'] = image_id
+    directory = _session_dir(manifest['upload_id'])
+    _write_json(os.path.join(directory, MANIFEST), manifest)
+    for name in os.listdir(directory):
+        if name.endswith('.part'):
+            os.remove(os.path.join(directory, name))
+
+
+def discard_session(upload_id):
+    shutil.rmtree(_session_dir(upload_id), ignore_errors=True)
+
+
+def sweep_chunked_uploads(max_age=RESUMABLE_UPLOAD_TTL):
+    """Remove uploads that were abandoned (or finished) more than max_age seconds ago"""
+    if not os.path.isdir(CHUNKED_UPLOAD_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for name in os.listdir(CHUNKED_UPLOAD_DIR):
+        directory = os.path.join(CHUNKED_UPLOAD_DIR, name)
+        try:
+            newest = max([os.path.getmtime(os.path.join(directory, entry)) for entry in os.listdir(directory)]
+                         + [os.path.getmtime(directory)])
+        except OSError:
+            continue
+        if newest < cutoff:
+            shutil.rmtree(directory, ignore_errors=True)
+            removed += 1
+    if removed:
+        print(f"🧹 Removed {removed} expired chunked upload(s)")
+    return removed
@@ -37,6 +37,80 @@ LEGACY_ASSETS_DIR = os.path.join(STATIC_DIR, 'assets')
 PHOTOGRAPHY_ASSETS_URL_PREFIX = '/data/'
 LEGACY_ASSETS_URL_PREFIX = '/data/'
 
+# Responsive derivatives generated at upload time (long edge, in pixels)
+DERIVATIVE_WIDTHS = (320, 640, 1280, 2048)
+DERIVATIVE_QUALITY = 82
+DERIVATIVES_DIR = os.path.join(PHOTOGRAPHY_ASSETS_DIR, 'derivatives')
+DERIVATIVES_URL_PREFIX = '/derivatives/'
+
+# On-demand resize cache (/img/<filename>?w=&h=&fit=&q=&fmt=), LRU-evicted past the size cap
+IMAGE_CACHE_DIR = os.path.join(DERIVATIVES_DIR, 'cache')
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get('IMAGE_CACHE_MAX_MB', '512')) * 1024 * 1024
+RESIZE_MAX_DIMENSION = 4096
+
+# Browser caching for volume images
+IMAGE_MAX_AGE = int(os.environ.get('IMAGE_MAX_AGE', '3600'))  # Plain filename URLs, revalidated by ETag afterwards
+IMMUTABLE_MAX_AGE = 31536000  # Content-addressed URLs never change
+
+# Content-addressed image URLs: /i/<first FINGERPRINT_LENGTH hex chars of the SHA-256>/<filename>
+FINGERPRINT_URL_PREFIX = '/i/'
+FINGERPRINT_LENGTH = 12
+VOLUME_ASSETS_URL_PREFIX = '/static/assets/'
+
+# Metadata backfill job (dimensions + EXIF for images uploaded before they were stored)
+BACKFILL_CHECKPOINT_FILE = os.path.join(PHOTOGRAPHY_ASSETS_DIR, '.backfill-checkpoint.json')
+BACKFILL_BATCH_SIZE = 50
+
+# Uploads spool here (same filesystem as the originals, so saving is a rename)
+UPLOAD_TEMP_DIR = os.path.join(PHOTOGRAPHY_ASSETS_DIR, '.uploads')
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Resumable chunked uploads (init/append/complete) - chunks live on the volume until reassembled
+CHUNKED_UPLOAD_DIR = os.path.join(PHOTOGRAPHY_ASSETS_DIR, '.chunks')
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024  # Small enough to finish well inside proxy timeouts
+RESUMABLE_MAX_SIZE = 200 * 1024 * 1024
+RESUMABLE_UPLOAD_TTL = 48 * 60 * 60  # Abandoned uploads are swept after this
+
+# Content-addressed originals (<hash[:2]>/<hash>); each image filename is a hard link to its blob
+BLOBS_DIR = os.path.join(PHOTOGRAPHY_ASSETS_DIR, '.blobs')
+
+# Threads used to delete files after bulk operations commit
+FILE_REMOVAL_THREADS = 4
+
+# SQLite connection settings, applied to every new connection by src/sqlite_tuning.py
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')  # WAL: readers never wait for the writer
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # Safe with WAL; only a power cut can lose the last commits
+SQLITE_CACHE_SIZE_MB = int(os.environ.get('SQLITE_CACHE_SIZE_MB', '32'))  # Page cache per connection
+SQLITE_MMAP_SIZE_MB = int(os.environ.get('SQLITE_MMAP_SIZE_MB', '256'))  # Read the database through mmap (0 disables)
+SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')  # Sorts and temp indexes stay off the volume
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))  # Wait this long for a lock before 'database is locked'
+
+# Backup snapshots (src/sqlite_tuning.snapshot) copy the database this many pages at a time, pausing between steps
+SQLITE_BACKUP_STEP_PAGES = int(os.environ.get('SQLITE_BACKUP_STEP_PAGES', '1024'))  # 4 MB with the default 4 KiB pages
+SQLITE_BACKUP_STEP_PAUSE_MS = int(os.environ.get('SQLITE_BACKUP_STEP_PAUSE_MS', '5'))  # Lets request threads at the disk and CPU
+
+# Optional route groups (see BLUEPRINTS in src/main.py) - a disabled group's modules are never imported.
+# Admin: the dashboard and its editors. Debug: debug/recovery routes (emergency backups, forced migration, cleanup)
+ENABLE_ADMIN_ROUTES = os.environ.get('ENABLE_ADMIN_ROUTES', '1') != '0'
+ENABLE_DEBUG_ROUTES = os.environ.get('ENABLE_DEBUG_ROUTES', '1') != '0'
+
+# Apply pending schema migrations (src/migrations.py) when the app starts; set MIGRATE_ON_BOOT=0 to
+# run `python -m src.migrations` as a release step instead
+MIGRATE_ON_BOOT = os.environ.get('MIGRATE_ON_BOOT', '1') != '0'
+
+# Upload post-processing job queue (jobs table) - set JOB_WORKER_THREADS=0 when a
+# separate `python -m src.jobs` process does the work
+JOB_WORKER_THREADS = int(os.environ.get('JOB_WORKER_THREADS', '1'))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '5'))  # Seconds between checks for jobs from other workers
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_DELAY = 30  # Seconds before the first retry, doubled for each one after
+JOB_STALE_AFTER = 15 * 60  # A job 'running' this long belonged to a worker that died
+
+# Modern formats offered to browsers that list them in Accept, in order of preference
+NEGOTIATED_IMAGE_FORMATS = tuple(
+    fmt.strip() for fmt in os.environ.get('NEGOTIATED_IMAGE_FORMATS', 'avif,webp').split(',') if fmt.strip()
+)
+
 def get_image_url(filename):
     """
     Get the URL for an image file
@@ -51,3 +125,18 @@ def get_legacy_image_url(filename):
     """
     return f"{LEGACY_ASSETS_URL_PREFIX}{filename}"
 
+def get_derivative_url(filename, width):
+    """
+    Get the URL for a resized derivative of an image
+    The server picks the closest generated size at or above the requested width
+    """
+    return f"{DERIVATIVES_URL_PREFIX}{int(width)}/{filename}"
+
+def get_fingerprinted_url(filename, content_hash):
+    """
+    Get the cache-forever URL for an image file
+    Falls back to the plain volume URL when the file has no stored digest
+    """
+    if not content_hash:
+        return f"{VOLUME_ASSETS_URL_PREFIX}{filename}"
+    return f"{FINGERPRINT_URL_PREFIX}{content_hash[:FINGERPRINT_LENGTH]}/{filename}"
@@ -0,0 +1,131 @@
+"""
+Data version counter for Mind's Eye Photography
+A single row in the data_version table is bumped inside every transaction
+that writes portfolio data, so all gunicorn workers see the same number.
+Read-side caches remember the version they were built at and rebuild once
+it moves on. The version is read at most once per request.
+"""
+import functools
+import threading
+from datetime import datetime
+from flask import g, has_app_context, has_request_context
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from .models import db, DataVersion
+
+# Attributes that are derived bookkeeping, not content - writing them doesn't stale caches
+# (content_hash is tracked: cached payloads switch to fingerprinted URLs once a hash job fills it)
+UNTRACKED_ATTRIBUTES = {'perceptual_hash'}
+
+# Tables holding bookkeeping rather than site data (job queue, blob reference counts, migrations, the counter itself)
+UNTRACKED_TABLES = {'data_version', 'jobs', 'image_blobs', 'schema_version'}
+
+_BUMPED = 'data_version_bumped'
+
+
+def _bump(connection):
+    """Increment the counter on connection (inside the caller's transaction)"""
+    table = DataVersion.__table__
+    connection.execute(
+        update(table).where(table.c.id == 1).values(version=table.c.version + 1, updated_date=datetime.utcnow())
+    )
+    return connection.execute(select(table.c.version).where(table.c.id == 1)).scalar() or 0
+
+
+def _read_version():
+    return db.session.execute(select(DataVersion.version).where(DataVersion.id == 1)).scalar() or 0
+
+
+def _forget_request_version():
+    if has_app_context():
+        g.pop('data_version', None)
+
+
+def current_version():
+    """Current data version, read once per request"""
+    if not has_request_context():
+        return _read_version()
+    if 'data_version' not in g:
+        g.data_version = _read_version()
+    return g.data_version
+
+
+def bump_data_version(reason=None):
+    """
+    Explicitly mark cached data as stale
+    Only needed after raw SQL writes - ORM flushes and bulk updates bump automatically
+    """
+    with db.engine.begin() as connection:
+        version = _bump(connection)
+    _forget_request_version()
+    print(f"🔄 Data version {version}" + (f" ({reason})" if reason else ""))
+    return version
+
+
+def versioned_cache(loader):
+    """Memoize a zero-argument loader in this worker until the data version changes"""
+    entry = {}
+    lock = threading.Lock()
+
+    @functools.wraps(loader)
+    def wrapper():
+        version = current_version()
+        cached = entry.get('value')
+        if cached and cached[0] == version:
+            return cached[1]
+        with lock:
+            value = loader()
+            entry['value'] = (version, value)
+        return value
+
+    wrapper.cache_clear = entry.clear
+    return wrapper
+
+
+def _is_tracked(obj):
+    return getattr(obj, '__tablename__', None) not in UNTRACKED_TABLES
+
+
+def _is_data_change(session):
+    """True if the pending flush touches anything besides bookkeeping columns"""
+    for obj in session.new | session.deleted:
+        if _is_tracked(obj):
+            return True
+    for obj in session.dirty:
+        if not _is_tracked(obj):
+            continue
+        changed = {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+        if changed - UNTRACKED_ATTRIBUTES:
+            return True
+    return False
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_flush(session, flush_context):
+    if not session.info.get(_BUMPED) and _is_data_change(session):
+        _bump(session.connection())
+        session.info[_BUMPED] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_on_bulk_write(orm_execute_state):
+    # Query.update()/delete() skip the flush, so catch them here
+    session = orm_execute_state.session
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete) or session.info.get(_BUMPED):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if getattr(table, 'name', None) not in UNTRACKED_TABLES:
+        _bump(session.connection())
+        session.info[_BUMPED] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    if session.info.pop(_BUMPED, None):
+        _forget_request_version()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop(_BUMPED, None)
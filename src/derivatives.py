@@ -0,0 +1,147 @@
+"""
+Responsive image derivatives for Mind's Eye Photography
+Builds a fixed ladder of resized copies for every uploaded Image so the
+portfolio grids never have to ship the 2-3 MB originals
+"""
+import os
+
+from .config import PHOTOGRAPHY_ASSETS_DIR, DERIVATIVES_DIR, DERIVATIVE_WIDTHS, DERIVATIVE_QUALITY
+
+
+def _derivative_filename(filename, width, fmt):
+    """
+    Name of the derivative file for a given original and ladder size
+    Keeps the original's full name (x.jpg -> x.jpg-800w.jpg) so x.jpg and x.png never share files.
+    """
+    ext = '.png' if fmt == 'PNG' else '.jpg'
+    return f"{filename}-{width}w{ext}"
+
+
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def generate_derivatives(image, source_path=None):
+    """
+    Build the derivative ladder for an Image row and record each variant
+    Sizes larger than the original are skipped (never upscale).
+    Existing variants are kept, so this is safe to call again.
+    Caller is responsible for committing the session.
+    """
+    from PIL import Image as PILImage, ImageOps  # Only upload post-processing decodes images
+    from .models import db, ImageDerivative
+
+    source_path = source_path or os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename)
+    if not os.path.exists(source_path):
+        print(f"⚠️  Derivatives skipped, original missing: {source_path}")
+        return []
+
+    # Drop rows whose files have gone missing so they get rebuilt
+    for derivative in list(image.derivatives):
+        if not os.path.exists(os.path.join(DERIVATIVES_DIR, derivative.filename)):
+            image.derivatives.remove(derivative)
+            db.session.delete(derivative)
+
+    existing = {d.width for d in image.derivatives}
+    wanted = [w for w in sorted(DERIVATIVE_WIDTHS, reverse=True) if w not in existing]
+    if not wanted:
+        return []
+
+    os.makedirs(DERIVATIVES_DIR, exist_ok=True)
+    created = []
+
+    with PILImage.open(source_path) as img:
+        icc_profile = img.info.get('icc_profile')  # Wide-gamut originals keep their colour in every size
+        original_size = img.size
+        if img.getexif().get(0x0112) in (5, 6, 7, 8):  # Rotated 90/270 by EXIF orientation
+            original_size = original_size[::-1]
+        long_edge = max(original_size)
+
+        # Let the JPEG decoder downscale while decoding when possible
+        img.draft('RGB', (wanted[0], wanted[0]))
+        img = ImageOps.exif_transpose(img)
+
+        if _has_alpha(img):
+            fmt = 'PNG'
+            working = img.convert('RGBA')
+        else:
+            fmt = 'JPEG'
+            working = img.convert('RGB')
+
+        if image.width is None or image.height is None:
+            image.width, image.height = original_size
+
+        # Largest first; each smaller size is resized from the previous one
+        for width in wanted:
+            if width >= long_edge:
+                continue  # Never upscale - the original is served instead
+
+            working = working.copy()
+            working.thumbnail((width, width), PILImage.LANCZOS)
+
+            derivative_name = _derivative_filename(image.filename, width, fmt)
+            final_path = os.path.join(DERIVATIVES_DIR, derivative_name)
+            temp_path = final_path + '.tmp'
+
+            if fmt == 'JPEG':
+                working.save(temp_path, 'JPEG', quality=DERIVATIVE_QUALITY, optimize=True, progressive=True,
+                             icc_profile=icc_profile)
+            else:
+                working.save(temp_path, 'PNG', optimize=True, icc_profile=icc_profile)
+            os.replace(temp_path, final_path)
+
+            derivative = ImageDerivative(
+                width=width,
+                actual_width=working.size[0],
+                actual_height=working.size[1],
+                filename=derivative_name,
+                format=fmt,
+                file_size=os.path.getsize(final_path)
+            )
+            image.derivatives.append(derivative)
+            created.append(derivative)
+
+    print(f"✅ Built {len(created)} derivative(s) for {image.filename}")
+    return created
+
+
+def _pixel_width(derivative):
+    # The ladder is sized by long edge, so a portrait's "640" is narrower than 640 px
+    return derivative.actual_width or derivative.width
+
+
+def pick_derivative(image, width):
+    """Smallest derivative at least `width` pixels wide, or None to use the original"""
+    for derivative in sorted(image.derivatives, key=_pixel_width):
+        if _pixel_width(derivative) >= width:
+            return derivative
+    return None
+
+
+def srcset_widths(image):
+    """Pixel widths of an image's derivatives, for srcset descriptors (/derivatives/<w>/ serves exactly that file)"""
+    return sorted({_pixel_width(derivative) for derivative in image.derivatives})
+
+
+def derivative_paths(image):
+    """
+    Paths of an image's derivative files (rows go with the Image cascade)
+    Collect them before deleting the image and remove them only once the delete has committed.
+    """
+    return [os.path.join(DERIVATIVES_DIR, derivative.filename) for derivative in image.derivatives]
+
+
+if __name__ == '__main__':
+    # Build missing derivatives for the whole library: python -m src.derivatives
+    from src.main import create_app
+    app = create_app()
+    from src.models import db, Image
+
+    with app.app_context():
+        for image in Image.query.all():
+            try:
+                generate_derivatives(image)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Derivatives failed for {image.filename}: {e}")
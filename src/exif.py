@@ -0,0 +1,99 @@
+"""
+EXIF extraction for Mind's Eye Photography
+Camera settings are read once when an image is uploaded and stored on the
+Image row, so the featured endpoints never have to open the original again
+"""
+from .image_probe import read_metadata
+
+# EXIF tag ids (base IFD and Exif sub-IFD)
+TAG_MAKE = 0x010F
+TAG_MODEL = 0x0110
+TAG_DATETIME = 0x0132
+TAG_EXPOSURE_TIME = 0x829A
+TAG_FNUMBER = 0x829D
+TAG_ISO = 0x8827
+TAG_DATETIME_ORIGINAL = 0x9003
+TAG_FLASH = 0x9209
+TAG_FOCAL_LENGTH = 0x920A
+TAG_EXPOSURE_MODE = 0xA402
+TAG_WHITE_BALANCE = 0xA403
+TAG_LENS_MODEL = 0xA434
+
+EXPOSURE_MODES = {0: 'Auto', 1: 'Manual', 2: 'Auto bracket'}
+WHITE_BALANCE_MODES = {0: 'Auto', 1: 'Manual'}
+
+# Image columns filled from EXIF, in the order they are shown
+EXIF_FIELDS = (
+    'capture_date', 'camera_make', 'camera_model', 'lens_model', 'focal_length', 'aperture',
+    'shutter_speed', 'iso', 'flash', 'exposure_mode', 'white_balance'
+)
+
+# exif_data keys the featured endpoints have always returned (exposure mode and white balance are stored only)
+FEATURED_EXIF_FIELDS = (
+    'capture_date', 'camera_make', 'camera_model', 'lens_model', 'focal_length', 'aperture',
+    'shutter_speed', 'iso', 'flash'
+)
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    value = str(value).strip('\x00 ').strip()
+    return value or None
+
+
+def format_shutter_speed(value):
+    """1/2000 for fast exposures, 2.5s for long ones"""
+    value = float(value)
+    if 0 < value < 1:
+        return f"1/{int(round(1.0 / value))}"
+    if value >= 1:
+        return f"{value:.1f}s"
+    return str(value)
+
+
+def format_exif(tags):
+    """Display values for EXIF_FIELDS from a {tag id: raw value} mapping"""
+    data = {}
+    converters = (
+        ('capture_date', (TAG_DATETIME_ORIGINAL, TAG_DATETIME), _text),
+        ('camera_make', (TAG_MAKE,), _text),
+        ('camera_model', (TAG_MODEL,), _text),
+        ('lens_model', (TAG_LENS_MODEL,), _text),
+        ('focal_length', (TAG_FOCAL_LENGTH,), lambda v: f"{float(v):.1f}mm"),
+        ('aperture', (TAG_FNUMBER,), lambda v: f"f/{float(v):.1f}"),
+        ('shutter_speed', (TAG_EXPOSURE_TIME,), format_shutter_speed),
+        ('iso', (TAG_ISO,), lambda v: f"ISO {v[0] if isinstance(v, tuple) else v}"),
+        ('flash', (TAG_FLASH,), lambda v: "Yes" if int(v) & 1 else "No"),
+        ('exposure_mode', (TAG_EXPOSURE_MODE,), lambda v: EXPOSURE_MODES.get(int(v), str(v))),
+        ('white_balance', (TAG_WHITE_BALANCE,), lambda v: WHITE_BALANCE_MODES.get(int(v), str(v))),
+    )
+    for field, tag_ids, convert in converters:
+        for tag_id in tag_ids:
+            if tags.get(tag_id) is None:
+                continue
+            try:
+                value = convert(tags[tag_id])
+            except (TypeError, ValueError, ZeroDivisionError):
+                continue
+            if value:
+                data[field] = value[:100]
+                break
+    return data
+
+
+def extract_exif(path):
+    """Formatted EXIF for an image file ({} when it has none) - headers only"""
+    return format_exif(read_metadata(path)[2])
+
+
+def apply_exif(image, path):
+    """
+    Store EXIF from path on an Image row and mark it extracted
+    Returns the extracted dict. Caller is responsible for committing.
+    """
+    data = extract_exif(path)
+    for field in EXIF_FIELDS:
+        setattr(image, field, data.get(field))
+    image.exif_extracted = True
+    return data
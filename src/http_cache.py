@@ -0,0 +1,81 @@
+"""
+HTTP caching helpers for volume images
+Strong ETags come from the SHA-256 of the original file, stored on the Image
+row so it is computed once per upload instead of once per request. Request
+paths only read the stored hash - rows without one (files placed on the volume
+directly) get it from a background 'hash' job and are served under their plain
+URL until then.
+"""
+import os
+import hashlib
+from flask import send_file
+
+from .config import IMAGE_MAX_AGE, IMMUTABLE_MAX_AGE, get_fingerprinted_url
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ensure_content_hash(image, path=None):
+    """
+    Content hash for an Image, computing it if missing (caller commits)
+    Hashes the whole file - for jobs and CLIs, never request paths.
+    Returns None when the original file isn't on the volume
+    """
+    if image.content_hash:
+        return image.content_hash
+
+    from .config import PHOTOGRAPHY_ASSETS_DIR
+
+    path = path or os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename)
+    if not os.path.isfile(path):
+        return None
+    image.content_hash = file_sha256(path)
+    return image.content_hash
+
+
+def lookup_content_hash(filename):
+    """Stored content hash for an image filename (None for files not in the database)"""
+    from .models import Image
+
+    image = Image.query.filter_by(filename=filename).first()
+    return image.content_hash if image else None
+
+
+def image_url(image):
+    """Fingerprinted URL for an Image row - changes whenever the file content does (plain URL until hashed)"""
+    return get_fingerprinted_url(image.filename, image.content_hash)
+
+
+def variant_etag(content_hash, variant_path):
+    """ETag for a derived file (resize/transcode) - unique per representation"""
+    if not content_hash:
+        return None
+    tag = hashlib.sha1(os.path.basename(variant_path).encode('utf-8')).hexdigest()[:12]
+    return f"{content_hash}-{tag}"
+
+
+def send_image(path, mimetype=None, etag=None, immutable=False):
+    """
+    send_file with our caching policy
+    Honours If-None-Match / If-Modified-Since with 304s. Content-addressed URLs
+    get a one year immutable lifetime; everything else is revalidated by ETag.
+    """
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        etag=etag or True,
+        conditional=True,
+        max_age=IMMUTABLE_MAX_AGE if immutable else IMAGE_MAX_AGE
+    )
+    if immutable:
+        response.cache_control.immutable = True
+    return response
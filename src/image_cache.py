@@ -0,0 +1,290 @@
+"""
+On-demand image resizing with a bounded on-disk cache
+Resized copies are built from the volume original on first request, kept in
+IMAGE_CACHE_DIR and evicted least-recently-used once the cache exceeds its cap.
+Concurrent first requests for the same variant are coalesced so a burst of
+visitors only decodes the original once.
+"""
+import os
+import hashlib
+import threading
+import importlib.util
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+from .config import (IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, RESIZE_MAX_DIMENSION, DERIVATIVE_QUALITY,
+                     NEGOTIATED_IMAGE_FORMATS)
+
+FIT_MODES = ('contain', 'cover')
+
+# Output format name -> (Pillow format, file extension, mimetype)
+OUTPUT_FORMATS = {
+    'jpeg': ('JPEG', '.jpg', 'image/jpeg'),
+    'png': ('PNG', '.png', 'image/png'),
+    'webp': ('WEBP', '.webp', 'image/webp'),
+}
+# Checked without importing Pillow (PIL.features would), which only loads once an image is rendered
+if importlib.util.find_spec('PIL._avif') is not None:
+    OUTPUT_FORMATS['avif'] = ('AVIF', '.avif', 'image/avif')
+
+FORMAT_ALIASES = {'jpg': 'jpeg'}
+
+RESIZABLE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+# Originals worth transcoding for Accept negotiation (GIFs may be animated)
+TRANSCODABLE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+# Encoder quality used for negotiated transcodes of full-size images
+TRANSCODE_QUALITY = {'webp': 80, 'avif': 60}
+
+# Part of every cache key - bump it when rendering changes so variants cached by the old code are rebuilt
+RENDER_VERSION = 2  # 2: ICC profiles carried over
+
+
+class ResizeParams:
+    """Validated resize request (width, height, fit, quality, output format)"""
+
+    def __init__(self, width=None, height=None, fit='contain', quality=DERIVATIVE_QUALITY, fmt=None):
+        self.width = width
+        self.height = height
+        self.fit = fit
+        self.quality = quality
+        self.fmt = fmt
+
+    @classmethod
+    def from_args(cls, args):
+        """Build from request query args; raises ValueError on bad input"""
+        def dimension(name):
+            value = args.get(name)
+            if value in (None, ''):
+                return None
+            value = int(value)
+            if not 1 <= value <= RESIZE_MAX_DIMENSION:
+                raise ValueError(f"{name} must be between 1 and {RESIZE_MAX_DIMENSION}")
+            return value
+
+        fit = args.get('fit', 'contain').lower()
+        if fit not in FIT_MODES:
+            raise ValueError(f"fit must be one of {', '.join(FIT_MODES)}")
+
+        quality = int(args.get('q', DERIVATIVE_QUALITY))
+        if not 1 <= quality <= 95:
+            raise ValueError("q must be between 1 and 95")
+
+        fmt = args.get('fmt')
+        if fmt:
+            fmt = FORMAT_ALIASES.get(fmt.lower(), fmt.lower())
+            if fmt not in OUTPUT_FORMATS:
+                raise ValueError(f"fmt must be one of {', '.join(OUTPUT_FORMATS)}")
+
+        return cls(dimension('w'), dimension('h'), fit, quality, fmt)
+
+    def output_format(self, source_path):
+        """Requested format, or one matching the original's file type"""
+        if self.fmt:
+            return self.fmt
+        ext = os.path.splitext(source_path)[1].lower()
+        return {'.png': 'png', '.gif': 'png', '.webp': 'webp'}.get(ext, 'jpeg')
+
+    def cache_key(self, source_path):
+        """Stable key that changes whenever the original file is replaced"""
+        stat = os.stat(source_path)
+        raw = '|'.join(str(part) for part in (
+            RENDER_VERSION, os.path.basename(source_path), stat.st_mtime_ns, stat.st_size,
+            self.width, self.height, self.fit, self.quality, self.output_format(source_path)
+        ))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def render_variant(source_path, params, dest_path):
+    """Decode the original, resize per params and write dest_path atomically"""
+    from PIL import Image as PILImage, ImageOps
+
+    with PILImage.open(source_path) as img:
+        icc_profile = img.info.get('icc_profile')
+        target = (params.width or RESIZE_MAX_DIMENSION, params.height or RESIZE_MAX_DIMENSION)
+        img.draft('RGB', target)
+        img = ImageOps.exif_transpose(img)
+
+        fmt = params.output_format(source_path)
+        pil_format = OUTPUT_FORMATS[fmt][0]
+        img = img.convert('RGBA' if _has_alpha(img) and fmt != 'jpeg' else 'RGB')
+
+        if params.width or params.height:
+            if params.fit == 'cover' and params.width and params.height:
+                img = ImageOps.fit(img, (params.width, params.height), PILImage.LANCZOS)
+            else:
+                img.thumbnail(target, PILImage.LANCZOS)
+
+        save_kwargs = {}
+        if pil_format in ('JPEG', 'WEBP', 'AVIF'):
+            save_kwargs['quality'] = params.quality
+        if pil_format == 'JPEG':
+            save_kwargs.update(optimize=True, progressive=True)
+        elif pil_format == 'PNG':
+            save_kwargs['optimize'] = True
+        if icc_profile:
+            save_kwargs['icc_profile'] = icc_profile  # Without it wide-gamut photos render washed out
+
+        temp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        img.save(temp_path, pil_format, **save_kwargs)
+        os.replace(temp_path, dest_path)
+    return dest_path
+
+
+class ResizeCache:
+    """Size-capped on-disk LRU cache of resized images"""
+
+    def __init__(self, directory=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._guard = threading.Lock()
+        self._inflight = {}
+        self._evict_lock = threading.Lock()
+        self._approx_bytes = None
+
+    def _path(self, key, fmt):
+        return os.path.join(self.directory, key[:2], key + OUTPUT_FORMATS[fmt][1])
+
+    @contextmanager
+    def _process_lock(self, lock_path):
+        """Cross-worker lock so gunicorn workers don't render the same variant twice"""
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, source_path, params):
+        """
+        Path of the cached variant, rendering it on first request
+        Returns (path, mimetype)
+        """
+        fmt = params.output_format(source_path)
+        key = params.cache_key(source_path)
+        path = self._path(key, fmt)
+        mimetype = OUTPUT_FORMATS[fmt][2]
+
+        if os.path.exists(path):
+            self._touch(path)
+            return path, mimetype
+
+        # Coalesce concurrent misses for the same key within this process
+        with self._guard:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                if not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    lock_path = path + '.lock'
+                    with self._process_lock(lock_path):
+                        # Another worker may have finished while we waited
+                        if not os.path.exists(path):
+                            render_variant(source_path, params, path)
+                            self._account(os.path.getsize(path))
+                    try:
+                        os.remove(lock_path)
+                    except OSError:
+                        pass
+                return path, mimetype
+        finally:
+            with self._guard:
+                self._inflight.pop(key, None)
+
+    @staticmethod
+    def _touch(path):
+        """Record a hit - mtime doubles as last-access time for LRU eviction"""
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(('.tmp', '.lock')):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, added_bytes):
+        """Track cache size and evict once it passes the cap"""
+        with self._evict_lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._approx_bytes += added_bytes
+            if self._approx_bytes > self.max_bytes:
+                self._approx_bytes = self.evict()
+
+    def evict(self, target_ratio=0.9):
+        """Delete least-recently-used files until under target_ratio of the cap"""
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * target_ratio
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            print(f"🧹 Image cache evicted {removed} file(s), now {total / (1024 * 1024):.1f} MB")
+        return total
+
+
+resize_cache = ResizeCache()
+
+
+def negotiate_format(accept_mimetypes):
+    """
+    Best modern format the client explicitly accepts, or None
+    Wildcards don't count - */* doesn't mean the browser can decode AVIF
+    """
+    accepted = {mimetype for mimetype, quality in accept_mimetypes if quality > 0}
+    for fmt in NEGOTIATED_IMAGE_FORMATS:
+        if fmt in OUTPUT_FORMATS and OUTPUT_FORMATS[fmt][2] in accepted:
+            return fmt
+    return None
+
+
+def negotiated_variant(source_path, accept_mimetypes):
+    """
+    Cached WebP/AVIF transcode of source_path the client accepts
+    Returns (path, mimetype), or None when the original should be sent as-is
+    """
+    if os.path.splitext(source_path)[1].lower() not in TRANSCODABLE_EXTENSIONS:
+        return None
+    fmt = negotiate_format(accept_mimetypes)
+    if not fmt:
+        return None
+
+    params = ResizeParams(quality=TRANSCODE_QUALITY.get(fmt, DERIVATIVE_QUALITY), fmt=fmt)
+    path, mimetype = resize_cache.get(source_path, params)
+
+    # A transcode that came out heavier than the original isn't worth sending
+    if os.path.getsize(path) >= os.path.getsize(source_path):
+        return None
+    return path, mimetype
@@ -0,0 +1,222 @@
+"""
+Header-only image metadata probe for Mind's Eye Photography
+Reads dimensions and EXIF straight from the JPEG/PNG/WebP container through
+mmap, looking at no more than PROBE_MAX_BYTES from the start of the file.
+Pixel data is never touched, so a 30 MB original costs a few page faults
+instead of a decoder setup.
+"""
+import os
+import mmap
+import struct
+
+PROBE_MAX_BYTES = 1024 * 1024  # EXIF and the frame header sit well inside this
+
+EXIF_IFD_POINTER = 0x8769
+ORIENTATION = 0x0112
+
+# TIFF field type -> (struct code, size in bytes)
+TIFF_TYPES = {
+    1: ('B', 1), 2: ('s', 1), 3: ('H', 2), 4: ('I', 4), 5: ('II', 8), 6: ('b', 1),
+    7: ('s', 1), 8: ('h', 2), 9: ('i', 4), 10: ('ii', 8), 11: ('f', 4), 12: ('d', 8),
+}
+
+# JPEG start-of-frame markers (everything C0-CF except DHT, JPG and DAC)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class ProbeResult:
+    """What the probe found: format, pixel size as stored and raw EXIF tags"""
+
+    def __init__(self, fmt, width, height, exif=None):
+        self.format = fmt
+        self.width = width
+        self.height = height
+        self.exif = exif or {}
+
+    @property
+    def orientation(self):
+        return self.exif.get(ORIENTATION, 1)
+
+    @property
+    def display_size(self):
+        """(width, height) after applying EXIF orientation"""
+        if self.orientation in (5, 6, 7, 8):
+            return self.height, self.width
+        return self.width, self.height
+
+
+# ----------------------------------------------------------------------------
+# EXIF (TIFF structure inside APP1 / eXIf / EXIF chunks)
+# ----------------------------------------------------------------------------
+
+def _read_ifd(tiff, offset, endian):
+    """Tags of one IFD as {tag: value}; rationals become floats, single values are unwrapped"""
+    tags = {}
+    if offset + 2 > len(tiff):
+        return tags
+    count = struct.unpack_from(endian + 'H', tiff, offset)[0]
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        if entry + 12 > len(tiff):
+            break
+        tag, field_type, n = struct.unpack_from(endian + 'HHI', tiff, entry)
+        if field_type not in TIFF_TYPES:
+            continue
+        code, size = TIFF_TYPES[field_type]
+        length = size * n
+        data_offset = entry + 8 if length <= 4 else struct.unpack_from(endian + 'I', tiff, entry + 8)[0]
+        if data_offset + length > len(tiff):
+            continue
+
+        if field_type in (2, 7):
+            value = bytes(tiff[data_offset:data_offset + length])
+            if field_type == 2:
+                value = value.split(b'\x00', 1)[0].decode('utf-8', errors='replace')
+        elif field_type in (5, 10):
+            raw = struct.unpack_from(endian + code[0] * (2 * n), tiff, data_offset)
+            value = tuple(num / den if den else 0.0 for num, den in zip(raw[::2], raw[1::2]))
+            value = value[0] if n == 1 else value
+        else:
+            value = struct.unpack_from(endian + code * n, tiff, data_offset)
+            value = value[0] if n == 1 else value
+        tags[tag] = value
+    return tags
+
+
+def parse_exif(tiff):
+    """IFD0 plus the Exif sub-IFD of a TIFF/EXIF block, merged into one dict"""
+    if len(tiff) < 8 or tiff[:2] not in (b'II', b'MM'):
+        return {}
+    endian = '<' if tiff[:2] == b'II' else '>'
+    try:
+        if struct.unpack_from(endian + 'H', tiff, 2)[0] != 42:
+            return {}
+        tags = _read_ifd(tiff, struct.unpack_from(endian + 'I', tiff, 4)[0], endian)
+        exif_offset = tags.pop(EXIF_IFD_POINTER, None)
+        if isinstance(exif_offset, int):
+            tags.update(_read_ifd(tiff, exif_offset, endian))
+    except struct.error:
+        pass
+    return tags
+
+
+# ----------------------------------------------------------------------------
+# Containers
+# ----------------------------------------------------------------------------
+
+def _probe_jpeg(buf):
+    exif = {}
+    pos = 2
+    while pos + 4 <= len(buf):
+        if buf[pos] != 0xFF:
+            return None  # Lost sync - not a JPEG we understand
+        marker = buf[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # Markers without a length
+            pos += 2
+            continue
+        length = struct.unpack_from('>H', buf, pos + 2)[0]
+        segment = pos + 4
+        if marker == 0xE1 and not exif and buf[segment:segment + 6] == b'Exif\x00\x00':
+            exif = parse_exif(buf[segment + 6:pos + 2 + length])
+        elif marker in SOF_MARKERS:
+            height, width = struct.unpack_from('>HH', buf, segment + 1)
+            return ProbeResult('JPEG', width, height, exif)
+        elif marker == 0xDA:  # Start of scan without a frame header
+            return None
+        pos += 2 + length
+    return None
+
+
+def _probe_png(buf):
+    width, height = struct.unpack_from('>II', buf, 16)
+    exif = {}
+    pos = 8
+    while pos + 8 <= len(buf):
+        length, chunk = struct.unpack_from('>I4s', buf, pos)
+        if chunk == b'eXIf':
+            exif = parse_exif(buf[pos + 8:pos + 8 + length])
+            break
+        if chunk in (b'IDAT', b'IEND'):
+            break
+        pos += 12 + length
+    return ProbeResult('PNG', width, height, exif)
+
+
+def _probe_webp(buf):
+    width = height = None
+    exif = {}
+    pos = 12
+    while pos + 8 <= len(buf):
+        chunk, length = struct.unpack_from('<4sI', buf, pos)
+        data = pos + 8
+        if chunk == b'VP8X':
+            width = 1 + int.from_bytes(buf[data + 4:data + 7], 'little')
+            height = 1 + int.from_bytes(buf[data + 7:data + 10], 'little')
+        elif chunk == b'VP8 ' and width is None:
+            width, height = (v & 0x3FFF for v in struct.unpack_from('<HH', buf, data + 6))
+        elif chunk == b'VP8L' and width is None:
+            bits = int.from_bytes(buf[data + 1:data + 5], 'little')
+            width, height = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        elif chunk == b'EXIF':
+            block = buf[data:data + length]
+            if block[:6] == b'Exif\x00\x00':
+                block = block[6:]
+            exif = parse_exif(block)
+        pos = data + length + (length & 1)
+    if width is None:
+        return None
+    return ProbeResult('WEBP', width, height, exif)
+
+
+def probe_buffer(buf):
+    """Probe an in-memory (or mmapped) image prefix; None for unsupported/corrupt data"""
+    try:
+        if buf[:2] == b'\xff\xd8':
+            return _probe_jpeg(buf)
+        if buf[:8] == b'\x89PNG\r\n\x1a\n':
+            return _probe_png(buf)
+        if buf[:4] == b'RIFF' and buf[8:12] == b'WEBP':
+            return _probe_webp(buf)
+    except (struct.error, IndexError, ValueError):
+        pass
+    return None
+
+
+def probe_image(path, max_bytes=PROBE_MAX_BYTES):
+    """Probe an image file's headers; None when the format isn't JPEG/PNG/WebP or is unreadable"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None
+        length = min(size, max_bytes)
+        try:
+            with mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ) as buf:
+                return probe_buffer(buf)
+        except (OSError, ValueError):
+            return probe_buffer(f.read(length))
+
+
+def read_metadata(path):
+    """
+    (width, height, exif tags) for any image the site accepts
+    Uses the header probe, and a lazy Pillow open (still no pixel decode) for
+    formats it doesn't parse such as GIF. Width/height follow EXIF orientation.
+    """
+    result = probe_image(path)
+    if result is not None:
+        width, height = result.display_size
+        return width, height, result.exif
+
+    from PIL import Image as PILImage
+
+    with PILImage.open(path) as img:
+        width, height = img.size
+        exif = img.getexif()
+        tags = dict(exif)
+        tags.update(exif.get_ifd(EXIF_IFD_POINTER))
+    if tags.get(ORIENTATION) in (5, 6, 7, 8):
+        width, height = height, width
+    return width, height, tags
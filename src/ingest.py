@@ -0,0 +1,166 @@
+"""
+Upload ingest for Mind's Eye Photography
+Multipart file parts are streamed by Werkzeug straight into a temp file on
+the volume, hashing and counting bytes as each chunk is written. Saving an
+upload is then an fsync and an atomic rename - the file is never copied or
+re-read, memory stays bounded whatever the size, and a worker that dies
+mid-upload leaves only a temp file under UPLOAD_TEMP_DIR, which is never
+served and is swept on the next boot.
+"""
+import os
+import time
+import hashlib
+import tempfile
+from flask import Request
+
+from .config import UPLOAD_TEMP_DIR, UPLOAD_CHUNK_SIZE
+
+STALE_TEMP_SECONDS = 6 * 60 * 60
+
+
+def fsync_directory(directory):
+    """Persist a rename in directory (no-op where directories can't be opened)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def new_file_mode():
+    """Mode open() gives a new file (0o666 less the umask) - mkstemp's files are 0600 and keep that when renamed"""
+    try:
+        with open('/proc/self/status') as status:  # Reads the umask without changing it (Linux 4.7+)
+            for line in status:
+                if line.startswith('Umask:'):
+                    return 0o666 & ~int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class HashingSpoolFile:
+    """
+    Temp file that hashes everything written to it
+    Werkzeug writes a file part sequentially and then seeks back to read, so
+    once parsing is done sha256/size describe the whole upload.
+    """
+
+    def __init__(self, directory=UPLOAD_TEMP_DIR):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix='upload-', suffix='.tmp', dir=directory)
+        self._file = os.fdopen(fd, 'w+b')
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        if name == '_file':  # Not set yet (mkstemp failed in __init__) - don't recurse looking it up
+            raise AttributeError(name)
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def commit(self, final_path):
+        """fsync and rename into place; returns (size, sha256 hex)"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        os.chmod(self.path, new_file_mode())
+        os.replace(self.path, final_path)
+        self.path = None
+        fsync_directory(os.path.dirname(final_path))
+        return self.size, self.sha256.hexdigest()
+
+    def close(self):
+        self._file.close()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+class IngestRequest(Request):
+    """Request whose file uploads spool to the volume through HashingSpoolFile"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpoolFile()
+
+
+def _copy_stream(file_storage, final_path):
+    """Fallback for streams that didn't come through IngestRequest: chunked copy, hashing as it goes"""
+    directory = os.path.dirname(final_path)
+    fd, temp_path = tempfile.mkstemp(prefix='.upload-', suffix='.tmp', dir=directory)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            file_storage.stream.seek(0)
+            for chunk in iter(lambda: file_storage.stream.read(UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, new_file_mode())
+        os.replace(temp_path, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(directory)
+    return size, digest.hexdigest()
+
+
+def spooled_digest(file_storage):
+    """(size, SHA-256 hex) of an upload already hashed while spooling, or None"""
+    stream = file_storage.stream
+    if isinstance(stream, HashingSpoolFile) and stream.path:
+        return stream.size, stream.sha256.hexdigest()
+    return None
+
+
+def save_upload(file_storage, final_path):
+    """
+    Durably store an uploaded FileStorage at final_path
+    Returns (size in bytes, SHA-256 hex digest).
+    """
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    stream = file_storage.stream
+    if isinstance(stream, HashingSpoolFile) and stream.path:
+        # Renaming needs the same filesystem - copy when the destination is elsewhere
+        if os.stat(stream.path).st_dev == os.stat(os.path.dirname(final_path)).st_dev:
+            return stream.commit(final_path)
+    return _copy_stream(file_storage, final_path)
+
+
+def sweep_upload_temp(max_age=STALE_TEMP_SECONDS):
+    """Remove temp files left behind by workers that died mid-upload"""
+    if not os.path.isdir(UPLOAD_TEMP_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for name in os.listdir(UPLOAD_TEMP_DIR):
+        path = os.path.join(UPLOAD_TEMP_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    if removed:
+        print(f"🧹 Removed {removed} abandoned upload temp file(s)")
+    return removed
@@ -0,0 +1,304 @@
+"""
+Background job queue for Mind's Eye Photography
+Upload post-processing (EXIF, the derivative ladder, WebP/AVIF transcodes
+and perceptual hashes) runs here instead of inside the upload request. Jobs
+live in the jobs table next to the images, so they survive restarts and are
+shared by every gunicorn worker; a worker claims a job with a conditional
+UPDATE, so each job runs once even with several workers polling.
+
+    python -m src.jobs [--threads 2]    # dedicated worker process
+"""
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert
+
+from .config import (PHOTOGRAPHY_ASSETS_DIR, DERIVATIVES_DIR, NEGOTIATED_IMAGE_FORMATS, JOB_WORKER_THREADS,
+                     JOB_POLL_INTERVAL, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY, JOB_STALE_AFTER)
+from .models import db, Image, Job
+
+# Post-processing run for every new upload, in the order they are queued
+# (the content hash is computed while the upload streams in; 'hash' is for files placed on the volume directly)
+UPLOAD_JOBS = ('exif', 'derivatives', 'phash')
+
+# Jobs queued once another finishes (transcodes need the derivatives on disk)
+FOLLOW_UP_JOBS = {'derivatives': ('transcode',)}
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+_handlers = {}
+_wakeup = threading.Event()
+_worker_threads = []
+
+
+def job_handler(kind):
+    """Register fn(image, path) as the handler for a job kind"""
+    def decorator(fn):
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+# ----------------------------------------------------------------------------
+# Handlers - each is idempotent, so a retried or re-queued job is harmless
+# ----------------------------------------------------------------------------
+
+@job_handler('hash')
+def hash_original(image, path):
+    from .http_cache import file_sha256
+
+    image.content_hash = file_sha256(path)
+
+
+@job_handler('exif')
+def extract_metadata(image, path):
+    from .exif import apply_exif
+    from .image_probe import read_metadata
+
+    if image.width is None or image.height is None:
+        image.width, image.height, _ = read_metadata(path)
+    apply_exif(image, path)
+
+
+@job_handler('derivatives')
+def build_derivatives(image, path):
+    from .derivatives import generate_derivatives
+
+    generate_derivatives(image, path)
+
+
+@job_handler('phash')
+def perceptual_hash(image, path):
+    from .perceptual import dhash
+
+    image.perceptual_hash = dhash(path)
+
+
+@job_handler('transcode')
+def warm_transcodes(image, path):
+    """Render the WebP/AVIF copies browsers will negotiate, for the original and each derivative"""
+    from .image_cache import ResizeParams, resize_cache, TRANSCODABLE_EXTENSIONS, TRANSCODE_QUALITY, OUTPUT_FORMATS
+    from .config import DERIVATIVE_QUALITY
+
+    sources = [path] + [os.path.join(DERIVATIVES_DIR, d.filename) for d in image.derivatives]
+    for source in sources:
+        if not os.path.exists(source) or os.path.splitext(source)[1].lower() not in TRANSCODABLE_EXTENSIONS:
+            continue
+        for fmt in NEGOTIATED_IMAGE_FORMATS:
+            if fmt in OUTPUT_FORMATS:
+                resize_cache.get(source, ResizeParams(quality=TRANSCODE_QUALITY.get(fmt, DERIVATIVE_QUALITY), fmt=fmt))
+
+
+# ----------------------------------------------------------------------------
+# Queue
+# ----------------------------------------------------------------------------
+
+def enqueue(kind, image_id):
+    """
+    Queue a job for an image
+    A job that is already queued or running is left alone; a finished or
+    failed one is queued again from scratch. A single upsert, so two requests
+    queueing the same job at once can't collide on the (kind, image_id)
+    constraint. Caller is responsible for committing - queue jobs in the same
+    transaction as the rows they process.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    now = datetime.utcnow()
+    statement = insert(Job).values(kind=kind, image_id=image_id, status='queued', attempts=0,
+                                   run_after=now, created_date=now, updated_date=now)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['kind', 'image_id'],
+        set_={'status': 'queued', 'attempts': 0, 'last_error': None, 'run_after': now, 'updated_date': now},
+        where=Job.status.in_(('done', 'failed')),
+    ))
+
+
+def enqueue_upload_jobs(image_id):
+    """Queue the post-processing every new upload needs (caller commits)"""
+    for kind in UPLOAD_JOBS:
+        enqueue(kind, image_id)
+
+
+def notify_workers():
+    """Wake this process's workers now instead of at their next poll"""
+    _wakeup.set()
+
+
+def claim_next_job():
+    """Atomically mark the oldest runnable job as running and return it, or None"""
+    while True:
+        now = datetime.utcnow()
+        job_id = db.session.query(Job.id).filter(
+            Job.status == 'queued', Job.run_after <= now
+        ).order_by(Job.id).limit(1).scalar()
+        if job_id is None:
+            return None
+
+        # Only one worker wins the queued -> running transition
+        result = db.session.execute(
+            update(Job).where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', attempts=Job.attempts + 1, updated_date=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return db.session.get(Job, job_id)
+
+
+def run_job(job):
+    """Run one claimed job, recording success, a scheduled retry or failure"""
+    job_id, kind, image_id = job.id, job.kind, job.image_id
+    try:
+        image = db.session.get(Image, image_id)
+        path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename) if image else None
+        if image is None:
+            print(f"ℹ️  Job {kind} skipped, image {image_id} no longer exists")
+        elif not os.path.exists(path):
+            raise FileNotFoundError(f"Original missing: {path}")
+        else:
+            _handlers[kind](image, path)
+            db.session.flush()
+            # Writing took the database lock, so a delete can't slip in after this check
+            if db.session.query(Image.id).filter_by(id=image_id).scalar() is None:
+                return _discard_results(job_id, image)
+            for follow_up in FOLLOW_UP_JOBS.get(kind, ()):
+                enqueue(follow_up, image_id)
+
+        job.status = 'done'
+        job.last_error = None
+        job.updated_date = datetime.utcnow()
+        db.session.commit()
+        return True
+
+    except Exception as e:
+        db.session.rollback()
+        job = db.session.get(Job, job_id)
+        job.last_error = f"{type(e).__name__}: {e}"[:2000]
+        job.updated_date = datetime.utcnow()
+        if job.attempts >= JOB_MAX_ATTEMPTS:
+            job.status = 'failed'
+            print(f"❌ Job {kind} for {image_id} failed after {job.attempts} attempt(s): {e}")
+        else:
+            job.status = 'queued'
+            job.run_after = datetime.utcnow() + timedelta(seconds=JOB_RETRY_DELAY * 2 ** (job.attempts - 1))
+            print(f"⚠️  Job {kind} for {image_id} failed (attempt {job.attempts}), retrying at {job.run_after}: {e}")
+        db.session.commit()
+        return False
+
+
+def _discard_results(job_id, image):
+    """The image was deleted while its job ran - drop the rows and files the job produced"""
+    filenames = [d.filename for d in image.derivatives]
+    db.session.rollback()
+    for filename in filenames:
+        path = os.path.join(DERIVATIVES_DIR, filename)
+        if os.path.exists(path):
+            os.remove(path)
+    job = db.session.get(Job, job_id)
+    job.status = 'done'
+    job.updated_date = datetime.utcnow()
+    db.session.commit()
+    print(f"ℹ️  Job {job.kind} discarded, image {job.image_id} was deleted while it ran")
+    return True
+
+
+def requeue_stale_jobs():
+    """Put back jobs left 'running' by a worker that was killed mid-job"""
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_AFTER)
+    result = db.session.execute(
+        update(Job).where(Job.status == 'running', Job.updated_date < cutoff)
+        .values(status='queued', run_after=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount:
+        print(f"🔄 Re-queued {result.rowcount} stale job(s)")
+    return result.rowcount
+
+
+def retry_failed_jobs():
+    """Give every failed job a fresh set of attempts"""
+    result = db.session.execute(
+        update(Job).where(Job.status == 'failed')
+        .values(status='queued', attempts=0, run_after=datetime.utcnow(), updated_date=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def job_summary(limit=20):
+    """Counts per status plus the most recent problem jobs, for the dashboard"""
+    rows = db.session.query(Job.status, db.func.count(Job.id)).group_by(Job.status).all()
+    counts = {status: 0 for status in JOB_STATUSES}
+    counts.update({status: count for status, count in rows})
+    problems = Job.query.filter(Job.last_error != None).order_by(Job.updated_date.desc()).limit(limit).all()
+    return {'counts': counts, 'problems': [job.to_dict() for job in problems]}
+
+
+# ----------------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------------
+
+def work(app, stop_event=None):
+    """Worker loop: run jobs until there are none, then sleep until woken or the next poll"""
+    stop_event = stop_event or threading.Event()
+    last_stale_check = None
+    while not stop_event.is_set():
+        ran = False
+        try:
+            with app.app_context():
+                if last_stale_check is None or (datetime.utcnow() - last_stale_check).total_seconds() > JOB_STALE_AFTER / 2:
+                    requeue_stale_jobs()
+                    last_stale_check = datetime.utcnow()
+                job = claim_next_job()
+                if job is not None:
+                    run_job(job)
+                    ran = True
+        except Exception as e:
+            print(f"❌ Job worker error: {e}")
+            traceback.print_exc()
+
+        if not ran:
+            _wakeup.wait(JOB_POLL_INTERVAL)
+            _wakeup.clear()
+
+
+def start_job_workers(app, threads=JOB_WORKER_THREADS):
+    """Start background worker threads in this process (no-op if already running or threads is 0)"""
+    global _worker_threads
+    _worker_threads = [thread for thread in _worker_threads if thread.is_alive()]
+    if _worker_threads or threads <= 0:
+        return _worker_threads
+    for number in range(threads):
+        thread = threading.Thread(target=work, args=(app,), name=f'job-worker-{number}', daemon=True)
+        thread.start()
+        _worker_threads.append(thread)
+    print(f"✅ Started {threads} job worker thread(s)")
+    return _worker_threads
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run upload post-processing jobs')
+    parser.add_argument('--threads', type=int, default=max(JOB_WORKER_THREADS, 1))
+    args = parser.parse_args()
+
+    from src.main import create_app
+    app = create_app()  # Without init_worker() - this process runs the workers itself
+
+    workers = [threading.Thread(target=work, args=(app,), name=f'job-worker-{n}', daemon=True)
+               for n in range(args.threads)]
+    for worker in workers:
+        worker.start()
+    print(f"👷 Job worker running with {args.threads} thread(s)")
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        print("👋 Job worker stopped")
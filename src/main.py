@@ -8,251 +8,167 @@ import json
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory, request, jsonify
+from flask import Flask, Blueprint, current_app, send_from_directory, send_file, request, jsonify, redirect
+from werkzeug.security import safe_join
+from werkzeug.utils import import_string
 from flask_cors import CORS
-from src.models import db, Image, Category, ImageCategory, SystemConfig, init_default_categories, init_system_config, migrate_existing_images
-from src.routes.user import user_bp
-from src.routes.contact import contact_bp
-from src.routes.admin import admin_bp
-from src.routes.background import background_bp
-from src.routes.featured_image import featured_bp
-from src.routes.portfolio_management import portfolio_mgmt_bp
-from src.routes.category_management import category_mgmt_bp
-from src.routes.debug_migration import debug_migration_bp
-from src.routes.backup_system import backup_system_bp
-from src.routes.simple_backup_route import simple_backup_bp
-from src.routes.og_image import og_bp
-from src.routes.cleanup_api import cleanup_bp
-from src.routes.slideshow_api import slideshow_api_bp  # Simple slideshow API (Option 1)
-from src.routes.enhanced_background import enhanced_bg_bp
-# from src.routes.slideshow_manager import slideshow_bp as slideshow_manager_bp  # Temporarily disabled for deployment fix
-# from src.routes.contact_form import contact_bp  # Temporarily disabled
+from src.models import db, Image, Category, ImageCategory
 
 # Import configuration
-from src.config import PHOTOGRAPHY_ASSETS_DIR
+from src import config
+from src.config import PHOTOGRAPHY_ASSETS_DIR, DERIVATIVES_DIR, FINGERPRINT_LENGTH
+from src.derivatives import pick_derivative, srcset_widths
+from src.image_cache import ResizeParams, resize_cache, negotiate_format, negotiated_variant, RESIZABLE_EXTENSIONS
+from src.portfolio_queries import (load_portfolio_images, load_portfolio_page, category_names, load_categories_with_counts,
+                                   DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+from src.data_version import versioned_cache
+from src.portfolio_snapshot import get_snapshot, snapshot_response
+from src.jobs import start_job_workers
+from src.migrations import migrate, check_schema
+import src.sqlite_tuning  # noqa: F401 - importing installs the WAL/pragma hook on every SQLite connection
+from src.ingest import IngestRequest, sweep_upload_temp
+from src.chunked_upload import sweep_chunked_uploads
+from src.http_cache import send_image, variant_etag, lookup_content_hash, image_url
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+# Routes defined in this module - create_app() registers them after the feature blueprints
+core_bp = Blueprint('core', __name__)
 
-# Enable CORS for all routes and origins
-CORS(app, origins="*", methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"], 
-     allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Credentials"])
+# Blueprints in registration order (it decides which of two matching routes wins):
+# (import path, register_blueprint options, config switch or None for always on).
+# Modules are imported here by name, so a switched-off group is never imported at all;
+# their heavy dependencies (Pillow, smtplib, tarfile, ...) are imported inside the views that use them.
+BLUEPRINTS = [
+    ('src.routes.user:user_bp', {'url_prefix': '/api'}, None),
+    ('src.routes.contact:contact_bp', {}, None),
+    ('src.routes.admin:admin_bp', {}, 'ENABLE_ADMIN_ROUTES'),
+    ('src.routes.background:background_bp', {}, None),
+    ('src.routes.background:background_admin_bp', {}, 'ENABLE_ADMIN_ROUTES'),
+    ('src.routes.featured_image:featured_bp', {}, None),
+    ('src.routes.featured_image:featured_admin_bp', {}, 'ENABLE_ADMIN_ROUTES'),
+    ('src.routes.category_management:category_mgmt_bp', {}, None),
+    ('src.routes.category_management:category_mgmt_admin_bp', {}, 'ENABLE_ADMIN_ROUTES'),
+    ('src.routes.debug_migration:debug_migration_bp', {}, 'ENABLE_DEBUG_ROUTES'),
+    ('src.routes.backup_system:backup_system_bp', {}, 'ENABLE_DEBUG_ROUTES'),
+    ('src.routes.simple_backup_route:simple_backup_bp', {}, 'ENABLE_DEBUG_ROUTES'),
+    ('src.routes.og_image:og_bp', {}, None),
+    ('src.routes.cleanup_api:cleanup_bp', {}, 'ENABLE_DEBUG_ROUTES'),
+    ('src.routes.slideshow_api:slideshow_api_bp', {}, None),  # Simple slideshow API (Option 1)
+    ('src.routes.slideshow_api:slideshow_admin_bp', {}, 'ENABLE_ADMIN_ROUTES'),
+    ('src.routes.enhanced_background:enhanced_bg_bp', {}, 'ENABLE_ADMIN_ROUTES'),
+    ('src.routes.slideshow_fix:slideshow_fix_bp', {}, 'ENABLE_ADMIN_ROUTES'),  # New slideshow fix
+    ('src.routes.debug_routes:debug_bp', {}, 'ENABLE_DEBUG_ROUTES'),
+    # ('src.routes.slideshow_manager:slideshow_bp', {}, None),  # Temporarily disabled for deployment fix
+    # ('src.routes.portfolio_management:portfolio_mgmt_bp', {}, None),  # Removed - redundant with admin dashboard
+    # ('src.routes.contact_form:contact_bp', {}, None),  # Temporarily disabled
+]
 
-# Ensure photography assets directory exists
-os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
-
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(contact_bp)
-app.register_blueprint(admin_bp)
-app.register_blueprint(background_bp)
-app.register_blueprint(featured_bp)
-app.register_blueprint(category_mgmt_bp)
-app.register_blueprint(debug_migration_bp)
-app.register_blueprint(backup_system_bp)
-app.register_blueprint(simple_backup_bp)
-app.register_blueprint(og_bp)
-app.register_blueprint(cleanup_bp)
-
-app.register_blueprint(slideshow_api_bp)  # Simple slideshow API (Option 1)
-app.register_blueprint(enhanced_bg_bp)
-# Import and register the slideshow fix blueprint
-from src.routes.slideshow_fix import slideshow_fix_bp
-app.register_blueprint(slideshow_fix_bp)  # New slideshow fix
-# app.register_blueprint(slideshow_manager_bp)  # Temporarily disabled for deployment fix
-# app.register_blueprint(portfolio_mgmt_bp)  # Removed - redundant with admin dashboard
-# app.register_blueprint(contact_bp)  # Temporarily disabled
-
-# Database configuration - Use persistent volume for database
-database_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, 'mindseye.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{database_path}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# Initialize database
-db.init_app(app)
-with app.app_context():
-    db.create_all()
-    
-    # Only initialize defaults if database is empty (first run)
-    if Category.query.count() == 0:
-        print("🔄 Empty database detected - initializing default categories...")
-        init_default_categories()
-    else:
-        print(f"✅ Database has {Category.query.count()} categories - skipping initialization")
-    
-    # Only initialize system config if empty
-    if SystemConfig.query.count() == 0:
-        print("🔄 Initializing system configuration...")
-        init_system_config()
-    else:
-        print(f"✅ System config exists - skipping initialization")
-    
-    # Add slideshow column if it doesn't exist
-    try:
-        # Test if the column exists by trying to query it
-        db.session.execute(db.text("SELECT is_slideshow_background FROM images LIMIT 1"))
-        print("✅ Slideshow column already exists")
-    except Exception as e:
-        print("🔄 Adding slideshow column to images table...")
-        try:
-            db.session.execute(db.text("ALTER TABLE images ADD COLUMN is_slideshow_background BOOLEAN DEFAULT FALSE"))
-            db.session.commit()
-            print("✅ Slideshow column added successfully")
-        except Exception as alter_error:
-            print(f"❌ Failed to add slideshow column: {alter_error}")
-            db.session.rollback()
-    
-    # Add is_about column if it doesn't exist
-    try:
-        # Check if is_about column exists using correct SQLAlchemy syntax
-        with db.engine.connect() as conn:
-            conn.execute(db.text("SELECT is_about FROM images LIMIT 1"))
-        print("✅ is_about column already exists")
-    except Exception:
-        try:
-            # Add the is_about column to existing database using correct syntax
-            with db.engine.connect() as conn:
-                conn.execute(db.text("ALTER TABLE images ADD COLUMN is_about BOOLEAN DEFAULT 0"))
-                conn.commit()
-            print("✅ Added is_about column to existing database")
-        except Exception as alter_error:
-            print(f"❌ Failed to add is_about column: {alter_error}")
-    
-    # Add EXIF columns if they don't exist
-    try:
-        with db.engine.connect() as conn:
-            # Check if EXIF columns exist, if not add them
-            exif_columns = [
-                'camera_make', 'camera_model', 'lens_model', 'focal_length',
-                'aperture', 'shutter_speed', 'iso', 'flash', 'exposure_mode', 'white_balance'
-            ]
-            
-            for column in exif_columns:
-                try:
-                    conn.execute(db.text(f"ALTER TABLE images ADD COLUMN {column} VARCHAR(100)"))
-                    print(f"✅ Added {column} column")
-                except Exception as e:
-                    if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
-                        print(f"ℹ️  {column} column already exists")
-                    else:
-                        print(f"⚠️  Error adding {column} column: {e}")
-            
-            conn.commit()
-    except Exception as e:
-        print(f"⚠️  EXIF column migration error: {e}")
-    
-    print("✅ EXIF columns migration complete")
-    
-    # Try creating the table with the new schema
-    try:
-        db.create_all()
-        print("✅ Created tables with new schema")
-    except Exception as create_error:
-        print(f"❌ Failed to create tables: {create_error}")
+def send_negotiated_image(directory, filename, etag=None, immutable=False):
+    """
+    Serve a volume image with ETag/304 support, swapping in a cached WebP/AVIF
+    copy when the browser accepts one
+    """
+    path = safe_join(directory, filename)
+    if not path or not os.path.isfile(path):
+        return send_from_directory(directory, filename)  # Raises the usual 404
     
-    # Only migrate images if no images exist in database
+    variant = None
     try:
-        if Image.query.count() == 0:
-            print("🔄 No images in database - running migration...")
-            migrate_existing_images()
-        else:
-            print(f"✅ Database has {Image.query.count()} images - skipping migration")
+        variant = negotiated_variant(path, request.accept_mimetypes)
     except Exception as e:
-        print(f"⚠️ Database query issue: {e}")
-        # Don't create fresh database - just continue
+        print(f"⚠️  Transcode failed for {filename}, sending original: {e}")
     
-    print("✅ SQL Database initialization complete")
-    
-    # Initialize About page data files if they don't exist
-    try:
-        data_dir = '/data'
-        
-        # Create about_content.json if it doesn't exist
-        about_content_file = os.path.join(data_dir, 'about_content.json')
-        if not os.path.exists(about_content_file):
-            about_content = {
-                "main_content": "Welcome to Mind's Eye Photography, where every moment is captured with artistic vision and technical precision. Our passion lies in transforming fleeting moments into timeless memories that tell your unique story.\n\nWith years of experience in portrait, landscape, and event photography, we specialize in creating images that not only document but also evoke emotion and preserve the essence of each moment. Whether it's a wedding, family portrait, or commercial project, we approach each shoot with creativity, professionalism, and attention to detail.\n\nOur philosophy is simple: photography is not just about taking pictures, it's about seeing the world through a different lens and sharing that vision with others. We believe that every person, every place, and every moment has a story worth telling, and we're here to help you tell yours.\n\nUsing state-of-the-art equipment and techniques, we ensure that every image meets the highest standards of quality while maintaining the authentic feel that makes each photograph special. From the initial consultation to the final delivery, we work closely with our clients to understand their vision and bring it to life.",
-                "signature": "- Mind's Eye Photography"
-            }
-            with open(about_content_file, 'w') as f:
-                json.dump(about_content, f, indent=2)
-            print(f"✅ Created {about_content_file}")
-        else:
-            print(f"ℹ️  About content file already exists")
-        
-        # Create about_minds_eye_image.json if it doesn't exist
-        about_image_file = os.path.join(data_dir, 'about_minds_eye_image.json')
-        if not os.path.exists(about_image_file):
-            about_image = {"filename": None}
-            with open(about_image_file, 'w') as f:
-                json.dump(about_image, f, indent=2)
-            print(f"✅ Created {about_image_file}")
-        else:
-            print(f"ℹ️  About image file already exists")
-            
-        print("✅ About page data initialization complete")
-        
-    except Exception as e:
-        print(f"⚠️ About page data initialization error: {e}")
+    if variant:
+        response = send_image(variant[0], variant[1], etag=variant_etag(etag, variant[0]), immutable=immutable)
+    else:
+        response = send_image(path, etag=etag, immutable=immutable)
+    response.vary.add('Accept')
+    return response
+
+def volume_etag(directory, filename):
+    """Stored content hash when directory is the photography volume, else None"""
+    if os.path.realpath(directory) != os.path.realpath(PHOTOGRAPHY_ASSETS_DIR):
+        return None
+    return lookup_content_hash(filename)
 
-@app.route('/data/<filename>')
+@core_bp.route('/data/<filename>')
 def serve_data_image(filename):
     """Serve images from the data directory (portfolio and about images)"""
     # Use Railway volume mount path
     data_dir = '/data'
-    return send_from_directory(data_dir, filename)
-
-@app.route('/debug/database-info')
-def debug_database_info():
-    """Debug route to check database content"""
-    try:
-        from src.routes.admin import load_portfolio_data
-        portfolio_data = load_portfolio_data()
-        
-        info = {
-            'portfolio_count': len(portfolio_data),
-            'portfolio_items': portfolio_data[:5],  # First 5 items
-            'sample_image_paths': [item.get('image', 'NO_IMAGE') for item in portfolio_data[:10]]
-        }
-        
-        return f"<pre>{json.dumps(info, indent=2)}</pre>"
-    except Exception as e:
-        return f"<pre>Database error: {str(e)}</pre>"
+    return send_negotiated_image(data_dir, filename, etag=volume_etag(data_dir, filename))
 
-@app.route('/debug/volume-info')
-def debug_volume_info():
-    """Debug route to check volume path detection"""
-    import os
-    from src.config import PHOTOGRAPHY_ASSETS_DIR
-    
-    info = {
-        'PHOTOGRAPHY_ASSETS_DIR': PHOTOGRAPHY_ASSETS_DIR,
-        'RAILWAY_VOLUME_MOUNT_PATH': os.environ.get('RAILWAY_VOLUME_MOUNT_PATH'),
-        'directory_exists': os.path.exists(PHOTOGRAPHY_ASSETS_DIR),
-        'directory_contents': [],
-        'environment_vars': {k: v for k, v in os.environ.items() if 'RAILWAY' in k or 'VOLUME' in k}
-    }
-    
-    try:
-        if os.path.exists(PHOTOGRAPHY_ASSETS_DIR):
-            info['directory_contents'] = os.listdir(PHOTOGRAPHY_ASSETS_DIR)[:10]  # First 10 files
-    except Exception as e:
-        info['directory_error'] = str(e)
-    
-    return f"<pre>{json.dumps(info, indent=2)}</pre>"
-
-@app.route('/static/assets/<path:filename>')
+@core_bp.route('/static/assets/<path:filename>')
 def serve_photography_assets(filename):
     """Serve images from the separate photography assets directory"""
+    # Hidden entries (upload temp files, checkpoints) are never public
+    if any(part.startswith('.') for part in filename.split('/')):
+        return "Image not found", 404
     try:
-        return send_from_directory(PHOTOGRAPHY_ASSETS_DIR, filename)
+        return send_negotiated_image(PHOTOGRAPHY_ASSETS_DIR, filename,
+                                     etag=volume_etag(PHOTOGRAPHY_ASSETS_DIR, filename))
     except FileNotFoundError:
         # Fallback to old location for backward compatibility during migration
-        old_assets_dir = os.path.join(app.static_folder, 'assets')
+        old_assets_dir = os.path.join(current_app.static_folder, 'assets')
         if os.path.exists(os.path.join(old_assets_dir, filename)):
             return send_from_directory(old_assets_dir, filename)
         return f"Image not found. Checked: {PHOTOGRAPHY_ASSETS_DIR}/{filename} and {old_assets_dir}/{filename}", 404
 
-@app.route('/api/slideshow')
+@core_bp.route('/i/<fingerprint>/<filename>')
+def serve_fingerprinted_image(fingerprint, filename):
+    """Serve a content-addressed image URL with a cache-forever policy"""
+    image = Image.query.filter_by(filename=filename).first()
+    if not image:
+        return "Image not found", 404
+    
+    content_hash = image.content_hash
+    if not content_hash or not content_hash.startswith(fingerprint.lower()) or len(fingerprint) < FINGERPRINT_LENGTH:
+        # Stale fingerprint (file was replaced, or its hash isn't stored yet) - point at the current URL
+        response = redirect(image_url(image))
+        response.cache_control.no_cache = True
+        return response
+    
+    return send_negotiated_image(PHOTOGRAPHY_ASSETS_DIR, filename, etag=content_hash, immutable=True)
+
+@core_bp.route('/derivatives/<int:width>/<filename>')
+def serve_image_derivative(width, filename):
+    """Serve the closest pre-built size of an image, falling back to the original"""
+    image = Image.query.filter_by(filename=filename).first()
+    derivative = pick_derivative(image, width) if image else None
+    if derivative and os.path.exists(os.path.join(DERIVATIVES_DIR, derivative.filename)):
+        etag = variant_etag(image.content_hash, derivative.filename)
+        return send_negotiated_image(DERIVATIVES_DIR, derivative.filename, etag=etag)
+    return serve_photography_assets(filename)
+
+@core_bp.route('/img/<filename>')
+def serve_resized_image(filename):
+    """Resize a volume original on demand (?w=&h=&fit=&q=&fmt=), cached on disk"""
+    source_path = safe_join(PHOTOGRAPHY_ASSETS_DIR, filename)
+    if (not source_path or not os.path.isfile(source_path)
+            or os.path.splitext(filename)[1].lower() not in RESIZABLE_EXTENSIONS):
+        return "Image not found", 404
+    
+    try:
+        params = ResizeParams.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    negotiated = not params.fmt
+    if negotiated:
+        params.fmt = negotiate_format(request.accept_mimetypes)
+    
+    try:
+        cached_path, mimetype = resize_cache.get(source_path, params)
+    except Exception as e:
+        print(f"❌ Resize failed for {filename}: {e}")
+        return "Could not resize image", 500
+    
+    etag = variant_etag(lookup_content_hash(filename), cached_path)
+    response = send_image(cached_path, mimetype, etag=etag)
+    if negotiated:
+        response.vary.add('Accept')
+    return response
+
+@core_bp.route('/api/slideshow')
 def get_slideshow():
     """Get slideshow images from admin system"""
     try:
@@ -283,7 +199,7 @@ def get_slideshow():
         traceback.print_exc()
         return jsonify([]), 200
 
-@app.route('/api/slideshow-images')
+@core_bp.route('/api/slideshow-images')
 def get_slideshow_images():
     """Alternative slideshow endpoint for compatibility"""
     try:
@@ -296,7 +212,8 @@ def get_slideshow_images():
                 'id': image.id,
                 'filename': image.filename,
                 'title': image.title,
-                'description': image.description
+                'description': image.description,
+                'url': image_url(image)
             }
             slideshow_data.append(slideshow_item)
         
@@ -309,41 +226,82 @@ def get_slideshow_images():
         print(f"❌ Error in slideshow-images API: {e}")
         return jsonify({'success': False, 'images': []}), 200
 
-@app.route('/api/simple-portfolio')
+SIMPLE_PORTFOLIO_FIELDS = ('id', 'title', 'description', 'filename', 'image', 'url', 'categories', 'metadata')
+
+def simple_portfolio_item(image, fields=SIMPLE_PORTFOLIO_FIELDS):
+    """Simple portfolio item for one image, limited to fields"""
+    item = {
+        'id': str(image.id) if image.id else 'unknown',
+        'title': image.title if image.title else f"Image {image.id}",
+        'description': image.description if image.description else "",
+        'filename': image.filename if image.filename else "unknown.jpg",
+        'image': image.filename if image.filename else "unknown.jpg",
+        'url': image_url(image) if 'url' in fields else None,
+        'metadata': {
+            'created_at': image.created_at.isoformat() if hasattr(image, 'created_at') and image.created_at else None
+        }
+    }
+    if 'categories' in fields:
+        # Preloaded by the portfolio queries; only touched when asked for
+        item['categories'] = category_names(image, default='Photography')
+    return {key: item[key] for key in fields}
+
+def build_simple_portfolio():
+    """Simple portfolio items (excluding About images)"""
+    all_images = load_portfolio_images()
+    portfolio_data = []
+    
+    for image in all_images:
+        try:
+            portfolio_data.append(simple_portfolio_item(image))
+        except Exception as img_error:
+            print(f"⚠️ Error processing image {image.id}: {img_error}")
+            continue
+    
+    return portfolio_data
+
+def simple_portfolio_page(args):
+    """
+    One page of the simple portfolio: ?limit=&cursor=&category=&fields=
+    Returns {'items': [...], 'next_cursor': ...}; raises ValueError on bad input
+    """
+    limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    
+    fields = [f.strip() for f in args.get('fields', '').split(',') if f.strip()] or list(SIMPLE_PORTFOLIO_FIELDS)
+    unknown = set(fields) - set(SIMPLE_PORTFOLIO_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(sorted(unknown))}")
+    
+    images, next_cursor = load_portfolio_page(
+        limit=limit,
+        cursor=args.get('cursor') or None,
+        category=args.get('category') or None,
+        with_categories='categories' in fields
+    )
+    
+    return {
+        'items': [simple_portfolio_item(image, fields) for image in images],
+        'next_cursor': next_cursor
+    }
+
+@core_bp.route('/api/simple-portfolio')
 def get_simple_portfolio():
-    """Bulletproof portfolio endpoint - always returns admin data"""
+    """
+    Bulletproof portfolio endpoint - always returns admin data
+    With limit/cursor/category/fields it returns one page instead of the full list
+    """
+    if any(key in request.args for key in ('limit', 'cursor', 'category', 'fields')):
+        try:
+            return jsonify(simple_portfolio_page(request.args))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
     try:
-        print("🔍 Simple Portfolio API called")
-        
-        # Get all images from admin database (excluding About images)
-        all_images = Image.query.filter(Image.is_about != True).all()
-        print(f"📊 Found {len(all_images)} portfolio images in database (excluding About images)")
-        
-        portfolio_data = []
-        
-        for image in all_images:
-            print(f"📷 Processing image: {image.filename}")
-            try:
-                # Create portfolio item with error handling for each field
-                portfolio_item = {
-                    'id': str(image.id) if image.id else 'unknown',
-                    'title': image.title if image.title else f"Image {image.id}",
-                    'description': image.description if image.description else "",
-                    'filename': image.filename if image.filename else "unknown.jpg",
-                    'image': image.filename if image.filename else "unknown.jpg",
-                    'categories': ['Photography'],  # Simple default
-                    'metadata': {
-                        'created_at': image.created_at.isoformat() if hasattr(image, 'created_at') and image.created_at else None
-                    }
-                }
-                portfolio_data.append(portfolio_item)
-                print(f"✅ Added image: {portfolio_item['filename']}")
-            except Exception as img_error:
-                print(f"⚠️ Error processing image {image.id}: {img_error}")
-                continue
-        
-        print(f"✅ Returning {len(portfolio_data)} portfolio items")
-        return jsonify(portfolio_data)
+        # Rebuilt only when an admin write bumps the data version
+        snapshot = get_snapshot('simple-portfolio', build_simple_portfolio)
+        return snapshot_response(snapshot)
         
     except Exception as e:
         print(f"❌ Error in simple portfolio: {e}")
@@ -354,24 +312,25 @@ def get_simple_portfolio():
         print("🔄 Returning empty array as fallback")
         return jsonify([]), 200
 
-@app.route('/api/categories')
+def build_categories():
+    """Categories with image counts for the frontend filter bar"""
+    categories_data = []
+    
+    for category, image_count in load_categories_with_counts():
+        category_item = {
+            'id': str(category.id),
+            'name': category.name,
+            'image_count': image_count
+        }
+        categories_data.append(category_item)
+    
+    return categories_data
+
+@core_bp.route('/api/categories')
 def get_categories():
     """API endpoint to get all categories"""
     try:
-        from src.models import Category
-        
-        categories = Category.query.all()
-        categories_data = []
-        
-        for category in categories:
-            category_item = {
-                'id': str(category.id),
-                'name': category.name,
-                'image_count': len(category.image_categories)
-            }
-            categories_data.append(category_item)
-        
-        return jsonify(categories_data)
+        return snapshot_response(get_snapshot('categories', build_categories))
         
     except Exception as e:
         print(f"Error loading categories from database: {e}")
@@ -379,100 +338,35 @@ def get_categories():
         traceback.print_exc()
         return jsonify([]), 500
 
-@app.route('/api/featured-image')
+@versioned_cache
+def load_featured_image_payload():
+    """Featured image data with EXIF, or None - cached until the data version changes"""
+    # EXIF was stored at upload time, so this is a single indexed lookup
+    featured_image = Image.query.filter(Image.is_featured == True).first()
+    if not featured_image:
+        return None
+    
+    return {
+        'image': featured_image.filename,
+        'title': featured_image.title,
+        'description': featured_image.description,
+        'story': featured_image.featured_story,
+        'filename': featured_image.filename,
+        'upload_date': featured_image.upload_date.isoformat() if featured_image.upload_date else None,
+        'file_size': featured_image.file_size,
+        'width': featured_image.width,
+        'height': featured_image.height,
+        'exif_data': featured_image.exif_dict()
+    }
+
+@core_bp.route('/api/featured-image')
 def get_featured_image():
     """API endpoint to get featured image with complete data"""
     try:
-        from src.models import SystemConfig, Image
-        from PIL import Image as PILImage
-        from PIL.ExifTags import TAGS
-        import os
-        
-        # Get featured image from database using is_featured flag
-        featured_image = Image.query.filter(Image.is_featured == True).first()
+        featured_payload = load_featured_image_payload()
         
-        if featured_image:
-            # Extract EXIF data from actual image file
-            image_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, featured_image.filename)
-            exif_data = {}
-            
-            if os.path.exists(image_path):
-                try:
-                    with PILImage.open(image_path) as pil_image:
-                        exif = pil_image._getexif()
-                        if exif is not None:
-                            for tag_id, value in exif.items():
-                                tag = TAGS.get(tag_id, tag_id)
-                                
-                                # Convert bytes to string if needed
-                                if isinstance(value, bytes):
-                                    try:
-                                        value = value.decode('utf-8')
-                                    except:
-                                        value = str(value)
-                                
-                                # Format common EXIF tags
-                                if tag == 'DateTime':
-                                    exif_data['capture_date'] = str(value)
-                                elif tag == 'Make':
-                                    exif_data['camera_make'] = str(value)
-                                elif tag == 'Model':
-                                    exif_data['camera_model'] = str(value)
-                                elif tag == 'LensModel':
-                                    exif_data['lens_model'] = str(value)
-                                elif tag == 'FocalLength':
-                                    if isinstance(value, tuple) and len(value) == 2:
-                                        focal_length = value[0] / value[1] if value[1] != 0 else value[0]
-                                        exif_data['focal_length'] = f"{focal_length:.1f}mm"
-                                    else:
-                                        exif_data['focal_length'] = f"{value}mm"
-                                elif tag == 'FNumber':
-                                    if isinstance(value, tuple) and len(value) == 2:
-                                        f_number = value[0] / value[1] if value[1] != 0 else value[0]
-                                        exif_data['aperture'] = f"f/{f_number:.1f}"
-                                    else:
-                                        exif_data['aperture'] = f"f/{value}"
-                                elif tag == 'ExposureTime':
-                                    # Convert IFDRational to float for proper calculation
-                                    if hasattr(value, '__float__'):
-                                        value = float(value)
-                                    
-                                    if isinstance(value, tuple) and len(value) == 2:
-                                        if value[0] < value[1]:
-                                            exif_data['shutter_speed'] = f"{value[0]}/{value[1]}"
-                                        else:
-                                            exif_data['shutter_speed'] = f"{value[0]/value[1]:.2f}s"
-                                    else:
-                                        # Handle decimal values like 0.0005
-                                        if isinstance(value, (int, float)) and 0 < value < 1:
-                                            # Convert decimal to fraction (e.g., 0.0005 -> 1/2000)
-                                            denominator = int(round(1.0 / value))
-                                            exif_data['shutter_speed'] = f"1/{denominator}"
-                                        elif isinstance(value, (int, float)) and value >= 1:
-                                            exif_data['shutter_speed'] = f"{value:.1f}s"
-                                        else:
-                                            exif_data['shutter_speed'] = str(value)
-                                elif tag == 'ISOSpeedRatings':
-                                    exif_data['iso'] = f"ISO {value}"
-                                elif tag == 'Flash':
-                                    flash_fired = value & 1
-                                    exif_data['flash'] = "Yes" if flash_fired else "No"
-                                    
-                except Exception as e:
-                    print(f"Error extracting EXIF from {image_path}: {e}")
-            
-            return jsonify({
-                'image': featured_image.filename,
-                'title': featured_image.title,
-                'description': featured_image.description,
-                'story': featured_image.featured_story,
-                'filename': featured_image.filename,
-                'upload_date': featured_image.upload_date.isoformat() if featured_image.upload_date else None,
-                'file_size': featured_image.file_size,
-                'width': featured_image.width,
-                'height': featured_image.height,
-                'exif_data': exif_data
-            })
+        if featured_payload:
+            return jsonify(featured_payload)
         else:
             # No featured image set
             return jsonify({'error': 'No featured image set'}), 404
@@ -483,7 +377,7 @@ def get_featured_image():
         traceback.print_exc()
         return jsonify({'error': 'Failed to load featured image'}), 500
 
-@app.route('/api/about-minds-eye')
+@core_bp.route('/api/about-minds-eye')
 def get_about_minds_eye():
     """API endpoint to get about-minds-eye page data"""
     try:
@@ -507,7 +401,7 @@ def get_about_minds_eye():
             'success': False
         }), 500
 
-@app.route('/api/all-images')
+@core_bp.route('/api/all-images')
 def get_all_images():
     """API endpoint to list all images in /data directory and database"""
     try:
@@ -561,7 +455,7 @@ def get_all_images():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/test')
+@core_bp.route('/api/test')
 def api_test():
     """Simple test API endpoint without database queries"""
     try:
@@ -578,171 +472,47 @@ def api_test():
         print(f"Error in test API: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
-@app.route('/api/debug-query')
-def debug_query():
-    """Debug API to understand database query differences"""
-    try:
-        from src.models import Image, Category, ImageCategory, db
-        
-        debug_info = {
-            'step1_import_success': True,
-            'step2_image_count_query': None,
-            'step3_image_count_session': None,
-            'step4_first_image': None,
-            'step5_categories_count': None,
-            'step6_sample_images': []
-        }
-        
-        # Step 2: Try Image.query.count()
-        try:
-            debug_info['step2_image_count_query'] = Image.query.count()
-        except Exception as e:
-            debug_info['step2_image_count_query'] = f"Error: {e}"
-        
-        # Step 3: Try db.session.query(Image).count()
-        try:
-            debug_info['step3_image_count_session'] = db.session.query(Image).count()
-        except Exception as e:
-            debug_info['step3_image_count_session'] = f"Error: {e}"
-        
-        # Step 4: Try to get first image
+def build_portfolio_items():
+    """Portfolio items with their categories in the format the React frontend expects"""
+    portfolio_data = []
+    
+    for image in load_portfolio_images():
         try:
-            first_image = Image.query.first()
-            if first_image:
-                debug_info['step4_first_image'] = {
-                    'id': str(first_image.id),
-                    'filename': first_image.filename,
-                    'title': first_image.title
+            # Categories were loaded with the images; Miscellaneous if none assigned
+            image_categories = category_names(image, default='Miscellaneous')
+            
+            portfolio_item = {
+                'id': str(image.id),
+                'title': image.title or f"Image {image.id}",
+                'description': image.description or "",
+                'filename': image.filename,
+                'url': image_url(image),  # Fingerprinted, cached forever
+                'categories': image_categories,  # ACTUAL CATEGORIES FROM DATABASE
+                'metadata': {
+                    'created_at': image.upload_date.isoformat() if image.upload_date else None
                 }
-            else:
-                debug_info['step4_first_image'] = "No images found"
-        except Exception as e:
-            debug_info['step4_first_image'] = f"Error: {e}"
-        
-        # Step 5: Check categories
-        try:
-            debug_info['step5_categories_count'] = Category.query.count()
-        except Exception as e:
-            debug_info['step5_categories_count'] = f"Error: {e}"
-        
-        # Step 6: Try to get sample images
-        try:
-            sample_images = Image.query.limit(3).all()
-            for img in sample_images:
-                debug_info['step6_sample_images'].append({
-                    'id': str(img.id),
-                    'filename': img.filename,
-                    'title': img.title
-                })
-        except Exception as e:
-            debug_info['step6_sample_images'] = f"Error: {e}"
-        
-        return jsonify(debug_info)
-        
-    except Exception as e:
-        return jsonify({'error': str(e), 'traceback': str(e)}), 500
-
-@app.route('/api/debug-db')
-def debug_database():
-    """Debug endpoint to test database connection step by step"""
-    debug_info = []
+            }
+            portfolio_data.append(portfolio_item)
+            
+        except Exception as img_error:
+            print(f"PORTFOLIO API: Error processing image {image.id}: {img_error}")
+            continue
     
-    try:
-        debug_info.append("Step 1: Starting debug")
-        
-        # Test database connection
-        from src.models import db
-        debug_info.append("Step 2: Imported db")
-        
-        # Test Image model import
-        from src.models import Image
-        debug_info.append("Step 3: Imported Image model")
-        
-        # Test basic query
-        image_count = Image.query.count()
-        debug_info.append(f"Step 4: Image count = {image_count}")
-        
-        # Test getting first image
-        first_image = Image.query.first()
-        if first_image:
-            debug_info.append(f"Step 5: First image = {first_image.filename}")
-        else:
-            debug_info.append("Step 5: No images found")
-        
-        # Test getting all images
-        all_images = Image.query.all()
-        debug_info.append(f"Step 6: Total images retrieved = {len(all_images)}")
-        
-        if all_images:
-            debug_info.append(f"Step 7: Sample filenames = {[img.filename for img in all_images[:3]]}")
-        
-        return jsonify({
-            'status': 'success',
-            'debug_steps': debug_info,
-            'image_count': image_count
-        })
-        
-    except Exception as e:
-        debug_info.append(f"ERROR: {str(e)}")
-        import traceback
-        debug_info.append(f"TRACEBACK: {traceback.format_exc()}")
-        
-        return jsonify({
-            'status': 'error',
-            'debug_steps': debug_info,
-            'error': str(e)
-        }), 500
+    return portfolio_data
+
+def portfolio_items_response():
+    """Snapshot response for the portfolio item endpoints, with CORS headers"""
+    response = snapshot_response(get_snapshot('portfolio-items', build_portfolio_items))
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+    response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+    return response
 
-@app.route('/api/portfolio-new')
+@core_bp.route('/api/portfolio-new')
 def get_portfolio_new():
-    """BRAND NEW portfolio endpoint - exact copy of working debug code"""
+    """BRAND NEW portfolio endpoint - same data as /assets/portfolio-data"""
     try:
-        # EXACT SAME CODE AS WORKING DEBUG ENDPOINT
-        from src.models import Image
-        
-        # Test getting all images - EXACT SAME AS DEBUG (excluding About images)
-        all_images = Image.query.filter(Image.is_about != True).all()
-        
-        portfolio_data = []
-        
-        for image in all_images:
-            try:
-                # Get actual categories for this image - SAME AS ADMIN
-                image_categories = []
-                try:
-                    image_categories = [cat.category.name for cat in image.categories]
-                except Exception as cat_error:
-                    print(f"Category error for image {image.id}: {cat_error}")
-                    image_categories = ['Miscellaneous']
-                
-                # If no categories assigned, use Miscellaneous
-                if not image_categories:
-                    image_categories = ['Miscellaneous']
-                
-                # Create portfolio item with React-expected format
-                portfolio_item = {
-                    'id': str(image.id),
-                    'title': image.title or f"Image {image.id}",
-                    'description': image.description or "",
-                    'filename': image.filename,
-                    'url': f"https://minds-eye-master-production.up.railway.app/static/assets/{image.filename}",  # PERSISTENT VOLUME!
-                    'categories': image_categories,  # ACTUAL CATEGORIES FROM DATABASE
-                    'metadata': {
-                        'created_at': image.upload_date.isoformat() if image.upload_date else None
-                    }
-                }
-                portfolio_data.append(portfolio_item)
-                
-            except Exception as img_error:
-                continue
-        
-        # Create response with CORS headers
-        response = jsonify(portfolio_data)
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-        
-        return response
+        return portfolio_items_response()
         
     except Exception as e:
         # Return empty array with CORS headers on error
@@ -753,61 +523,11 @@ def get_portfolio_new():
         
         return response, 500
 
-@app.route('/assets/portfolio-data')
+@core_bp.route('/assets/portfolio-data')
 def get_portfolio_data():
-    """API endpoint that React frontend actually calls - USING EXACT DEBUG CODE"""
+    """API endpoint that React frontend actually calls"""
     try:
-        # EXACT SAME CODE AS DEBUG ENDPOINT THAT WORKS
-        from src.models import Image
-        
-        # Test getting all images - EXACT SAME AS DEBUG (excluding About images)
-        all_images = Image.query.filter(Image.is_about != True).all()
-        print(f"PORTFOLIO API: Total portfolio images retrieved = {len(all_images)} (excluding About images)")
-        
-        portfolio_data = []
-        
-        for image in all_images:
-            try:
-                # Get actual categories for this image - SAME AS ADMIN
-                image_categories = []
-                try:
-                    image_categories = [cat.category.name for cat in image.categories]
-                except Exception as cat_error:
-                    print(f"Category error for image {image.id}: {cat_error}")
-                    image_categories = ['Miscellaneous']
-                
-                # If no categories assigned, use Miscellaneous
-                if not image_categories:
-                    image_categories = ['Miscellaneous']
-                
-                # Create portfolio item with React-expected format
-                portfolio_item = {
-                    'id': str(image.id),
-                    'title': image.title or f"Image {image.id}",
-                    'description': image.description or "",
-                    'filename': image.filename,
-                    'url': f"https://minds-eye-master-production.up.railway.app/static/assets/{image.filename}",  # PERSISTENT VOLUME!
-                    'categories': image_categories,  # ACTUAL CATEGORIES FROM DATABASE
-                    'metadata': {
-                        'created_at': image.upload_date.isoformat() if image.upload_date else None
-                    }
-                }
-                portfolio_data.append(portfolio_item)
-                print(f"PORTFOLIO API: Added image {image.filename}")
-                
-            except Exception as img_error:
-                print(f"PORTFOLIO API: Error processing image {image.id}: {img_error}")
-                continue
-        
-        print(f"PORTFOLIO API: Returning {len(portfolio_data)} portfolio items")
-        
-        # Create response with CORS headers
-        response = jsonify(portfolio_data)
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-        
-        return response
+        return portfolio_items_response()
         
     except Exception as e:
         print(f"PORTFOLIO API ERROR: {e}")
@@ -822,14 +542,14 @@ def get_portfolio_data():
         
         return response, 500
 
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
+@core_bp.route('/', defaults={'path': ''})
+@core_bp.route('/<path:path>')
 def serve(path):
     # Only exclude API routes from catch-all, allow assets to be served
     if path.startswith('api/'):
         return "Endpoint not found", 404
     
-    static_folder_path = app.static_folder
+    static_folder_path = current_app.static_folder
     if static_folder_path is None:
             return "Static folder not configured", 404
 
@@ -843,13 +563,7 @@ def serve(path):
             return "index.html not found", 404
 
 
-if __name__ == '__main__':
-    import os
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
-
-
-@app.route('/api/background')
+@core_bp.route('/api/background')
 def get_current_background_api():
     """API endpoint to get current background image - ONLY FROM DATABASE"""
     try:
@@ -860,7 +574,7 @@ def get_current_background_api():
         
         if background_image:
             return jsonify({
-                'background_url': f"https://minds-eye-master-production.up.railway.app/static/assets/{background_image.filename}",
+                'background_url': image_url(background_image),
                 'filename': background_image.filename,
                 'title': background_image.title
             })
@@ -869,7 +583,7 @@ def get_current_background_api():
             first_image = Image.query.first()
             if first_image:
                 return jsonify({
-                    'background_url': f"https://minds-eye-master-production.up.railway.app/static/assets/{first_image.filename}",
+                    'background_url': image_url(first_image),
                     'filename': first_image.filename,
                     'title': first_image.title
                 })
@@ -890,20 +604,14 @@ def get_current_background_api():
         }), 500
 
 
-# DIAGNOSTIC TEST ROUTE
-@app.route('/flask-test-12345')
-def flask_diagnostic():
-    """Test if Flask is running at all"""
-    return "FLASK IS WORKING! If you see this, Flask routes work but /about is being hijacked by React routing."
-
 # SPECIAL ABOUT PAGE HANDLER - Bypasses React entirely
-@app.route('/data/<filename>')
+@core_bp.route('/data/<filename>')
 def serve_data_file(filename):
     """Serve files from the data directory (persistent storage)"""
     try:
         # In production, images are stored in /data (persistent volume)
         data_dir = '/data' if os.path.exists('/data') else os.path.join(os.path.dirname(__file__), '..', 'data')
-        return send_from_directory(data_dir, filename)
+        return send_negotiated_image(data_dir, filename, etag=volume_etag(data_dir, filename))
     except Exception as e:
         print(f"Error serving data file {filename}: {e}")
         return "File not found", 404
@@ -944,7 +652,7 @@ def get_about_images():
 
 
 # React Frontend Routes
-@app.route('/assets/<path:filename>')
+@core_bp.route('/assets/<path:filename>')
 def serve_react_assets(filename):
     """Serve React build assets (CSS, JS, etc.)"""
     static_assets = os.path.join(os.path.dirname(__file__), 'static', 'assets')
@@ -952,7 +660,7 @@ def serve_react_assets(filename):
         return send_from_directory(static_assets, filename)
     return f"React asset not found: {filename}", 404
 
-@app.route('/')
+@core_bp.route('/')
 def serve_react_root():
     """Serve React frontend for root route"""
     static_dir = os.path.join(os.path.dirname(__file__), 'static')
@@ -960,7 +668,7 @@ def serve_react_root():
         return send_from_directory(static_dir, 'index.html')
     return "React frontend not found", 404
 
-@app.route('/<path:path>')
+@core_bp.route('/<path:path>')
 def serve_react_app(path):
     """Serve React frontend for all non-API routes (SPA routing)"""
     # CRITICAL FIX: Properly exclude API routes, admin routes, and static assets
@@ -984,247 +692,13 @@ def serve_react_app(path):
         return send_from_directory(static_dir, 'index.html')
     return "React frontend not found", 404
 
-if __name__ == '__main__':
-    import os
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
 
-
-@app.route("/api/database-inspect")
-def database_inspect():
-    """Inspect what is actually in the database"""
-    try:
-        result = {
-            "images_table": [],
-            "about_images_table": [],
-            "image_count": 0,
-            "about_image_count": 0,
-            "categories_count": 0
-        }
-        
-        # Check categories
-        categories = Category.query.all()
-        result["categories_count"] = len(categories)
-        result["categories"] = [cat.name for cat in categories]
-        
-        # Check main images table
-        images = Image.query.all()
-        result["image_count"] = len(images)
-        for img in images:
-            result["images_table"].append({
-                "id": img.id,
-                "filename": img.filename,
-                "title": img.title,
-                "description": img.description
-            })
-        
-        # Check about images table  
-        try:
-            from src.models import AboutImage
-            about_images = AboutImage.query.all()
-            result["about_image_count"] = len(about_images)
-            for img in about_images:
-                result["about_images_table"].append({
-                    "id": img.id,
-                    "filename": img.filename,
-                    "title": img.title,
-                    "description": img.description
-                })
-        except:
-            result["about_images_table"] = ["AboutImage table not found"]
-        
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route("/api/init-database")
-def init_database():
-    """Manually initialize database with default categories"""
-    try:
-        # Force initialize categories
-        init_default_categories()
-        
-        # Force initialize system config
-        init_system_config()
-        
-        return jsonify({
-            "success": True,
-            "message": "Database initialized successfully",
-            "categories_count": Category.query.count()
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route("/api/test-upload-path")
-def test_upload_path():
-    """Test if upload path is accessible"""
-    try:
-        import os
-        from src.config import PHOTOGRAPHY_ASSETS_DIR
-        
-        result = {
-            "photography_assets_dir": PHOTOGRAPHY_ASSETS_DIR,
-            "path_exists": os.path.exists(PHOTOGRAPHY_ASSETS_DIR),
-            "is_writable": False,
-            "can_create_dir": False
-        }
-        
-        # Test if we can create the directory
-        try:
-            os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
-            result["can_create_dir"] = True
-        except Exception as e:
-            result["create_dir_error"] = str(e)
-        
-        # Test if we can write to it
-        try:
-            test_file = os.path.join(PHOTOGRAPHY_ASSETS_DIR, "test.txt")
-            with open(test_file, "w") as f:
-                f.write("test")
-            os.remove(test_file)
-            result["is_writable"] = True
-        except Exception as e:
-            result["write_error"] = str(e)
-        
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route("/api/test-minimal-upload", methods=['POST'])
-def test_minimal_upload():
-    """Minimal upload test to isolate the issue"""
-    try:
-        import os
-        import uuid
-        from werkzeug.utils import secure_filename
-        from src.config import PHOTOGRAPHY_ASSETS_DIR
-        from src.models import db, Image, Category
-        from datetime import datetime
-        
-        # Get a test file
-        image_files = request.files.getlist('image')
-        if not image_files or not image_files[0].filename:
-            return jsonify({"error": "No file provided"}), 400
-        
-        image_file = image_files[0]
-        
-        # Generate filename
-        unique_id = str(uuid.uuid4())[:8]
-        filename = f"test-{unique_id}.jpg"
-        
-        # Save file
-        os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
-        final_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, filename)
-        image_file.save(final_path)
-        
-        # Get file size
-        file_size = os.path.getsize(final_path)
-        
-        # Create database entry
-        new_image = Image(
-            filename=filename,
-            title="Test Image",
-            description="Test upload",
-            file_size=file_size,
-            width=None,
-            height=None,
-            upload_date=datetime.now()
-        )
-        
-        db.session.add(new_image)
-        db.session.commit()
-        
-        return jsonify({
-            "success": True,
-            "filename": filename,
-            "file_size": file_size,
-            "image_id": new_image.id
-        })
-        
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        return jsonify({
-            "error": str(e),
-            "traceback": error_details
-        }), 500
-
-
-@app.route('/debug/data-contents')
-def show_data_contents():
-    """Show all contents of /data directory"""
-    import os
-    import json
-    from datetime import datetime
-    
-    data_dir = '/data'
-    result = {
-        'directory': data_dir,
-        'exists': os.path.exists(data_dir),
-        'files': [],
-        'total_files': 0,
-        'checked_at': datetime.now().isoformat()
-    }
-    
-    if os.path.exists(data_dir):
-        try:
-            all_files = os.listdir(data_dir)
-            result['total_files'] = len(all_files)
-            
-            for filename in sorted(all_files):
-                filepath = os.path.join(data_dir, filename)
-                file_info = {
-                    'name': filename,
-                    'size': os.path.getsize(filepath) if os.path.isfile(filepath) else 0,
-                    'is_file': os.path.isfile(filepath),
-                    'is_dir': os.path.isdir(filepath)
-                }
-                
-                # If it's a JSON file, try to read its contents
-                if filename.endswith('.json') and os.path.isfile(filepath):
-                    try:
-                        with open(filepath, 'r') as f:
-                            file_info['json_content'] = json.load(f)
-                    except:
-                        file_info['json_content'] = 'Error reading JSON'
-                
-                result['files'].append(file_info)
-                
-        except Exception as e:
-            result['error'] = str(e)
-    
-    return f"<pre>{json.dumps(result, indent=2)}</pre>"
-
-if __name__ == '__main__':
-    app.run(debug=True)
-@app.route('/set-about-image/<filename>')
-def set_about_image_direct(filename):
-    """Direct endpoint to set About page image from existing file"""
-    try:
-        import json
-        data_dir = '/data'
-        about_image_file = os.path.join(data_dir, 'about_minds_eye_image.json')
-        
-        # Check if the image file exists
-        image_path = os.path.join(data_dir, filename)
-        if not os.path.exists(image_path):
-            return f"Image {filename} not found in /data directory"
-        
-        # Update the about image JSON
-        image_data = {"filename": filename}
-        with open(about_image_file, 'w') as f:
-            json.dump(image_data, f, indent=2)
-        
-        return f"✅ Set About page image to: {filename}"
-    except Exception as e:
-        return f"Error: {str(e)}"
-
-
-@app.route('/portfolio')
+@core_bp.route('/portfolio')
 def portfolio():
     """Portfolio page with pagination and category filtering"""
     try:
         from flask import render_template, request
+        from sqlalchemy.orm import selectinload
         
         # Get page number and category filter from query parameters
         page = request.args.get('page', 1, type=int)
@@ -1232,7 +706,8 @@ def portfolio():
         per_page = 12  # 12 images per page
         
         # Get all portfolio images (excluding About/Info images) - sorted by upload date (newest first)
-        images_query = Image.query.filter(Image.is_about != True).order_by(Image.upload_date.desc())
+        images_query = Image.query.options(selectinload(Image.derivatives)) \
+            .filter(Image.is_about != True).order_by(Image.upload_date.desc())
         
         # Apply category filter if not "All"
         if category_filter != 'All':
@@ -1262,7 +737,8 @@ def portfolio():
             image_data.append({
                 'filename': image.filename,
                 'title': image.title or f"Image {image.id}",
-                'description': image.description or ""
+                'description': image.description or "",
+                'srcset_widths': srcset_widths(image)  # Real pixel widths, not the long-edge ladder steps
             })
         
         return render_template('portfolio.html', 
@@ -1278,7 +754,7 @@ def portfolio():
         return f"Error loading portfolio: {str(e)}", 500
 
 
-@app.route('/about-minds-eye')
+@core_bp.route('/about-minds-eye')
 def about_minds_eye_page():
     """Serve the about-minds-eye page"""
     try:
@@ -1429,7 +905,7 @@ def about_minds_eye_page():
 
 
 
-@app.route('/fix-navigation.js')
+@core_bp.route('/fix-navigation.js')
 def fix_navigation_js():
     """JavaScript to fix the main site navigation"""
     js_code = """
@@ -1510,3 +986,101 @@ def fix_navigation_js():
     from flask import Response
     return Response(js_code, mimetype='application/javascript')
 
+
+def create_app(schema_check=True):
+    """
+    Build the Flask app and run the one-time initialization: schema migrations,
+    About page data files and volume housekeeping. Under gunicorn's preload this
+    runs once in the master before it forks; init_worker() does the per-process part.
+    Raises MigrationError rather than return an app whose schema is behind the code
+    (schema_check=False is for the migrations CLI, which handles that itself).
+    """
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.request_class = IngestRequest  # Uploads stream to the volume, hashed on the way in
+    app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+    
+    # Enable CORS for all routes and origins
+    CORS(app, origins="*", methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"], 
+         allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Credentials"])
+    
+    # Ensure photography assets directory exists
+    os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
+    
+    for import_path, options, switch in BLUEPRINTS:
+        if switch is None or getattr(config, switch):
+            app.register_blueprint(import_string(import_path), **options)
+        else:
+            print(f"ℹ️  {import_path.split(':')[1]} disabled ({switch}=0)")
+    app.register_blueprint(core_bp)
+    
+    # Database configuration - Use persistent volume for database
+    database_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, 'mindseye.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{database_path}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    
+    # Initialize database
+    db.init_app(app)
+    with app.app_context():
+        # Schema changes and first-run setup: one query when the schema is current, otherwise
+        # applied once under a file lock while other processes wait
+        if schema_check and config.MIGRATE_ON_BOOT:
+            migrate()
+        elif schema_check:
+            check_schema()  # MIGRATE_ON_BOOT=0: the release step must already have migrated
+        
+        # Initialize About page data files if they don't exist
+        try:
+            data_dir = '/data'
+        
+            # Create about_content.json if it doesn't exist
+            about_content_file = os.path.join(data_dir, 'about_content.json')
+            if not os.path.exists(about_content_file):
+                about_content = {
+                    "main_content": "Welcome to Mind's Eye Photography, where every moment is captured with artistic vision and technical precision. Our passion lies in transforming fleeting moments into timeless memories that tell your unique story.\n\nWith years of experience in portrait, landscape, and event photography, we specialize in creating images that not only document but also evoke emotion and preserve the essence of each moment. Whether it's a wedding, family portrait, or commercial project, we approach each shoot with creativity, professionalism, and attention to detail.\n\nOur philosophy is simple: photography is not just about taking pictures, it's about seeing the world through a different lens and sharing that vision with others. We believe that every person, every place, and every moment has a story worth telling, and we're here to help you tell yours.\n\nUsing state-of-the-art equipment and techniques, we ensure that every image meets the highest standards of quality while maintaining the authentic feel that makes each photograph special. From the initial consultation to the final delivery, we work closely with our clients to understand their vision and bring it to life.",
+                    "signature": "- Mind's Eye Photography"
+                }
+                with open(about_content_file, 'w') as f:
+                    json.dump(about_content, f, indent=2)
+                print(f"✅ Created {about_content_file}")
+            else:
+                print(f"ℹ️  About content file already exists")
+        
+            # Create about_minds_eye_image.json if it doesn't exist
+            about_image_file = os.path.join(data_dir, 'about_minds_eye_image.json')
+            if not os.path.exists(about_image_file):
+                about_image = {"filename": None}
+                with open(about_image_file, 'w') as f:
+                    json.dump(about_image, f, indent=2)
+                print(f"✅ Created {about_image_file}")
+            else:
+                print(f"ℹ️  About image file already exists")
+            
+            print("✅ About page data initialization complete")
+        
+        except Exception as e:
+            print(f"⚠️ About page data initialization error: {e}")
+        
+        # Connections opened above must not be inherited by forked workers
+        db.engine.dispose()
+    
+    # Temp files from uploads a dead worker never finished, and chunked uploads nobody came back for
+    sweep_upload_temp()
+    sweep_chunked_uploads()
+    return app
+
+def init_worker(app):
+    """
+    Per-process setup: call in every worker after it forks (gunicorn.conf.py's
+    post_fork), or once when serving from a single process
+    Drops any database connections inherited from the parent and starts this
+    process's job worker threads (JOB_WORKER_THREADS=0 to use a separate
+    `python -m src.jobs` process instead).
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)  # Leave the parent's connections alone, just stop using them
+    start_job_workers(app)
+    return app
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    init_worker(create_app()).run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,314 @@
+"""
+Schema migrations for Mind's Eye Photography
+Ordered, numbered migrations replace the column probing every worker used to
+do at boot. The schema_version table records which have been applied; boot
+reads its highest version and stops there when the schema is current, so a
+normal start costs one query. Pending migrations run under a file lock on the
+volume, so when gunicorn spawns several workers only the first applies them
+and the rest find the schema current once the lock is released.
+
+Migrations must be idempotent: databases from before this module have no
+schema_version table and replay every migration from 1, and a migration
+interrupted half-way runs again in full. New columns go in a new migration
+through add_columns() (fresh databases already have them from create_all()),
+new model indexes through a new migration calling ensure_indexes().
+
+Boot applies pending migrations unless MIGRATE_ON_BOOT=0, in which case run
+them as a release step (boot then refuses to start on a schema that is
+behind the code):
+
+    python -m src.migrations            # apply pending migrations
+    python -m src.migrations --status   # list applied and pending migrations
+"""
+import os
+from contextlib import contextmanager
+from sqlalchemy.exc import OperationalError
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+from .config import PHOTOGRAPHY_ASSETS_DIR
+from .models import db, SchemaVersion
+
+LOCK_FILE = os.path.join(PHOTOGRAPHY_ASSETS_DIR, '.migrations.lock')
+
+_migrations = []
+
+
+class MigrationError(RuntimeError):
+    """A migration failed, or the schema is behind the code - the app must not serve on it"""
+
+
+def migration(version, name):
+    """Register fn() as migration `version` (applied in version order)"""
+    def decorator(fn):
+        if any(existing == version for existing, _, _ in _migrations):
+            raise ValueError(f"Duplicate migration version: {version}")
+        _migrations.append((version, name, fn))
+        _migrations.sort(key=lambda entry: entry[0])
+        return fn
+    return decorator
+
+
+def add_columns(table, columns):
+    """Add the (name, SQL type) columns the table doesn't have yet"""
+    with db.engine.begin() as conn:
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        for column, column_type in columns:
+            if column not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                print(f"✅ Added {table}.{column} column")
+
+
+# ----------------------------------------------------------------------------
+# Migrations - append new ones at the end with the next number, never renumber
+# ----------------------------------------------------------------------------
+
+@migration(1, 'create_tables')
+def create_tables():
+    db.create_all()
+
+
+@migration(2, 'image_flag_and_exif_columns')
+def image_flag_and_exif_columns():
+    add_columns('images', [
+        ('is_slideshow_background', 'BOOLEAN DEFAULT 0'),
+        ('is_about', 'BOOLEAN DEFAULT 0'),
+    ] + [(column, 'VARCHAR(100)') for column in (
+        'camera_make', 'camera_model', 'lens_model', 'focal_length',
+        'aperture', 'shutter_speed', 'iso', 'flash', 'exposure_mode', 'white_balance'
+    )])
+
+
+@migration(3, 'image_hash_and_capture_columns')
+def image_hash_and_capture_columns():
+    add_columns('images', [
+        ('content_hash', 'VARCHAR(64)'),
+        ('capture_date', 'VARCHAR(50)'),
+        ('exif_extracted', 'BOOLEAN DEFAULT 0'),
+        ('perceptual_hash', 'VARCHAR(16)'),
+    ])
+
+
+@migration(4, 'backfill_upload_date')
+def backfill_upload_date():
+    # Pagination orders by (upload_date, id) - give any undated legacy rows a date
+    with db.engine.begin() as conn:
+        result = conn.exec_driver_sql("UPDATE images SET upload_date = CURRENT_TIMESTAMP WHERE upload_date IS NULL")
+    if result.rowcount:
+        print(f"✅ Backfilled upload_date on {result.rowcount} image(s)")
+
+
+@migration(5, 'seed_defaults')
+def seed_defaults():
+    from .models import Category, SystemConfig, init_default_categories, init_data_version, init_system_config
+
+    init_data_version()  # Counter every worker checks to know when its caches are stale
+    if Category.query.first() is None:
+        init_default_categories()
+    if SystemConfig.query.first() is None:
+        init_system_config()
+
+
+@migration(6, 'declared_indexes')
+def declared_indexes():
+    from .models import ensure_indexes
+
+    ensure_indexes()
+
+
+@migration(7, 'import_volume_images')
+def import_volume_images():
+    from .models import Image, migrate_existing_images
+
+    # First deploy onto an existing volume - images already there become portfolio rows
+    if Image.query.first() is None:
+        migrate_existing_images()
+
+
+@migration(8, 'unshare_derivative_files')
+def unshare_derivative_files():
+    from sqlalchemy import func
+    from .blobs import remove_files
+    from .config import DERIVATIVES_DIR
+    from .jobs import enqueue
+    from .models import ImageDerivative
+
+    # Derivative names used to drop the original's extension, so x.jpg and x.png wrote the same files.
+    # Those files are right for at most one of the images: rebuild both under the new names
+    shared = (db.session.query(ImageDerivative.filename)
+              .group_by(ImageDerivative.filename)
+              .having(func.count(func.distinct(ImageDerivative.image_id)) > 1))
+    rows = ImageDerivative.query.filter(ImageDerivative.filename.in_(shared)).all()
+    if not rows:
+        return
+    stale_files = sorted({os.path.join(DERIVATIVES_DIR, row.filename) for row in rows})
+    for image_id in sorted({row.image_id for row in rows}):
+        enqueue('derivatives', image_id)
+    for row in rows:
+        db.session.delete(row)
+    db.session.commit()
+    remove_files(stale_files, verbose=False)
+    print(f"✅ Rebuilding derivatives that were shared between images ({len(stale_files)} file(s))")
+
+
+@migration(9, 'queue_content_hashes')
+def queue_content_hashes():
+    from .jobs import enqueue
+    from .models import Image
+
+    # Request paths no longer hash originals on a miss - legacy rows get theirs from background jobs
+    image_ids = [image_id for image_id, in db.session.query(Image.id).filter(Image.content_hash == None)]
+    for image_id in image_ids:
+        enqueue('hash', image_id)
+    db.session.commit()
+    if image_ids:
+        print(f"✅ Queued content hashing for {len(image_ids)} image(s)")
+
+
+@migration(10, 'queue_exif_extraction')
+def queue_exif_extraction():
+    from .config import PHOTOGRAPHY_ASSETS_DIR
+    from .exif import apply_exif
+    from .jobs import enqueue
+    from .models import Image
+
+    # Featured EXIF is served from the stored columns only - fill them for rows uploaded before they existed.
+    # The featured image is read here (headers only) so its endpoint has camera data right after the deploy
+    pending = Image.query.filter((Image.exif_extracted == None) | (Image.exif_extracted == False))
+    for image in pending.filter(Image.is_featured == True):
+        try:
+            apply_exif(image, os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename))
+        except Exception as e:
+            print(f"⚠️  EXIF for featured image {image.filename} left to the job queue: {e}")
+    db.session.flush()
+    image_ids = [image_id for image_id, in pending.with_entities(Image.id)]
+    for image_id in image_ids:
+        enqueue('exif', image_id)
+    db.session.commit()
+    if image_ids:
+        print(f"✅ Queued EXIF extraction for {len(image_ids)} image(s)")
+
+
+@migration(11, 'widen_original_permissions')
+def widen_original_permissions():
+    import stat
+    from .config import BLOBS_DIR
+    from .ingest import new_file_mode
+
+    # Uploads spooled through mkstemp were renamed into place as 0600 - give them the mode open() would have
+    mode = new_file_mode()
+    paths = [os.path.join(PHOTOGRAPHY_ASSETS_DIR, name) for name in os.listdir(PHOTOGRAPHY_ASSETS_DIR)
+             if not name.startswith('.') and '.db' not in name]  # Originals, not the database or bookkeeping
+    paths += [os.path.join(directory, name) for directory, _, files in os.walk(BLOBS_DIR) for name in files]
+    fixed = 0
+    for path in paths:
+        if os.path.isfile(path) and not os.path.islink(path) and stat.S_IMODE(os.stat(path).st_mode) == 0o600:
+            os.chmod(path, mode)
+            fixed += 1
+    if fixed:
+        print(f"✅ Made {fixed} original(s) readable again ({oct(mode)})")
+
+
+# ----------------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------------
+
+def latest_version():
+    return _migrations[-1][0]
+
+
+def current_version():
+    """Highest migration applied to the database (0 before any, or before schema_version existed)"""
+    try:
+        with db.engine.connect() as conn:
+            return conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").scalar() or 0
+    except OperationalError:
+        return 0
+
+
+@contextmanager
+def migration_lock():
+    """Hold the volume-wide migration lock (one process migrates, the others wait)"""
+    if fcntl is None:
+        yield
+        return
+    with open(LOCK_FILE, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def migrate():
+    """
+    Apply pending migrations in order; returns the names applied
+    Raises MigrationError at the first failure, so later migrations never run
+    against a schema they don't expect and the app never starts on it.
+    Migrations before the failed one stay applied; the next run resumes there.
+    """
+    if current_version() >= latest_version():
+        return []
+
+    applied = []
+    with migration_lock():
+        version = current_version()  # Another worker may have migrated while this one waited
+        for number, name, fn in _migrations:
+            if number <= version:
+                continue
+            print(f"🔄 Applying migration {number}: {name}")
+            try:
+                fn()
+                db.session.add(SchemaVersion(version=number, name=name))
+                db.session.commit()
+                applied.append(name)
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Migration {number} ({name}) failed: {e}")
+                raise MigrationError(f"Migration {number} ({name}) failed: {e}") from e
+    if applied:
+        print(f"✅ Schema at version {latest_version()} ({len(applied)} migration(s) applied)")
+    return applied
+
+
+def check_schema():
+    """Raise MigrationError unless every migration has been applied (for MIGRATE_ON_BOOT=0)"""
+    version = current_version()
+    if version < latest_version():
+        raise MigrationError(f"Schema is at version {version}, the code needs {latest_version()} - "
+                             f"run python -m src.migrations")
+
+
+def migration_status():
+    """(version, name, applied date or None) for every known migration"""
+    try:
+        applied = {row.version: row.applied_date for row in SchemaVersion.query.all()}
+    except OperationalError:
+        db.session.rollback()
+        applied = {}
+    return [(number, name, applied.get(number)) for number, name, _ in _migrations]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Apply database schema migrations')
+    parser.add_argument('--status', action='store_true', help='list migrations without applying any')
+    args = parser.parse_args()
+
+    from src.main import create_app
+    app = create_app(schema_check=False)  # Apply (or just list) them here rather than while creating the app
+
+    with app.app_context():
+        failed = False
+        if not args.status:
+            try:
+                migrate()
+            except MigrationError:
+                failed = True
+        for number, name, applied_date in migration_status():
+            print(f"{number:>4}  {name:<32} {applied_date or 'pending'}")
+    raise SystemExit(1 if failed else 0)
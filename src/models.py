@@ -32,6 +32,8 @@ class Image(db.Model):
     is_about = db.Column(db.Boolean, default=False)  # New field for About page images
     featured_story = db.Column(db.Text)
     display_order = db.Column(db.Integer, default=0)
+    content_hash = db.Column(db.String(64))  # SHA-256 of the original, used as its ETag
+    perceptual_hash = db.Column(db.String(16))  # 64-bit dHash (hex) for near-duplicate detection
     
     # EXIF Data fields
     camera_make = db.Column(db.String(100))
@@ -44,13 +46,32 @@ class Image(db.Model):
     flash = db.Column(db.String(50))
     exposure_mode = db.Column(db.String(50))
     white_balance = db.Column(db.String(50))
+    capture_date = db.Column(db.String(50))  # EXIF DateTimeOriginal, as recorded by the camera
+    exif_extracted = db.Column(db.Boolean, default=False)  # Set once EXIF has been read from the file
+    
+    # Hot query paths: the portfolio listing (ordered by upload_date, id) and the
+    # one-or-few images carrying each flag (partial indexes hold only those rows)
+    __table_args__ = (
+        db.Index('ix_images_upload_date_id', upload_date, id),
+        db.Index('ix_images_featured', is_featured, sqlite_where=is_featured == True),
+        db.Index('ix_images_background', is_background, sqlite_where=is_background == True),
+        db.Index('ix_images_slideshow_background', is_slideshow_background, sqlite_where=is_slideshow_background == True),
+        db.Index('ix_images_about', is_about, sqlite_where=is_about == True),
+    )
     
     # Relationships
     categories = db.relationship('ImageCategory', back_populates='image', cascade='all, delete-orphan')
+    derivatives = db.relationship('ImageDerivative', back_populates='image', cascade='all, delete-orphan',
+                                  order_by='ImageDerivative.width')
     
     def __repr__(self):
         return f'<Image {self.title}>'
     
+    def exif_dict(self, fields=None):
+        """Stored EXIF values that are set, limited to the keys the featured endpoints have always returned"""
+        from .exif import FEATURED_EXIF_FIELDS
+        return {field: getattr(self, field) for field in fields or FEATURED_EXIF_FIELDS if getattr(self, field)}
+    
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
         return {
@@ -112,12 +133,48 @@ class ImageCategory(db.Model):
     image = db.relationship('Image', back_populates='categories')
     category = db.relationship('Category', back_populates='images')
     
-    # Unique constraint
-    __table_args__ = (db.UniqueConstraint('image_id', 'category_id', name='unique_image_category'),)
+    # Lookups by image_id use the unique constraint's index; category filters need their own
+    __table_args__ = (
+        db.UniqueConstraint('image_id', 'category_id', name='unique_image_category'),
+        db.Index('ix_image_categories_category_id', 'category_id'),
+    )
     
     def __repr__(self):
         return f'<ImageCategory {self.image_id} -> {self.category_id}>'
 
+class ImageDerivative(db.Model):
+    """Resized copy of an Image (one row per size in the derivative ladder)"""
+    __tablename__ = 'image_derivatives'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    image_id = db.Column(db.String(36), db.ForeignKey('images.id'), nullable=False)
+    width = db.Column(db.Integer, nullable=False)  # Ladder size (long edge) this variant was built for
+    actual_width = db.Column(db.Integer)
+    actual_height = db.Column(db.Integer)
+    filename = db.Column(db.String(255), nullable=False)  # Relative to DERIVATIVES_DIR
+    format = db.Column(db.String(10), default='JPEG')
+    file_size = db.Column(db.Integer)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    image = db.relationship('Image', back_populates='derivatives')
+    
+    # Unique constraint
+    __table_args__ = (db.UniqueConstraint('image_id', 'width', name='unique_image_derivative'),)
+    
+    def __repr__(self):
+        return f'<ImageDerivative {self.image_id} @{self.width}>'
+    
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'width': self.width,
+            'actual_width': self.actual_width,
+            'actual_height': self.actual_height,
+            'format': self.format,
+            'file_size': self.file_size
+        }
+
 class SystemConfig(db.Model):
     """System Configuration Settings"""
     __tablename__ = 'system_config'
@@ -156,6 +213,75 @@ class SystemConfig(db.Model):
         else:
             self.value = str(value)
 
+class DataVersion(db.Model):
+    """Single-row counter bumped by every data write (cross-worker cache invalidation)"""
+    __tablename__ = 'data_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DataVersion {self.version}>'
+
+class SchemaVersion(db.Model):
+    """One row per schema migration applied to this database (see src/migrations.py)"""
+    __tablename__ = 'schema_version'
+    
+    version = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    applied_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SchemaVersion {self.version} {self.name}>'
+
+class ImageBlob(db.Model):
+    """Stored original shared by every Image with identical bytes (see src/blobs.py)"""
+    __tablename__ = 'image_blobs'
+
+    content_hash = db.Column(db.String(64), primary_key=True)  # SHA-256 - the blob's name in BLOBS_DIR
+    file_size = db.Column(db.Integer)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)  # Image rows pointing at this content
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ImageBlob {self.content_hash[:12]} x{self.ref_count}>'
+
+class Job(db.Model):
+    """Background job (upload post-processing) - one row per (kind, image), so re-enqueueing is idempotent"""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # Handler name, see src/jobs.py
+    image_id = db.Column(db.String(36), nullable=False)  # No FK - the job outlives a deleted image and skips it
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow)  # Retry backoff
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Unique constraint
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'image_id', name='unique_job'),
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    def __repr__(self):
+        return f'<Job {self.kind} {self.image_id} {self.status}>'
+
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'image_id': self.image_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'updated_date': self.updated_date.isoformat() if self.updated_date else None
+        }
+
 # ============================================================================
 # COMPATIBILITY LAYER FOR EXISTING IMPORTS
 # ============================================================================
@@ -215,6 +341,40 @@ def init_default_categories():
         db.session.rollback()
         print(f"⚠️  Categories may already exist: {e}")
 
+def init_data_version():
+    """Create the data version row if it doesn't exist"""
+    if DataVersion.query.get(1) is None:
+        db.session.add(DataVersion(id=1, version=0))
+        try:
+            db.session.commit()
+            print("✅ Initialized data version counter")
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️  Data version row may already exist: {e}")
+
+def ensure_indexes():
+    """
+    Create any index declared on the models that the database is missing
+    create_all() only builds indexes together with new tables, so existing
+    databases pick up indexes added later here. Returns the names created.
+    """
+    inspector = db.inspect(db.engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(bind=db.engine, checkfirst=True)
+                created.append(index.name)
+                print(f"✅ Created index {index.name}")
+            except Exception as e:
+                print(f"⚠️  Error creating index {index.name}: {e}")
+    return created
+
 def init_system_config():
     """Initialize default system configuration"""
     default_configs = [
@@ -270,6 +430,7 @@ def init_system_config():
 def migrate_existing_images():
     """Migrate existing images from volume to database"""
     from src.config import PHOTOGRAPHY_ASSETS_DIR
+    from src.jobs import enqueue
     import os
     # from PIL import Image as PILImage
     
@@ -360,6 +521,7 @@ def migrate_existing_images():
         
         db.session.add(image)
         db.session.flush()  # Get the image ID
+        enqueue('hash', image.id)  # Content hash for fingerprinted URLs, off the request path
         
         # Assign categories
         assigned_categories = []
@@ -0,0 +1,105 @@
+"""
+Perceptual hashing and near-duplicate detection for Mind's Eye Photography
+Each Image gets a 64-bit difference hash (dHash) during post-processing.
+Re-encodes, resizes and small edits of the same photo land within a few bits
+of each other, so near-duplicates are pairs with a small Hamming distance.
+Distances are computed with NumPy over a packed uint64 array, a block of rows
+at a time, so a report over tens of thousands of images never loops over
+pairs in Python.
+"""
+import numpy as np
+from PIL import Image as PILImage, ImageOps
+
+HASH_SIZE = 8  # 8x8 comparisons -> 64 bits
+DEFAULT_MAX_DISTANCE = 6  # Bits that may differ for two images to count as near-duplicates
+BLOCK_ROWS = 256  # Rows compared per NumPy step (BLOCK_ROWS x N distances in memory)
+
+# Set bits per byte, for NumPy versions without bitwise_count
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def dhash(path):
+    """64-bit difference hash of an image file, as 16 hex characters"""
+    with PILImage.open(path) as img:
+        img.draft('L', (HASH_SIZE * 16, HASH_SIZE * 16))  # JPEGs decode at a fraction of full size
+        img = ImageOps.exif_transpose(img).convert('L')
+        small = img.resize((HASH_SIZE + 1, HASH_SIZE), PILImage.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    value = int(np.packbits(bits).view('>u8')[0])
+    return f"{value:016x}"
+
+
+def _popcount(values):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _POPCOUNT_TABLE[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+def pack_hashes(hex_hashes):
+    """uint64 array from a sequence of 16-character hex hashes"""
+    return np.array([int(h, 16) for h in hex_hashes], dtype=np.uint64)
+
+
+def near_duplicate_pairs(hashes, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    (i, j, distance) for every pair i < j of a packed uint64 array within max_distance
+    """
+    pairs = []
+    count = len(hashes)
+    for start in range(0, count - 1, BLOCK_ROWS):
+        rows = hashes[start:start + BLOCK_ROWS]
+        columns = hashes[start + 1:]
+        distances = _popcount(rows[:, None] ^ columns[None, :])
+        row_idx, col_idx = np.nonzero(distances <= max_distance)
+        # Column c is image start+1+c; keep it only when it comes after row r (image start+r)
+        keep = col_idx >= row_idx
+        for r, c in zip(row_idx[keep], col_idx[keep]):
+            pairs.append((start + int(r), start + 1 + int(c), int(distances[r, c])))
+    return pairs
+
+
+def cluster_pairs(count, pairs):
+    """Group indices linked by pairs into clusters (lists of indices, largest first)"""
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j, _ in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    groups = {}
+    for i, _, _ in pairs:
+        groups.setdefault(find(i), set())
+    for i, j, _ in pairs:
+        groups[find(i)].update((i, j))
+    return sorted((sorted(group) for group in groups.values()), key=len, reverse=True)
+
+
+def find_near_duplicates(max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Near-duplicate clusters among all hashed images
+    Returns a list of {'images': [Image, ...], 'max_distance': int}, largest first.
+    """
+    from .models import Image
+
+    images = Image.query.filter(Image.perceptual_hash != None).order_by(Image.upload_date).all()
+    if len(images) < 2:
+        return []
+
+    pairs = near_duplicate_pairs(pack_hashes([image.perceptual_hash for image in images]), max_distance)
+    worst = {}
+    for i, j, distance in pairs:
+        worst[i] = max(worst.get(i, 0), distance)
+        worst[j] = max(worst.get(j, 0), distance)
+
+    return [
+        {'images': [images[i] for i in cluster], 'max_distance': max(worst[i] for i in cluster)}
+        for cluster in cluster_pairs(len(images), pairs)
+    ]
@@ -0,0 +1,98 @@
+"""
+Shared portfolio queries for Mind's Eye Photography
+Images come back with their categories eagerly loaded, so building a
+portfolio listing costs a fixed number of queries however many images exist
+"""
+import base64
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.orm import selectinload
+
+from .models import db, Image, Category, ImageCategory
+
+
+def portfolio_images_query(include_about=False):
+    """Image query with categories (and their names) loaded in one extra round trip"""
+    query = Image.query.options(
+        selectinload(Image.categories).selectinload(ImageCategory.category)
+    )
+    if not include_about:
+        query = query.filter(Image.is_about != True)
+    return query
+
+
+def load_portfolio_images(include_about=False, newest_first=False):
+    """All portfolio images, categories preloaded"""
+    query = portfolio_images_query(include_about)
+    if newest_first:
+        query = query.order_by(Image.upload_date.desc())
+    return query.all()
+
+
+def category_names(image, default=None):
+    """Category names of an image loaded through portfolio_images_query"""
+    names = [link.category.name for link in image.categories if link.category]
+    if not names and default:
+        names = [default]
+    return names
+
+
+def category_image_counts():
+    """Number of images per category id, in a single grouped query"""
+    rows = db.session.query(
+        ImageCategory.category_id, db.func.count(ImageCategory.id)
+    ).group_by(ImageCategory.category_id).all()
+    return {category_id: count for category_id, count in rows}
+
+
+def load_categories_with_counts():
+    """All categories with their image counts as (Category, count) pairs"""
+    counts = category_image_counts()
+    return [(category, counts.get(category.id, 0)) for category in Category.query.all()]
+
+
+# ----------------------------------------------------------------------------
+# Keyset pagination (newest first, ordered by upload_date then id)
+# ----------------------------------------------------------------------------
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(image):
+    """Opaque cursor pointing just past image"""
+    raw = f"{image.upload_date.isoformat()}|{image.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(upload_date, id) from a cursor; raises ValueError if it was tampered with"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        upload_date, image_id = raw.split('|', 1)
+        return datetime.fromisoformat(upload_date), image_id
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
+def load_portfolio_page(limit=DEFAULT_PAGE_SIZE, cursor=None, category=None, with_categories=True):
+    """
+    One page of portfolio images, newest first
+    Returns (images, next_cursor) - next_cursor is None on the last page.
+    Filtering and paging happen in SQL, so cost doesn't grow with the library.
+    """
+    query = portfolio_images_query() if with_categories else Image.query.filter(Image.is_about != True)
+
+    if category:
+        query = query.filter(Image.categories.any(
+            ImageCategory.category.has(db.func.lower(Category.name) == category.lower())
+        ))
+
+    if cursor:
+        upload_date, image_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Image.upload_date, Image.id) < tuple_(upload_date, image_id))
+
+    # Fetch one extra row to know whether another page exists
+    images = query.order_by(Image.upload_date.desc(), Image.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(images[limit - 1]) if len(images) > limit else None
+    return images[:limit], next_cursor
@@ -0,0 +1,67 @@
+"""
+In-memory snapshots of the portfolio JSON endpoints
+The serialized body (plain and gzip) is built once per data version, so a
+page view is a memory copy plus an ETag comparison instead of a database
+round trip and a rebuild
+"""
+import gzip
+import hashlib
+import threading
+from flask import current_app, request, Response
+
+from .data_version import current_version
+
+GZIP_LEVEL = 6
+
+
+class PortfolioSnapshot:
+    """Serialized JSON body of one endpoint at one data version"""
+
+    def __init__(self, version, data):
+        self.version = version
+        self.body = current_app.json.dumps(data).encode('utf-8') + b'\n'
+        self.gzipped = gzip.compress(self.body, GZIP_LEVEL)
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.count = len(data)
+
+
+_snapshots = {}
+_build_lock = threading.Lock()
+
+
+def get_snapshot(name, builder):
+    """Current snapshot for name, calling builder() only when the data version moved"""
+    version = current_version()
+    snapshot = _snapshots.get(name)
+    if snapshot and snapshot.version == version:
+        return snapshot
+
+    with _build_lock:
+        snapshot = _snapshots.get(name)
+        if snapshot and snapshot.version == version:
+            return snapshot
+        snapshot = PortfolioSnapshot(version, builder())
+        _snapshots[name] = snapshot
+        print(f"📦 Rebuilt {name} snapshot: {snapshot.count} items, version {version}")
+        return snapshot
+
+
+def clear_snapshots():
+    """Drop every snapshot (next request rebuilds)"""
+    _snapshots.clear()
+
+
+def snapshot_response(snapshot):
+    """Response for a snapshot - 304 on a matching ETag, gzip when the client accepts it"""
+    if request.if_none_match.contains(snapshot.etag):
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(snapshot.gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(snapshot.body, mimetype='application/json')
+
+    response.set_etag(snapshot.etag)
+    response.cache_control.no_cache = True  # Always revalidate; the ETag makes that cheap
+    response.vary.add('Accept-Encoding')
+    return response
@@ -3,9 +3,18 @@ import json
 import uuid
 import os
 from datetime import datetime
-from flask import Blueprint, request, render_template_string, redirect, url_for, session, flash, jsonify
+from flask import Blueprint, request, render_template_string, redirect, url_for, session, flash, jsonify, current_app
 from werkzeug.utils import secure_filename
+from werkzeug.datastructures import FileStorage
 from ..config import PHOTOGRAPHY_ASSETS_DIR, PORTFOLIO_DATA_FILE, CATEGORIES_CONFIG_FILE, get_image_url
+from ..derivatives import derivative_paths
+from ..ingest import save_upload
+from ..blobs import store_original, release_original, remove_files
+from ..bulk_operations import bulk_delete_images, bulk_set_categories
+from ..chunked_upload import (UploadError, create_session, load_session, received_chunks, write_chunk,
+                              completion_lock, assemble, finish_session, discard_session)
+from ..jobs import enqueue, enqueue_upload_jobs, notify_workers, job_summary, retry_failed_jobs
+from ..portfolio_queries import load_portfolio_images, category_names
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -158,12 +167,12 @@ def admin_dashboard():
     from ..models import Image, Category
     
     # Get all images from database - sorted by upload_date newest to oldest
-    images = Image.query.order_by(Image.upload_date.desc()).all()
+    images = load_portfolio_images(include_about=True, newest_first=True)
     portfolio_data = []
     
     for image in images:
-        # Get categories for this image
-        image_categories = [cat.category.name for cat in image.categories]
+        # Categories come preloaded with the images
+        image_categories = category_names(image)
         
         portfolio_data.append({
             'id': image.id,
@@ -188,6 +197,56 @@ def admin_dashboard():
                                 message=request.args.get('message'),
                                 message_type=request.args.get('message_type', 'success'))
 
+def add_uploaded_image(image_file, title, description, categories, number=None):
+    """
+    Store one uploaded original and create its Image row, categories and post-processing jobs
+    number is the image's position in a multi-file batch (None for a single upload). Caller commits.
+    """
+    from ..models import db, Image, Category, ImageCategory
+    
+    # Generate filename
+    unique_id = str(uuid.uuid4())[:8]
+    safe_title = secure_filename(title.lower().replace(' ', '-'))
+    if number and number > 1:
+        safe_title = f"{safe_title}-{number}"
+    
+    file_extension = os.path.splitext(image_file.filename)[1].lower()
+    if not file_extension:
+        file_extension = '.jpg'
+    
+    filename = f"{safe_title}-{unique_id}{file_extension}"
+    
+    # Store the original durably (hashed while it streamed in, shared with identical uploads)
+    # - the rest happens in background jobs
+    final_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, filename)
+    file_size, content_hash = store_original(image_file, final_path)
+    
+    # Create new image in database
+    new_image = Image(
+        filename=filename,
+        title=f"{title} {number}" if number else title,
+        description=description,
+        file_size=file_size,
+        content_hash=content_hash,
+        upload_date=datetime.now()
+    )
+    
+    # Add to database
+    db.session.add(new_image)
+    db.session.flush()  # Get the ID
+    
+    # EXIF/dimensions, derivatives and transcodes - committed with the image
+    enqueue_upload_jobs(new_image.id)
+    
+    # Add category associations
+    for category_name in categories:
+        category = Category.query.filter_by(name=category_name).first()
+        if category:
+            image_category = ImageCategory(image_id=new_image.id, category_id=category.id)
+            db.session.add(image_category)
+    
+    return new_image
+
 @admin_bp.route('/admin/upload', methods=['POST'])
 def admin_upload():
     """Handle image upload (single or multiple) - SAVE TO SQL DATABASE"""
@@ -202,7 +261,7 @@ def admin_upload():
         image_files = request.files.getlist('image')
         
         # Import database models
-        from ..models import db, Image, Category, ImageCategory
+        from ..models import db
         
         # Validation
         if not title:
@@ -217,59 +276,18 @@ def admin_upload():
             return redirect(url_for('admin.admin_dashboard') + '?message=Please select at least one image file&message_type=error')
         
         uploaded_count = 0
+        is_batch = len([f for f in image_files if f.filename]) > 1
         
         # Process each image file
         for image_file in image_files:
             if image_file and image_file.filename:
-                # Generate filename
-                unique_id = str(uuid.uuid4())[:8]
-                safe_title = secure_filename(title.lower().replace(' ', '-'))
-                if uploaded_count > 0:
-                    safe_title = f"{safe_title}-{uploaded_count + 1}"
-                
-                file_extension = os.path.splitext(image_file.filename)[1].lower()
-                if not file_extension:
-                    file_extension = '.jpg'
-                
-                filename = f"{safe_title}-{unique_id}{file_extension}"
-                
-                # Save file to photography assets directory
-                os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
-                final_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, filename)
-                image_file.save(final_path)
-                
-                # Get file size and dimensions
-                file_size = os.path.getsize(final_path)
-                # PIL temporarily disabled - set dimensions to None
-                width, height = None, None
-                
-                # Create new image in database
-                final_title = f"{title} {uploaded_count + 1}" if len([f for f in image_files if f.filename]) > 1 else title
-                new_image = Image(
-                    filename=filename,
-                    title=final_title,
-                    description=description,
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    upload_date=datetime.now()
-                )
-                
-                # Add to database
-                db.session.add(new_image)
-                db.session.flush()  # Get the ID
-                
-                # Add category associations
-                for category_name in categories:
-                    category = Category.query.filter_by(name=category_name).first()
-                    if category:
-                        image_category = ImageCategory(image_id=new_image.id, category_id=category.id)
-                        db.session.add(image_category)
-                
+                add_uploaded_image(image_file, title, description, categories,
+                                   number=uploaded_count + 1 if is_batch else None)
                 uploaded_count += 1
         
         # Commit all changes
         db.session.commit()
+        notify_workers()
         
         # Redirect with success message
         message = f"{uploaded_count} image(s) uploaded successfully!" if uploaded_count > 1 else "Image uploaded successfully!"
@@ -283,6 +301,120 @@ def admin_upload():
         print(f"Full traceback: {error_details}")
         return redirect(url_for('admin.admin_dashboard') + f'?message=Upload failed: {str(e)}&message_type=error')
 
+@admin_bp.route('/admin/uploads', methods=['POST'])
+def chunked_upload_init():
+    """Start a resumable upload of one file (metadata is applied when it completes)"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        title = (data.get('title') or '').strip()
+        categories = data.get('categories') or []
+        if not title:
+            return jsonify({'success': False, 'message': 'Please enter an image title'}), 400
+        if not categories:
+            return jsonify({'success': False, 'message': 'Please select at least one category'}), 400
+        
+        number = data.get('number')
+        manifest = create_session(
+            data.get('filename'),
+            data.get('size'),
+            metadata={
+                'title': title,
+                'description': (data.get('description') or '').strip(),
+                'categories': categories,
+                'number': int(number) if number else None
+            },
+            sha256=data.get('sha256')
+        )
+        return jsonify({'success': True, 'upload_id': manifest['upload_id'],
+                        'chunk_size': manifest['chunk_size'], 'chunk_count': manifest['chunk_count']})
+        
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        print(f"Chunked upload init error: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@admin_bp.route('/admin/uploads/<upload_id>', methods=['GET'])
+def chunked_upload_status(upload_id):
+    """Chunks received so far, so an interrupted upload can send only what's missing"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        manifest = load_session(upload_id)
+        return jsonify({'success': True, 'upload_id': upload_id, 'chunk_size': manifest['chunk_size'],
+                        'chunk_count': manifest['chunk_count'], 'received': received_chunks(manifest),
+                        'image_id': manifest['image_id']})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 404
+
+@admin_bp.route('/admin/uploads/<upload_id>', methods=['DELETE'])
+def chunked_upload_abort(upload_id):
+    """Abandon an upload and free its chunks"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        discard_session(upload_id)
+        return jsonify({'success': True})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@admin_bp.route('/admin/uploads/<upload_id>/chunks/<int:index>', methods=['PUT'])
+def chunked_upload_chunk(upload_id, index):
+    """Store one chunk (raw request body)"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        manifest = load_session(upload_id)
+        size = write_chunk(manifest, index, request.stream)
+        return jsonify({'success': True, 'index': index, 'size': size})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        print(f"Chunk {index} of {upload_id} failed: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@admin_bp.route('/admin/uploads/<upload_id>/complete', methods=['POST'])
+def chunked_upload_complete(upload_id):
+    """Reassemble the chunks and create the Image - safe to retry"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    from ..models import db
+    
+    try:
+        manifest = load_session(upload_id)
+        with completion_lock(manifest):
+            manifest = load_session(upload_id)
+            if manifest['image_id']:
+                return jsonify({'success': True, 'image_id': manifest['image_id']})
+            
+            metadata = manifest['metadata']
+            spool = assemble(manifest)
+            try:
+                image = add_uploaded_image(FileStorage(stream=spool, filename=manifest['filename']),
+                                           metadata['title'], metadata['description'], metadata['categories'],
+                                           number=metadata['number'])
+                db.session.commit()
+            finally:
+                spool.close()
+            finish_session(manifest, image.id)
+        
+        notify_workers()
+        return jsonify({'success': True, 'image_id': image.id})
+        
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Chunked upload complete error: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
 @admin_bp.route('/admin/bulk-delete', methods=['POST'])
 def bulk_delete():
     """Handle bulk deletion of multiple images"""
@@ -290,7 +422,7 @@ def bulk_delete():
         return redirect(url_for('admin.admin_login'))
     
     try:
-        from ..models import Image, ImageCategory, db
+        from ..models import db
         
         # Get list of image IDs to delete
         image_ids = request.form.getlist('image_ids')
@@ -298,34 +430,13 @@ def bulk_delete():
         if not image_ids:
             return redirect(url_for('admin.admin_dashboard') + '?message=No images selected for deletion&message_type=error')
         
-        deleted_count = 0
-        
-        # Delete each image from database and filesystem
-        for image_id in image_ids:
-            image = Image.query.get(image_id)
-            if image:
-                # Delete image file from filesystem
-                image_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename)
-                if os.path.exists(image_path):
-                    try:
-                        os.remove(image_path)
-                        print(f"✅ Deleted image file: {image_path}")
-                    except Exception as e:
-                        print(f"❌ Error deleting image file {image_path}: {e}")
-                
-                # Delete image categories relationships
-                ImageCategory.query.filter_by(image_id=image_id).delete()
-                
-                # Delete image from database
-                db.session.delete(image)
-                deleted_count += 1
-        
-        # Commit all changes
-        db.session.commit()
+        # Rows go in a few IN (...) statements; files are removed after the commit in the background
+        deleted_count, _ = bulk_delete_images(image_ids)
         
         return redirect(url_for('admin.admin_dashboard') + f'?message={deleted_count} image(s) deleted successfully!&message_type=success')
         
     except Exception as e:
+        db.session.rollback()
         print(f"Bulk delete error: {e}")
         flash(f'Error deleting images: {str(e)}', 'error')
         return redirect(url_for('admin.admin_dashboard'))
@@ -337,7 +448,7 @@ def bulk_update_categories():
         return {'success': False, 'message': 'Not authenticated'}, 401
     
     try:
-        from ..models import Image, Category, ImageCategory, db
+        from ..models import Category, db
         
         data = request.get_json()
         image_ids = data.get('image_ids', [])
@@ -354,23 +465,8 @@ def bulk_update_categories():
         if len(category_objects) != len(categories):
             return {'success': False, 'message': 'Some categories not found'}
         
-        # Update categories for selected images
-        updated_count = 0
-        for image_id in image_ids:
-            image = Image.query.get(image_id)
-            if image:
-                # Clear existing categories for this image
-                ImageCategory.query.filter_by(image_id=image_id).delete()
-                
-                # Add new categories
-                for category in category_objects:
-                    image_category = ImageCategory(image_id=image_id, category_id=category.id)
-                    db.session.add(image_category)
-                
-                updated_count += 1
-        
-        # Commit all changes
-        db.session.commit()
+        # Replace categories for all selected images at once
+        updated_count = bulk_set_categories(image_ids, [category.id for category in category_objects])
         
         return {
             'success': True, 
@@ -400,10 +496,9 @@ def admin_delete():
         if not image:
             return redirect(url_for('admin.admin_dashboard') + '?message=Image not found&message_type=error')
         
-        # Delete the image file from photography assets directory
-        image_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename)
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        # Release the original (the blob is only removed when no other image shares it);
+        # files are removed only after the commit, so a failed delete leaves the image intact
+        files_to_remove = release_original(image) + derivative_paths(image)
         
         # Delete associated category relationships
         ImageCategory.query.filter_by(image_id=image_id).delete()
@@ -411,6 +506,7 @@ def admin_delete():
         # Delete the image record from database
         db.session.delete(image)
         db.session.commit()
+        remove_files(files_to_remove)
         
         return redirect(url_for('admin.admin_dashboard') + '?message=Image deleted successfully!&message_type=success')
         
@@ -490,6 +586,104 @@ def slideshow_toggle():
         print(f"Slideshow toggle error: {e}")
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
 
+@admin_bp.route('/admin/metadata-backfill', methods=['POST'])
+def metadata_backfill():
+    """Start the dimensions/EXIF backfill for older images in the background"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        from ..backfill import start_backfill_job  # Pulls in multiprocessing and the EXIF/probe code - only when used
+
+        restart = request.args.get('restart') == '1'
+        if start_backfill_job(current_app._get_current_object(), restart=restart):
+            return jsonify({'success': True, 'message': 'Metadata backfill started'})
+        return jsonify({'success': False, 'message': 'Metadata backfill is already running'}), 409
+        
+    except Exception as e:
+        print(f"Backfill start error: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@admin_bp.route('/admin/metadata-backfill/status')
+def metadata_backfill_status():
+    """Progress of the current or last metadata backfill"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    from ..backfill import load_checkpoint
+    return jsonify(load_checkpoint() or {})
+
+@admin_bp.route('/admin/jobs/status')
+def jobs_status():
+    """Upload post-processing queue: counts per status and recent errors"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        return jsonify(job_summary())
+    except Exception as e:
+        print(f"Job status error: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@admin_bp.route('/admin/jobs/retry', methods=['POST'])
+def jobs_retry():
+    """Queue every failed job again"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    try:
+        count = retry_failed_jobs()
+        notify_workers()
+        return jsonify({'success': True, 'message': f'{count} failed job(s) queued again'})
+    except Exception as e:
+        print(f"Job retry error: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@admin_bp.route('/admin/near-duplicates')
+def near_duplicates():
+    """Report of near-duplicate image clusters by perceptual hash distance"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin.admin_login'))
+    
+    try:
+        from ..models import Image
+        from ..perceptual import find_near_duplicates, DEFAULT_MAX_DISTANCE
+        
+        max_distance = request.args.get('distance', DEFAULT_MAX_DISTANCE, type=int)
+        max_distance = max(0, min(max_distance, 32))
+        clusters = find_near_duplicates(max_distance)
+        unhashed = Image.query.filter(Image.perceptual_hash == None).count()
+        
+        return render_template_string(NEAR_DUPLICATES_TEMPLATE,
+                                    clusters=clusters,
+                                    max_distance=max_distance,
+                                    unhashed=unhashed,
+                                    message=request.args.get('message', ''),
+                                    message_type=request.args.get('message_type', 'info'))
+    except Exception as e:
+        print(f"Near-duplicate report error: {e}")
+        return redirect(url_for('admin.admin_dashboard') + f'?message=Near-duplicate report failed: {str(e)}&message_type=error')
+
+@admin_bp.route('/admin/near-duplicates/hash-missing', methods=['POST'])
+def hash_missing_images():
+    """Queue perceptual hashing for images uploaded before it existed"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin.admin_login'))
+    
+    try:
+        from ..models import db, Image
+        
+        image_ids = [row[0] for row in db.session.query(Image.id).filter(Image.perceptual_hash == None)]
+        for image_id in image_ids:
+            enqueue('phash', image_id)
+        db.session.commit()
+        notify_workers()
+        return redirect(url_for('admin.near_duplicates') + f'?message=Queued hashing for {len(image_ids)} image(s)&message_type=success')
+    except Exception as e:
+        db.session.rollback()
+        print(f"Hash queueing error: {e}")
+        return redirect(url_for('admin.near_duplicates') + f'?message=Error: {str(e)}&message_type=error')
+
 # Dashboard HTML template with dynamic categories and multi-image upload
 dashboard_html = '''
 <!DOCTYPE html>
@@ -774,6 +968,33 @@ dashboard_html = '''
             margin-top: 5px;
             font-size: 14px;
         }
+        .upload-progress {
+            margin-top: 15px;
+        }
+        .upload-row {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            margin-bottom: 6px;
+            font-size: 13px;
+            color: #ccc;
+        }
+        .upload-row .upload-name {
+            width: 220px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+        .upload-row progress {
+            flex: 1;
+            height: 12px;
+        }
+        .upload-row.failed .upload-status {
+            color: #f44336;
+        }
+        .upload-row.done .upload-status {
+            color: #4CAF50;
+        }
         .category-badges {
             display: flex;
             flex-wrap: wrap;
@@ -814,7 +1035,7 @@ dashboard_html = '''
     
     <div class="form-container">
         <h2>Manage Your Portfolio</h2>
-        <form method="POST" action="/admin/upload" enctype="multipart/form-data">
+        <form method="POST" action="/admin/upload" enctype="multipart/form-data" id="uploadForm">
             <div class="form-group">
                 <label for="image">Image Files (JPG/PNG) - Select Multiple</label>
                 <input type="file" id="image" name="image" accept="image/*" multiple required>
@@ -847,7 +1068,8 @@ dashboard_html = '''
                 <small style="color: #999;">All uploaded images will be assigned to the selected categories</small>
             </div>
             
-            <button type="submit">Upload Image(s)</button>
+            <button type="submit" id="uploadBtn">Upload Image(s)</button>
+            <div id="uploadProgress" class="upload-progress"></div>
         </form>
     </div>
     
@@ -882,6 +1104,14 @@ dashboard_html = '''
                     Delete Selected
                 </button>
                 <a href="/admin/backup-system" class="backup-quick-btn">🛡️ Backup System</a>
+                <a href="/admin/near-duplicates" class="backup-quick-btn">🔍 Near Duplicates</a>
+                <button type="button" class="backup-quick-btn" id="backfillBtn" onclick="startBackfill()">📷 Backfill Metadata</button>
+                <span id="backfillStatus" style="margin-left: 10px; color: #ccc;"></span>
+            </div>
+            <div class="bulk-actions" id="jobsPanel" style="color: #ccc;">
+                <span id="jobsStatus">Processing queue: loading...</span>
+                <button type="button" class="backup-quick-btn" id="retryJobsBtn" onclick="retryFailedJobs()" style="display: none;">🔁 Retry Failed</button>
+                <div id="jobsErrors" style="font-size: 12px; color: #f44336; margin-top: 5px;"></div>
             </div>
         </div>
         
@@ -889,7 +1119,7 @@ dashboard_html = '''
             {% for item in portfolio_data %}
             <div class="portfolio-item">
                 <input type="checkbox" class="portfolio-checkbox" name="selected_images" value="{{ item.id }}" onchange="updateSelectedCount()">
-                <img src="/static/assets/{{ item.filename }}" alt="{{ item.title }}">
+                <img src="/derivatives/640/{{ item.filename }}" alt="{{ item.title }}" loading="lazy">
                 <div class="portfolio-info">
                     <h3>{{ item.title }}</h3>
                     <p>{{ item.description }}</p>
@@ -940,6 +1170,202 @@ dashboard_html = '''
     </div>
     
     <script>
+        function showBackfillStatus(state) {
+            const status = document.getElementById('backfillStatus');
+            if (!state || !state.status) { status.textContent = ''; return; }
+            status.textContent = `Metadata: ${state.status} - ${state.processed}/${state.total} ` +
+                `(${state.updated} updated, ${state.failed} failed)`;
+            if (state.status === 'running') {
+                setTimeout(pollBackfill, 2000);
+            }
+        }
+        
+        function pollBackfill() {
+            fetch('/admin/metadata-backfill/status')
+                .then(response => response.json())
+                .then(showBackfillStatus)
+                .catch(() => {});
+        }
+        
+        function startBackfill() {
+            fetch('/admin/metadata-backfill', { method: 'POST' })
+                .then(response => response.json())
+                .then(data => {
+                    document.getElementById('backfillStatus').textContent = data.message;
+                    setTimeout(pollBackfill, 1000);
+                });
+        }
+        
+        document.addEventListener('DOMContentLoaded', pollBackfill);
+        
+        function showJobs(summary) {
+            const counts = summary.counts || {};
+            document.getElementById('jobsStatus').textContent =
+                `Processing queue: ${counts.queued || 0} queued, ${counts.running || 0} running, ` +
+                `${counts.done || 0} done, ${counts.failed || 0} failed`;
+            document.getElementById('retryJobsBtn').style.display = counts.failed ? 'inline-block' : 'none';
+            document.getElementById('jobsErrors').innerText = (summary.problems || [])
+                .filter(job => job.status !== 'done')
+                .map(job => `${job.kind} ${job.image_id.slice(0, 8)} (${job.status}, attempt ${job.attempts}): ${job.last_error}`)
+                .join('\\n');
+            if (counts.queued || counts.running) {
+                setTimeout(pollJobs, 3000);
+            }
+        }
+        
+        function pollJobs() {
+            fetch('/admin/jobs/status')
+                .then(response => response.json())
+                .then(showJobs)
+                .catch(() => {});
+        }
+        
+        function retryFailedJobs() {
+            fetch('/admin/jobs/retry', { method: 'POST' })
+                .then(response => response.json())
+                .then(data => {
+                    document.getElementById('jobsStatus').textContent = data.message;
+                    setTimeout(pollJobs, 1000);
+                });
+        }
+        
+        document.addEventListener('DOMContentLoaded', pollJobs);
+        
+        // Resumable chunked uploads: each file goes up in chunks (several files at once),
+        // a failed chunk is retried, and re-submitting the same files resumes where they stopped
+        const UPLOAD_CONCURRENCY = 3;
+        const CHUNK_ATTEMPTS = 5;
+        
+        function uploadKey(file) {
+            return `chunked-upload:${file.name}:${file.size}:${file.lastModified}`;
+        }
+        
+        function addUploadRow(file) {
+            const row = document.createElement('div');
+            row.className = 'upload-row';
+            row.innerHTML = '<span class="upload-name"></span><progress value="0" max="1"></progress><span class="upload-status">Waiting</span>';
+            row.querySelector('.upload-name').textContent = file.name;
+            document.getElementById('uploadProgress').appendChild(row);
+            return row;
+        }
+        
+        function setUploadRow(row, status, done, total, state) {
+            row.querySelector('.upload-status').textContent = status;
+            if (total) {
+                row.querySelector('progress').max = total;
+                row.querySelector('progress').value = done;
+            }
+            if (state) row.classList.add(state);
+        }
+        
+        async function requestJson(url, options) {
+            const response = await fetch(url, options);
+            const data = await response.json().catch(() => ({}));
+            if (!response.ok) {
+                const error = new Error(data.message || `HTTP ${response.status}`);
+                error.retryable = response.status >= 500;
+                throw error;
+            }
+            return data;
+        }
+        
+        async function sendChunk(uploadId, index, blob) {
+            for (let attempt = 1; ; attempt++) {
+                try {
+                    return await requestJson(`/admin/uploads/${uploadId}/chunks/${index}`, {
+                        method: 'PUT',
+                        headers: { 'Content-Type': 'application/octet-stream' },
+                        body: blob
+                    });
+                } catch (error) {
+                    // Network errors have no status and are always worth another try
+                    if (error.retryable === false || attempt >= CHUNK_ATTEMPTS) throw error;
+                    await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt));
+                }
+            }
+        }
+        
+        async function uploadFile(file, fields, number, row) {
+            const key = uploadKey(file);
+            let state = null;
+            const savedId = localStorage.getItem(key);
+            if (savedId) {
+                state = await requestJson(`/admin/uploads/${savedId}`).catch(() => null);
+            }
+            if (!state) {
+                state = await requestJson('/admin/uploads', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ ...fields, number, filename: file.name, size: file.size })
+                });
+                state.received = [];
+                localStorage.setItem(key, state.upload_id);
+            }
+            
+            if (!state.image_id) {
+                const received = new Set(state.received);
+                let done = received.size;
+                setUploadRow(row, done ? 'Resuming' : 'Uploading', done, state.chunk_count);
+                for (let index = 0; index < state.chunk_count; index++) {
+                    if (received.has(index)) continue;
+                    const start = index * state.chunk_size;
+                    await sendChunk(state.upload_id, index, file.slice(start, start + state.chunk_size));
+                    setUploadRow(row, 'Uploading', ++done, state.chunk_count);
+                }
+                setUploadRow(row, 'Saving', done, state.chunk_count);
+                await requestJson(`/admin/uploads/${state.upload_id}/complete`, { method: 'POST' });
+            }
+            localStorage.removeItem(key);
+            setUploadRow(row, 'Uploaded', 1, 1, 'done');
+        }
+        
+        async function startChunkedUpload(event) {
+            const form = event.target;
+            const files = Array.from(form.querySelector('#image').files);
+            if (!window.fetch || !window.Blob || !Blob.prototype.slice || !files.length) return;  // Plain form post
+            event.preventDefault();
+            
+            const fields = {
+                title: form.querySelector('#title').value.trim(),
+                description: form.querySelector('#description').value,
+                categories: Array.from(form.querySelectorAll('input[name="categories"]:checked')).map(cb => cb.value)
+            };
+            if (!fields.categories.length) {
+                alert('Please select at least one category');
+                return;
+            }
+            
+            const button = document.getElementById('uploadBtn');
+            button.disabled = true;
+            document.getElementById('uploadProgress').innerHTML = '';
+            const rows = files.map(addUploadRow);
+            let next = 0;
+            let failed = 0;
+            
+            async function worker() {
+                while (next < files.length) {
+                    const i = next++;
+                    try {
+                        await uploadFile(files[i], fields, files.length > 1 ? i + 1 : null, rows[i]);
+                    } catch (error) {
+                        failed++;
+                        setUploadRow(rows[i], `Failed: ${error.message}`, 0, 0, 'failed');
+                    }
+                }
+            }
+            await Promise.all(Array.from({ length: Math.min(UPLOAD_CONCURRENCY, files.length) }, worker));
+            
+            button.disabled = false;
+            if (!failed) {
+                const message = files.length > 1 ? `${files.length} image(s) uploaded successfully!` : 'Image uploaded successfully!';
+                window.location = '/admin/dashboard?message=' + encodeURIComponent(message) + '&message_type=success';
+            } else {
+                button.textContent = 'Resume Upload';
+            }
+        }
+        
+        document.getElementById('uploadForm').addEventListener('submit', startChunkedUpload);
+        
         function selectAll() {
             const checkboxes = document.querySelectorAll('.portfolio-checkbox');
             checkboxes.forEach(cb => cb.checked = true);
@@ -1193,8 +1619,8 @@ def upload_about_image():
             filepath = os.path.join(PHOTOGRAPHY_ASSETS_DIR, filename)
             print(f"🔍 DEBUG: Saving to: {filepath}")
             
-            # Save file
-            file.save(filepath)
+            # Stream to the volume and rename into place
+            save_upload(file, filepath)
             print(f"🔍 DEBUG: File saved successfully")
             
             # Replace the about-minds-eye image (like Featured Image does)
@@ -1308,6 +1734,84 @@ def save_about_images(images):
     with open(about_images_file, 'w') as f:
         json.dump(images, f, indent=2)
 
+# Near-duplicate review template (groups of visually similar images)
+NEAR_DUPLICATES_TEMPLATE = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Near Duplicates</title>
+    <style>
+        body { font-family: Arial, sans-serif; background: #000; color: #fff; margin: 0; padding: 20px; }
+        .header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 30px; padding-bottom: 20px; border-bottom: 2px solid #333; }
+        h1 { color: #ff6b35; margin: 0; }
+        .back-btn { background: #666; color: #fff; padding: 10px 20px; text-decoration: none; border-radius: 5px; }
+        .btn { background: #ff6b35; color: #fff; padding: 8px 16px; border: none; border-radius: 5px; cursor: pointer; }
+        .message { padding: 15px; margin-bottom: 20px; border-radius: 5px; }
+        .message.success { background: #4CAF50; }
+        .message.error { background: #f44336; }
+        .message.info { background: #2196F3; }
+        .controls { display: flex; gap: 20px; align-items: center; margin-bottom: 20px; color: #ccc; }
+        .controls input { width: 60px; padding: 6px; background: #333; border: 1px solid #555; color: #fff; border-radius: 4px; }
+        .cluster { background: #1a1a1a; border: 1px solid #333; border-radius: 8px; padding: 15px; margin-bottom: 20px; }
+        .cluster h3 { color: #ff6b35; margin: 0 0 10px 0; font-size: 16px; }
+        .cluster-images { display: flex; gap: 15px; flex-wrap: wrap; }
+        .cluster-image { width: 220px; font-size: 13px; color: #ccc; }
+        .cluster-image img { width: 220px; height: 160px; object-fit: cover; border-radius: 4px; }
+        .delete-btn { background: #f44336; color: #fff; border: none; padding: 5px 10px; border-radius: 4px; cursor: pointer; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🔍 Near Duplicates</h1>
+        <a href="/admin/dashboard" class="back-btn">← Back to Dashboard</a>
+    </div>
+    
+    {% if message %}
+    <div class="message {{ message_type }}">{{ message }}</div>
+    {% endif %}
+    
+    <div class="controls">
+        <form method="GET" action="/admin/near-duplicates">
+            Max differing bits (of 64):
+            <input type="number" name="distance" min="0" max="32" value="{{ max_distance }}">
+            <button type="submit" class="btn">Rescan</button>
+        </form>
+        {% if unhashed %}
+        <form method="POST" action="/admin/near-duplicates/hash-missing">
+            {{ unhashed }} image(s) not hashed yet
+            <button type="submit" class="btn">Hash Them</button>
+        </form>
+        {% endif %}
+    </div>
+    
+    {% if not clusters %}
+    <p>No near-duplicates found within {{ max_distance }} bit(s).</p>
+    {% endif %}
+    
+    {% for cluster in clusters %}
+    <div class="cluster">
+        <h3>{{ cluster.images|length }} similar images (up to {{ cluster.max_distance }} bit(s) apart)</h3>
+        <div class="cluster-images">
+            {% for image in cluster.images %}
+            <div class="cluster-image">
+                <img src="/derivatives/320/{{ image.filename }}" alt="{{ image.title }}" loading="lazy">
+                <div><strong>{{ image.title }}</strong></div>
+                <div>{{ image.filename }}</div>
+                <div>{{ image.width }}×{{ image.height }}, {{ ((image.file_size or 0) / 1024)|round|int }} KB</div>
+                <div>{{ image.upload_date.strftime('%Y-%m-%d') if image.upload_date else '' }}</div>
+                <form method="POST" action="/admin/delete" style="margin-top: 5px;">
+                    <input type="hidden" name="image_id" value="{{ image.id }}">
+                    <button type="submit" class="delete-btn" onclick="return confirm('Delete this image?')">Delete</button>
+                </form>
+            </div>
+            {% endfor %}
+        </div>
+    </div>
+    {% endfor %}
+</body>
+</html>
+'''
+
 # About Management Template
 ABOUT_MANAGEMENT_TEMPLATE = '''
 <!DOCTYPE html>
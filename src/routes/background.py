@@ -11,6 +11,7 @@ import uuid
 from ..config import PHOTOGRAPHY_ASSETS_DIR, PORTFOLIO_DATA_FILE, LEGACY_ASSETS_DIR
 
 background_bp = Blueprint('background', __name__)
+background_admin_bp = Blueprint('background_admin', __name__)  # Registered only with ENABLE_ADMIN_ROUTES
 
 # Configuration
 BACKGROUND_CONFIG_FILE = os.path.join(os.path.dirname(__file__), '..', 'static', 'assets', 'background-config.json')
@@ -52,17 +53,15 @@ def set_background_image(filename):
 def load_portfolio_data():
     """Load portfolio data from SQL database - EXACT SAME AS ADMIN DASHBOARD"""
     try:
-        from ..models import Image, Category
+        from ..portfolio_queries import load_portfolio_images, category_names
         
-        # Get all images from database - sorted by capture date newest to oldest
-        images = Image.query.order_by(
-            Image.upload_date.desc()
-        ).all()
+        # Get all images from database - sorted by upload date newest to oldest
+        images = load_portfolio_images(include_about=True, newest_first=True)
         portfolio_data = []
         
         for image in images:
-            # Get categories for this image
-            image_categories = [cat.category.name for cat in image.categories]
+            # Categories come preloaded with the images
+            image_categories = category_names(image)
             
             portfolio_data.append({
                 'id': image.id,
@@ -78,7 +77,7 @@ def load_portfolio_data():
         print(f"Error loading portfolio data from SQL: {e}")
     return []
 
-@background_bp.route('/admin/background')
+@background_admin_bp.route('/admin/background')
 def background_manager():
     """Enhanced background management page with portfolio selection"""
     if not session.get('admin_logged_in'):
@@ -226,7 +225,7 @@ def background_manager():
         
         <div class="current-bg">
             <h2>Current Background</h2>
-            <img src="/static/assets/{{ current_bg }}" alt="Current Background">
+            <img src="/derivatives/640/{{ current_bg }}" alt="Current Background">
             <p><strong>File:</strong> {{ current_bg }}</p>
         </div>
         
@@ -252,7 +251,7 @@ def background_manager():
                     {% if item.image == current_bg %}
                     <div class="current-indicator">CURRENT</div>
                     {% endif %}
-                    <img src="/static/assets/{{ item.image }}" alt="{{ item.title }}">
+                    <img src="/derivatives/320/{{ item.image }}" alt="{{ item.title }}" loading="lazy">
                     <div class="info">
                         <h4>{{ item.title }}</h4>
                         <div class="categories">{{ item.get('categories', [item.get('category', 'Unknown')]) | join(', ') }}</div>
@@ -274,7 +273,7 @@ def background_manager():
     
     return render_template_string(html, current_bg=current_bg, portfolio_data=portfolio_data)
 
-@background_bp.route('/admin/background/upload', methods=['POST'])
+@background_admin_bp.route('/admin/background/upload', methods=['POST'])
 def upload_background():
     """Upload new background image"""
     if not session.get('admin_logged_in'):
@@ -284,7 +283,7 @@ def upload_background():
         background_file = request.files.get('background')
         
         if not background_file or not background_file.filename:
-            return redirect(url_for('background.background_manager'))
+            return redirect(url_for('background_admin.background_manager'))
         
         # Generate filename
         unique_id = str(uuid.uuid4())[:8]
@@ -297,12 +296,12 @@ def upload_background():
         # Update background config
         set_background_image(filename)
         
-        return redirect(url_for('background.background_manager'))
+        return redirect(url_for('background_admin.background_manager'))
         
     except Exception as e:
-        return redirect(url_for('background.background_manager'))
+        return redirect(url_for('background_admin.background_manager'))
 
-@background_bp.route('/admin/background/set-from-portfolio', methods=['POST'])
+@background_admin_bp.route('/admin/background/set-from-portfolio', methods=['POST'])
 def set_background_from_portfolio():
     """Set background image from portfolio selection - DATABASE VERSION"""
     if not session.get('admin_logged_in'):
@@ -312,7 +311,7 @@ def set_background_from_portfolio():
         image_filename = request.form.get('image_filename')
         
         if not image_filename:
-            return redirect(url_for('background.background_manager'))
+            return redirect(url_for('background_admin.background_manager'))
         
         # DATABASE UPDATE - Set background in SQL database
         from ..models import Image, db
@@ -329,11 +328,11 @@ def set_background_from_portfolio():
         else:
             print(f"❌ Image not found in database: {image_filename}")
         
-        return redirect(url_for('background.background_manager'))
+        return redirect(url_for('background_admin.background_manager'))
         
     except Exception as e:
         print(f"❌ Error setting background: {e}")
-        return redirect(url_for('background.background_manager'))
+        return redirect(url_for('background_admin.background_manager'))
 
 @background_bp.route('/api/background')
 def get_background_api():
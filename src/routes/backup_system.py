@@ -1,12 +1,11 @@
 from flask import Blueprint, jsonify, send_file, render_template_string, request, redirect, url_for, session
 import os
 import json
-import tarfile
 import shutil
-import subprocess
 from datetime import datetime
 from src.models import db, Image, Category, ImageCategory, SystemConfig
 from src.config import PHOTOGRAPHY_ASSETS_DIR
+from src.sqlite_tuning import snapshot
 import tempfile
 
 backup_system_bp = Blueprint('backup_system', __name__)
@@ -21,45 +20,31 @@ def emergency_backup_portal():
 def emergency_backup_download():
     """Emergency backup download - NO LOGIN REQUIRED"""
     try:
+        from src.backup_stream import archive_response, volume_entries  # tarfile only loads once a backup runs
+        
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_name = f"emergency_backup_{timestamp}"
         
-        # Create temporary directory for backup
-        with tempfile.TemporaryDirectory() as temp_dir:
-            backup_dir = os.path.join(temp_dir, backup_name)
-            os.makedirs(backup_dir)
-            
-            # Emergency backup - just essentials
-            # 1. Database file
-            db_file = os.path.join(PHOTOGRAPHY_ASSETS_DIR, 'mindseye.db')
-            if os.path.exists(db_file):
-                shutil.copy2(db_file, backup_dir)
-            
-            # 2. All images
-            if os.path.exists(PHOTOGRAPHY_ASSETS_DIR):
-                for file in os.listdir(PHOTOGRAPHY_ASSETS_DIR):
-                    file_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, file)
-                    if os.path.isfile(file_path) and not file.endswith('.db'):
-                        shutil.copy2(file_path, backup_dir)
-            
-            # 3. Emergency restore instructions
-            emergency_instructions = create_emergency_restore_instructions()
-            with open(os.path.join(backup_dir, 'EMERGENCY_RESTORE.txt'), 'w') as f:
-                f.write(emergency_instructions)
-            
-            # 4. Create TAR.GZ file
-            tar_path = os.path.join(temp_dir, f"{backup_name}.tar.gz")
-            with tarfile.open(tar_path, 'w:gz') as tar:
-                # Add each item in backup_dir individually to avoid path issues
-                for item in os.listdir(backup_dir):
-                    item_path = os.path.join(backup_dir, item)
-                    tar.add(item_path, arcname=item)
-            
-            # Return the TAR.GZ file for download
-            return send_file(tar_path, 
-                           as_attachment=True, 
-                           download_name=f"{backup_name}.tar.gz",
-                           mimetype='application/gzip')
+        # Emergency backup - just essentials, streamed straight from the volume
+        # 1. Database file
+        entries = []
+        db_file = os.path.join(PHOTOGRAPHY_ASSETS_DIR, 'mindseye.db')
+        snapshot_path = None
+        if os.path.exists(db_file):
+            snapshot_path = snapshot(db_file)  # Consistent copy - the live file may be mid-commit
+            entries.append(('mindseye.db', snapshot_path))
+        
+        # 2. All images
+        entries += [(name, path) for name, path in volume_entries(PHOTOGRAPHY_ASSETS_DIR) if not name.endswith('.db')]
+        
+        # 3. Emergency restore instructions
+        entries.append(('EMERGENCY_RESTORE.txt', create_emergency_restore_instructions().encode('utf-8')))
+        
+        # 4. Stream the TAR.GZ as it is compressed
+        response = archive_response(entries, f"{backup_name}.tar.gz")
+        if snapshot_path:
+            response.call_on_close(lambda: os.remove(snapshot_path))
+        return response
     
     except Exception as e:
         return f"Emergency backup failed: {str(e)}", 500
@@ -117,6 +102,8 @@ def create_manual_backup():
         
         # Sanitize filename
         import re
+        import subprocess
+        from src.backup_stream import archive_response, volume_entries, tree_entries
         custom_name = re.sub(r'[^\w\-_\.]', '_', custom_name)
         if not custom_name.endswith('.tar.gz'):
             if custom_name.endswith('.tar') or custom_name.endswith('.gz'):
@@ -124,88 +111,68 @@ def create_manual_backup():
             else:
                 custom_name = custom_name + '.tar.gz'
         
-        backup_name = custom_name.replace('.tar.gz', '')
+        # Temporary directory for the GitHub clone only - it is removed once the download has been sent
+        temp_dir = tempfile.mkdtemp()
+        cleanup = lambda: shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        # STEP 1: CLONE ACTUAL DEPLOYED SOURCE CODE FROM GITHUB
+        github_repo_path = os.path.join(temp_dir, 'github_source')
         
-        # Create temporary directory for backup
-        with tempfile.TemporaryDirectory() as temp_dir:
-            backup_dir = os.path.join(temp_dir, backup_name)
-            os.makedirs(backup_dir)
+        try:
+            # Clone with timeout and better error handling
+            result = subprocess.run([
+                'git', 'clone', 
+                'https://github.com/heur1konrc/minds-eye-recovery-repo.git', 
+                github_repo_path
+            ], check=True, capture_output=True, text=True, timeout=300)
             
-            # STEP 1: CLONE ACTUAL DEPLOYED SOURCE CODE FROM GITHUB
-            github_repo_path = os.path.join(temp_dir, 'github_source')
-            source_files_count = 0
+            # Verify clone was successful
+            if not os.path.exists(github_repo_path) or not os.path.exists(os.path.join(github_repo_path, '.git')):
+                raise Exception("GitHub repository clone verification failed")
             
-            try:
-                # Clone with timeout and better error handling
-                result = subprocess.run([
-                    'git', 'clone', 
-                    'https://github.com/heur1konrc/minds-eye-recovery-repo.git', 
-                    github_repo_path
-                ], check=True, capture_output=True, text=True, timeout=300)
-                
-                # Verify clone was successful
-                if not os.path.exists(github_repo_path) or not os.path.exists(os.path.join(github_repo_path, '.git')):
-                    raise Exception("GitHub repository clone verification failed")
-                
-                # Create source code directory in backup
-                source_backup_dir = os.path.join(backup_dir, 'DEPLOYED_SOURCE_CODE')
-                os.makedirs(source_backup_dir)
-                
-                # Copy all source code files (excluding .git)
-                for item in os.listdir(github_repo_path):
-                    if item != '.git':
-                        source_path = os.path.join(github_repo_path, item)
-                        dest_path = os.path.join(source_backup_dir, item)
+            # All source code files (excluding .git), read from the clone as the archive streams
+            source_entries = tree_entries(github_repo_path, prefix='DEPLOYED_SOURCE_CODE/',
+                                          ignore=('__pycache__', '*.pyc', 'node_modules', '.git'))
                         
-                        if os.path.isdir(source_path):
-                            shutil.copytree(source_path, dest_path, 
-                                          ignore=shutil.ignore_patterns('__pycache__', '*.pyc', 'node_modules', '.git'))
-                            for root, dirs, files in os.walk(dest_path):
-                                source_files_count += len(files)
-                        else:
-                            shutil.copy2(source_path, dest_path)
-                            source_files_count += 1
-                            
-            except subprocess.TimeoutExpired:
-                return redirect(url_for('backup_system.backup_system_dashboard') + 
-                              '?message=GitHub clone timeout - repository too large&message_type=error')
-            except subprocess.CalledProcessError as e:
-                error_msg = f"Git clone failed: {e.stderr if e.stderr else str(e)}"
-                return redirect(url_for('backup_system.backup_system_dashboard') + 
-                              f'?message={error_msg}&message_type=error')
-            except Exception as e:
-                return redirect(url_for('backup_system.backup_system_dashboard') + 
-                              f'?message=Source code backup failed: {str(e)}&message_type=error')
-            
+        except subprocess.TimeoutExpired:
+            cleanup()
+            return redirect(url_for('backup_system.backup_system_dashboard') + 
+                          '?message=GitHub clone timeout - repository too large&message_type=error')
+        except subprocess.CalledProcessError as e:
+            cleanup()
+            error_msg = f"Git clone failed: {e.stderr if e.stderr else str(e)}"
+            return redirect(url_for('backup_system.backup_system_dashboard') + 
+                          f'?message={error_msg}&message_type=error')
+        except Exception as e:
+            cleanup()
+            return redirect(url_for('backup_system.backup_system_dashboard') + 
+                          f'?message=Source code backup failed: {str(e)}&message_type=error')
+        
+        try:
             # STEP 2: BACKUP RAILWAY VOLUME DATA
             railway_data_dir = PHOTOGRAPHY_ASSETS_DIR  # This is /data
-            data_files_count = 0
+            data_entries = []
             
             if os.path.exists(railway_data_dir):
-                # Create Railway data directory in backup
-                data_backup_dir = os.path.join(backup_dir, 'RAILWAY_VOLUME_DATA')
-                os.makedirs(data_backup_dir)
-                
-                # Copy all files from Railway volume
-                for file in os.listdir(railway_data_dir):
-                    source_path = os.path.join(railway_data_dir, file)
-                    dest_path = os.path.join(data_backup_dir, file)
-                    
-                    if os.path.isfile(source_path):
-                        shutil.copy2(source_path, dest_path)
-                        data_files_count += 1
+                # All files on the Railway volume, the database as a consistent snapshot (removed with the clone)
+                data_entries = volume_entries(railway_data_dir, prefix='RAILWAY_VOLUME_DATA/')
+                database_file = os.path.join(railway_data_dir, 'mindseye.db')
+                if os.path.exists(database_file):
+                    database_snapshot = snapshot(database_file, os.path.join(temp_dir, 'mindseye.db'))
+                    data_entries = [(name, database_snapshot if path == database_file else path)
+                                    for name, path in data_entries]
             
             # STEP 3: CREATE BACKUP INFO
             backup_info = f"""
 🎯 COMPLETE DEPLOYED BACKUP CREATED: {datetime.now()}
 Backup Name: {custom_name}
 
-🚀 DEPLOYED SOURCE CODE: ✅ {source_files_count} files
+🚀 DEPLOYED SOURCE CODE: ✅ {len(source_entries)} files
    - FROM: GitHub Repository (heur1konrc/minds-eye-recovery-repo)
    - INCLUDES: Backend Python code, Frontend React code, Configuration files
    - THIS IS THE ACTUAL DEPLOYED SOURCE CODE
 
-🚂 RAILWAY VOLUME DATA: ✅ {data_files_count} files
+🚂 RAILWAY VOLUME DATA: ✅ {len(data_entries)} files
    - FROM: Railway Volume ({railway_data_dir})
    - INCLUDES: Database (mindseye.db) and all images
    - THIS IS THE ACTUAL DEPLOYED DATA
@@ -213,45 +180,16 @@ Backup Name: {custom_name}
 This backup contains the REAL deployed application:
 - Source code that Railway deploys from GitHub
 - Data that Railway stores in the volume
-            """
+                """
             
-            with open(os.path.join(backup_dir, 'DEPLOYED_BACKUP_INFO.txt'), 'w') as f:
-                f.write(backup_info)
-            
-            # STEP 4: CREATE TAR.GZ FILE WITH BETTER ERROR HANDLING
-            tar_path = os.path.join(temp_dir, custom_name)
-            
-            try:
-                # Create tar file with compression
-                with tarfile.open(tar_path, 'w:gz', compresslevel=6) as tar:
-                    # Add source code directory
-                    if os.path.exists(os.path.join(backup_dir, 'DEPLOYED_SOURCE_CODE')):
-                        tar.add(os.path.join(backup_dir, 'DEPLOYED_SOURCE_CODE'), 
-                               arcname='DEPLOYED_SOURCE_CODE')
-                    
-                    # Add Railway data directory  
-                    if os.path.exists(os.path.join(backup_dir, 'RAILWAY_VOLUME_DATA')):
-                        tar.add(os.path.join(backup_dir, 'RAILWAY_VOLUME_DATA'), 
-                               arcname='RAILWAY_VOLUME_DATA')
-                    
-                    # Add backup info file
-                    if os.path.exists(os.path.join(backup_dir, 'DEPLOYED_BACKUP_INFO.txt')):
-                        tar.add(os.path.join(backup_dir, 'DEPLOYED_BACKUP_INFO.txt'), 
-                               arcname='DEPLOYED_BACKUP_INFO.txt')
-                
-                # Verify tar file was created successfully
-                if not os.path.exists(tar_path) or os.path.getsize(tar_path) == 0:
-                    raise Exception("Tar file creation failed or file is empty")
-                
-                # Return the backup file for download
-                from flask import send_file
-                return send_file(tar_path, 
-                               as_attachment=True, 
-                               download_name=custom_name,
-                               mimetype='application/gzip')
-                               
-            except Exception as tar_error:
-                raise Exception(f"Tar file creation failed: {str(tar_error)}")
+            # STEP 4: STREAM THE TAR.GZ - compressed and sent as it is read, nothing staged on disk
+            entries = source_entries + data_entries + [('DEPLOYED_BACKUP_INFO.txt', backup_info.encode('utf-8'))]
+            response = archive_response(entries, custom_name, compresslevel=6)
+            response.call_on_close(cleanup)
+            return response
+        except Exception:
+            cleanup()
+            raise
     
     except Exception as e:
         return redirect(url_for('backup_system.backup_system_dashboard') + 
@@ -260,6 +198,8 @@ This backup contains the REAL deployed application:
 def github_backup_push():
     """Push current state to GitHub with backup tag"""
     try:
+        import subprocess
+        
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         tag_name = f"backup-{timestamp}"
         
@@ -3,6 +3,7 @@ import json
 from flask import Blueprint, request, render_template_string, redirect, url_for, session, jsonify
 
 category_mgmt_bp = Blueprint('category_mgmt', __name__)
+category_mgmt_admin_bp = Blueprint('category_mgmt_admin', __name__)  # Registered only with ENABLE_ADMIN_ROUTES
 
 # File paths
 PORTFOLIO_DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'static', 'assets', 'portfolio-data-multicategory.json')
@@ -82,7 +83,7 @@ def get_category_usage():
     
     return usage
 
-@category_mgmt_bp.route('/admin/category-management')
+@category_mgmt_admin_bp.route('/admin/category-management')
 def category_management():
     """Category management admin interface"""
     if not session.get('admin_logged_in'):
@@ -485,7 +486,7 @@ def category_management():
                                 message=request.args.get('message'),
                                 message_type=request.args.get('message_type', 'success'))
 
-@category_mgmt_bp.route('/admin/category-management/add', methods=['POST'])
+@category_mgmt_admin_bp.route('/admin/category-management/add', methods=['POST'])
 def add_category():
     """Add a new category"""
     if not session.get('admin_logged_in'):
@@ -503,7 +504,7 @@ def add_category():
         
         if not category_name:
             print("Error: Category name is empty")
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message='Category name is required', 
                                   message_type='error'))
         
@@ -511,7 +512,7 @@ def add_category():
         existing_category = Category.query.filter_by(name=category_name).first()
         if existing_category:
             print(f"Error: Category '{category_name}' already exists")
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message=f'Category "{category_name}" already exists', 
                                   message_type='error'))
         
@@ -526,7 +527,7 @@ def add_category():
         db.session.commit()
         
         print(f"Category '{category_name}' added successfully to database")
-        return redirect(url_for('category_mgmt.category_management', 
+        return redirect(url_for('category_mgmt_admin.category_management', 
                               message=f'Category "{category_name}" added successfully', 
                               message_type='success'))
             
@@ -535,11 +536,11 @@ def add_category():
         print(f"Add category error: {e}")
         import traceback
         traceback.print_exc()
-        return redirect(url_for('category_mgmt.category_management', 
+        return redirect(url_for('category_mgmt_admin.category_management', 
                               message=f'Server error: {str(e)}', 
                               message_type='error'))
 
-@category_mgmt_bp.route('/admin/category-management/rename', methods=['POST'])
+@category_mgmt_admin_bp.route('/admin/category-management/rename', methods=['POST'])
 def rename_category():
     """Rename an existing category"""
     if not session.get('admin_logged_in'):
@@ -552,26 +553,26 @@ def rename_category():
         new_name = request.form.get('new_name', '').strip()
         
         if not old_name or not new_name:
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message='Both old and new category names are required', 
                                   message_type='error'))
         
         if old_name == new_name:
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message='New name must be different from old name', 
                                   message_type='error'))
         
         # Find the category in database
         category = Category.query.filter_by(name=old_name).first()
         if not category:
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message=f'Category "{old_name}" not found', 
                                   message_type='error'))
         
         # Check if new name already exists
         existing_category = Category.query.filter_by(name=new_name).first()
         if existing_category:
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message=f'Category "{new_name}" already exists', 
                                   message_type='error'))
         
@@ -579,18 +580,18 @@ def rename_category():
         category.name = new_name
         db.session.commit()
         
-        return redirect(url_for('category_mgmt.category_management', 
+        return redirect(url_for('category_mgmt_admin.category_management', 
                               message=f'Category renamed from "{old_name}" to "{new_name}"', 
                               message_type='success'))
             
     except Exception as e:
         db.session.rollback()
         print(f"Rename category error: {e}")
-        return redirect(url_for('category_mgmt.category_management', 
+        return redirect(url_for('category_mgmt_admin.category_management', 
                               message='Server error occurred', 
                               message_type='error'))
 
-@category_mgmt_bp.route('/admin/category-management/delete', methods=['POST'])
+@category_mgmt_admin_bp.route('/admin/category-management/delete', methods=['POST'])
 def delete_category():
     """Delete a category"""
     if not session.get('admin_logged_in'):
@@ -630,7 +631,7 @@ def delete_category():
         print(f"Delete category error: {e}")
         return jsonify({'success': False, 'message': 'Server error occurred'})
 
-@category_mgmt_bp.route('/admin/category-management/set-default', methods=['POST'])
+@category_mgmt_admin_bp.route('/admin/category-management/set-default', methods=['POST'])
 def set_default_category():
     """Set the default category"""
     if not session.get('admin_logged_in'):
@@ -651,7 +652,7 @@ def set_default_category():
             if request.is_json:
                 return jsonify({'success': False, 'message': message})
             else:
-                return redirect(url_for('category_mgmt.category_management', 
+                return redirect(url_for('category_mgmt_admin.category_management', 
                                       message=message, message_type='error'))
         
         config = load_categories_config()
@@ -662,7 +663,7 @@ def set_default_category():
             if request.is_json:
                 return jsonify({'success': False, 'message': message})
             else:
-                return redirect(url_for('category_mgmt.category_management', 
+                return redirect(url_for('category_mgmt_admin.category_management', 
                                       message=message, message_type='error'))
         
         config['default_category'] = category_name
@@ -672,14 +673,14 @@ def set_default_category():
             if request.is_json:
                 return jsonify({'success': True, 'message': message})
             else:
-                return redirect(url_for('category_mgmt.category_management', 
+                return redirect(url_for('category_mgmt_admin.category_management', 
                                       message=message, message_type='success'))
         else:
             message = 'Failed to save default category'
             if request.is_json:
                 return jsonify({'success': False, 'message': message})
             else:
-                return redirect(url_for('category_mgmt.category_management', 
+                return redirect(url_for('category_mgmt_admin.category_management', 
                                       message=message, message_type='error'))
             
     except Exception as e:
@@ -688,7 +689,7 @@ def set_default_category():
         if request.is_json:
             return jsonify({'success': False, 'message': message})
         else:
-            return redirect(url_for('category_mgmt.category_management', 
+            return redirect(url_for('category_mgmt_admin.category_management', 
                                   message=message, message_type='error'))
 
 @category_mgmt_bp.route('/api/categories-config')
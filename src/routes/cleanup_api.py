@@ -4,7 +4,7 @@ API endpoint to trigger database cleanup and optimization
 
 import re
 from flask import Blueprint, jsonify
-from ..models import db, Image
+from ..models import db, Image, ensure_indexes
 
 cleanup_bp = Blueprint('cleanup', __name__)
 
@@ -39,12 +39,11 @@ def cleanup_database():
         # Commit changes
         db.session.commit()
         
-        # Add database indexes for better performance (if they don't exist)
+        # Add database indexes for better performance (if they don't exist) and refresh planner statistics
         try:
-            db.engine.execute('CREATE INDEX IF NOT EXISTS idx_image_title ON image(title)')
-            db.engine.execute('CREATE INDEX IF NOT EXISTS idx_image_upload_date ON image(upload_date)')
-            db.engine.execute('CREATE INDEX IF NOT EXISTS idx_image_category_image_id ON image_category(image_id)')
-            db.engine.execute('CREATE INDEX IF NOT EXISTS idx_image_category_category_id ON image_category(category_id)')
+            ensure_indexes()
+            with db.engine.connect() as conn:
+                conn.execute(db.text('PRAGMA optimize'))
             optimized = True
         except Exception as e:
             print(f'Index optimization note: {e}')
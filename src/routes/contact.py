@@ -1,7 +1,4 @@
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 import logging
@@ -55,6 +52,11 @@ Reply directly to this email to respond to the client.
         
         # Send email using Google Workspace SMTP
         try:
+            # Imported on first use - the mail stack isn't needed to boot the site
+            import smtplib
+            from email.mime.text import MIMEText
+            from email.mime.multipart import MIMEMultipart
+            
             # Google SMTP configuration
             smtp_server = "smtp.gmail.com"
             smtp_port = 587
@@ -0,0 +1,403 @@
+"""
+Debug and recovery routes for Mind's Eye Photography
+Database and volume inspection, one-off initialization and upload tests used
+while getting deployments working. Registered only when ENABLE_DEBUG_ROUTES is on.
+"""
+import os
+import json
+from flask import Blueprint, request, jsonify
+from src.models import db, Image, Category, init_default_categories, init_system_config
+from src.sqlite_tuning import current_settings
+from src.jobs import enqueue
+
+debug_bp = Blueprint('debug', __name__)
+
+@debug_bp.route('/debug/database-info')
+def debug_database_info():
+    """Debug route to check database content"""
+    try:
+        from src.routes.admin import load_portfolio_data
+        portfolio_data = load_portfolio_data()
+        
+        info = {
+            'portfolio_count': len(portfolio_data),
+            'portfolio_items': portfolio_data[:5],  # First 5 items
+            'sample_image_paths': [item.get('image', 'NO_IMAGE') for item in portfolio_data[:10]]
+        }
+        with db.engine.connect() as conn:
+            info['sqlite_settings'] = current_settings(conn)
+        
+        return f"<pre>{json.dumps(info, indent=2)}</pre>"
+    except Exception as e:
+        return f"<pre>Database error: {str(e)}</pre>"
+
+@debug_bp.route('/debug/volume-info')
+def debug_volume_info():
+    """Debug route to check volume path detection"""
+    import os
+    from src.config import PHOTOGRAPHY_ASSETS_DIR
+    
+    info = {
+        'PHOTOGRAPHY_ASSETS_DIR': PHOTOGRAPHY_ASSETS_DIR,
+        'RAILWAY_VOLUME_MOUNT_PATH': os.environ.get('RAILWAY_VOLUME_MOUNT_PATH'),
+        'directory_exists': os.path.exists(PHOTOGRAPHY_ASSETS_DIR),
+        'directory_contents': [],
+        'environment_vars': {k: v for k, v in os.environ.items() if 'RAILWAY' in k or 'VOLUME' in k}
+    }
+    
+    try:
+        if os.path.exists(PHOTOGRAPHY_ASSETS_DIR):
+            info['directory_contents'] = os.listdir(PHOTOGRAPHY_ASSETS_DIR)[:10]  # First 10 files
+    except Exception as e:
+        info['directory_error'] = str(e)
+    
+    return f"<pre>{json.dumps(info, indent=2)}</pre>"
+
+@debug_bp.route('/api/debug-query')
+def debug_query():
+    """Debug API to understand database query differences"""
+    try:
+        from src.models import Image, Category, ImageCategory, db
+        
+        debug_info = {
+            'step1_import_success': True,
+            'step2_image_count_query': None,
+            'step3_image_count_session': None,
+            'step4_first_image': None,
+            'step5_categories_count': None,
+            'step6_sample_images': []
+        }
+        
+        # Step 2: Try Image.query.count()
+        try:
+            debug_info['step2_image_count_query'] = Image.query.count()
+        except Exception as e:
+            debug_info['step2_image_count_query'] = f"Error: {e}"
+        
+        # Step 3: Try db.session.query(Image).count()
+        try:
+            debug_info['step3_image_count_session'] = db.session.query(Image).count()
+        except Exception as e:
+            debug_info['step3_image_count_session'] = f"Error: {e}"
+        
+        # Step 4: Try to get first image
+        try:
+            first_image = Image.query.first()
+            if first_image:
+                debug_info['step4_first_image'] = {
+                    'id': str(first_image.id),
+                    'filename': first_image.filename,
+                    'title': first_image.title
+                }
+            else:
+                debug_info['step4_first_image'] = "No images found"
+        except Exception as e:
+            debug_info['step4_first_image'] = f"Error: {e}"
+        
+        # Step 5: Check categories
+        try:
+            debug_info['step5_categories_count'] = Category.query.count()
+        except Exception as e:
+            debug_info['step5_categories_count'] = f"Error: {e}"
+        
+        # Step 6: Try to get sample images
+        try:
+            sample_images = Image.query.limit(3).all()
+            for img in sample_images:
+                debug_info['step6_sample_images'].append({
+                    'id': str(img.id),
+                    'filename': img.filename,
+                    'title': img.title
+                })
+        except Exception as e:
+            debug_info['step6_sample_images'] = f"Error: {e}"
+        
+        return jsonify(debug_info)
+        
+    except Exception as e:
+        return jsonify({'error': str(e), 'traceback': str(e)}), 500
+
+@debug_bp.route('/api/debug-db')
+def debug_database():
+    """Debug endpoint to test database connection step by step"""
+    debug_info = []
+    
+    try:
+        debug_info.append("Step 1: Starting debug")
+        
+        # Test database connection
+        from src.models import db
+        debug_info.append("Step 2: Imported db")
+        
+        # Test Image model import
+        from src.models import Image
+        debug_info.append("Step 3: Imported Image model")
+        
+        # Test basic query
+        image_count = Image.query.count()
+        debug_info.append(f"Step 4: Image count = {image_count}")
+        
+        # Test getting first image
+        first_image = Image.query.first()
+        if first_image:
+            debug_info.append(f"Step 5: First image = {first_image.filename}")
+        else:
+            debug_info.append("Step 5: No images found")
+        
+        # Test getting all images
+        all_images = Image.query.all()
+        debug_info.append(f"Step 6: Total images retrieved = {len(all_images)}")
+        
+        if all_images:
+            debug_info.append(f"Step 7: Sample filenames = {[img.filename for img in all_images[:3]]}")
+        
+        return jsonify({
+            'status': 'success',
+            'debug_steps': debug_info,
+            'image_count': image_count
+        })
+        
+    except Exception as e:
+        debug_info.append(f"ERROR: {str(e)}")
+        import traceback
+        debug_info.append(f"TRACEBACK: {traceback.format_exc()}")
+        
+        return jsonify({
+            'status': 'error',
+            'debug_steps': debug_info,
+            'error': str(e)
+        }), 500
+
+# DIAGNOSTIC TEST ROUTE
+@debug_bp.route('/flask-test-12345')
+def flask_diagnostic():
+    """Test if Flask is running at all"""
+    return "FLASK IS WORKING! If you see this, Flask routes work but /about is being hijacked by React routing."
+
+@debug_bp.route("/api/database-inspect")
+def database_inspect():
+    """Inspect what is actually in the database"""
+    try:
+        result = {
+            "images_table": [],
+            "about_images_table": [],
+            "image_count": 0,
+            "about_image_count": 0,
+            "categories_count": 0
+        }
+        
+        # Check categories
+        categories = Category.query.all()
+        result["categories_count"] = len(categories)
+        result["categories"] = [cat.name for cat in categories]
+        
+        # Check main images table
+        images = Image.query.all()
+        result["image_count"] = len(images)
+        for img in images:
+            result["images_table"].append({
+                "id": img.id,
+                "filename": img.filename,
+                "title": img.title,
+                "description": img.description
+            })
+        
+        # Check about images table  
+        try:
+            from src.models import AboutImage
+            about_images = AboutImage.query.all()
+            result["about_image_count"] = len(about_images)
+            for img in about_images:
+                result["about_images_table"].append({
+                    "id": img.id,
+                    "filename": img.filename,
+                    "title": img.title,
+                    "description": img.description
+                })
+        except:
+            result["about_images_table"] = ["AboutImage table not found"]
+        
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@debug_bp.route("/api/init-database")
+def init_database():
+    """Manually initialize database with default categories"""
+    try:
+        # Force initialize categories
+        init_default_categories()
+        
+        # Force initialize system config
+        init_system_config()
+        
+        return jsonify({
+            "success": True,
+            "message": "Database initialized successfully",
+            "categories_count": Category.query.count()
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@debug_bp.route("/api/test-upload-path")
+def test_upload_path():
+    """Test if upload path is accessible"""
+    try:
+        import os
+        from src.config import PHOTOGRAPHY_ASSETS_DIR
+        
+        result = {
+            "photography_assets_dir": PHOTOGRAPHY_ASSETS_DIR,
+            "path_exists": os.path.exists(PHOTOGRAPHY_ASSETS_DIR),
+            "is_writable": False,
+            "can_create_dir": False
+        }
+        
+        # Test if we can create the directory
+        try:
+            os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
+            result["can_create_dir"] = True
+        except Exception as e:
+            result["create_dir_error"] = str(e)
+        
+        # Test if we can write to it
+        try:
+            test_file = os.path.join(PHOTOGRAPHY_ASSETS_DIR, "test.txt")
+            with open(test_file, "w") as f:
+                f.write("test")
+            os.remove(test_file)
+            result["is_writable"] = True
+        except Exception as e:
+            result["write_error"] = str(e)
+        
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@debug_bp.route("/api/test-minimal-upload", methods=['POST'])
+def test_minimal_upload():
+    """Minimal upload test to isolate the issue"""
+    try:
+        import os
+        import uuid
+        from werkzeug.utils import secure_filename
+        from src.config import PHOTOGRAPHY_ASSETS_DIR
+        from src.models import db, Image, Category
+        from datetime import datetime
+        
+        # Get a test file
+        image_files = request.files.getlist('image')
+        if not image_files or not image_files[0].filename:
+            return jsonify({"error": "No file provided"}), 400
+        
+        image_file = image_files[0]
+        
+        # Generate filename
+        unique_id = str(uuid.uuid4())[:8]
+        filename = f"test-{unique_id}.jpg"
+        
+        # Save file
+        os.makedirs(PHOTOGRAPHY_ASSETS_DIR, exist_ok=True)
+        final_path = os.path.join(PHOTOGRAPHY_ASSETS_DIR, filename)
+        image_file.save(final_path)
+        
+        # Get file size
+        file_size = os.path.getsize(final_path)
+        
+        # Create database entry
+        new_image = Image(
+            filename=filename,
+            title="Test Image",
+            description="Test upload",
+            file_size=file_size,
+            width=None,
+            height=None,
+            upload_date=datetime.now()
+        )
+        
+        db.session.add(new_image)
+        db.session.flush()
+        enqueue('hash', new_image.id)  # Fingerprinted URLs once the hash job has run
+        db.session.commit()
+        
+        return jsonify({
+            "success": True,
+            "filename": filename,
+            "file_size": file_size,
+            "image_id": new_image.id
+        })
+        
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        return jsonify({
+            "error": str(e),
+            "traceback": error_details
+        }), 500
+
+
+@debug_bp.route('/debug/data-contents')
+def show_data_contents():
+    """Show all contents of /data directory"""
+    import os
+    import json
+    from datetime import datetime
+    
+    data_dir = '/data'
+    result = {
+        'directory': data_dir,
+        'exists': os.path.exists(data_dir),
+        'files': [],
+        'total_files': 0,
+        'checked_at': datetime.now().isoformat()
+    }
+    
+    if os.path.exists(data_dir):
+        try:
+            all_files = os.listdir(data_dir)
+            result['total_files'] = len(all_files)
+            
+            for filename in sorted(all_files):
+                filepath = os.path.join(data_dir, filename)
+                file_info = {
+                    'name': filename,
+                    'size': os.path.getsize(filepath) if os.path.isfile(filepath) else 0,
+                    'is_file': os.path.isfile(filepath),
+                    'is_dir': os.path.isdir(filepath)
+                }
+                
+                # If it's a JSON file, try to read its contents
+                if filename.endswith('.json') and os.path.isfile(filepath):
+                    try:
+                        with open(filepath, 'r') as f:
+                            file_info['json_content'] = json.load(f)
+                    except:
+                        file_info['json_content'] = 'Error reading JSON'
+                
+                result['files'].append(file_info)
+                
+        except Exception as e:
+            result['error'] = str(e)
+    
+    return f"<pre>{json.dumps(result, indent=2)}</pre>"
+@debug_bp.route('/set-about-image/<filename>')
+def set_about_image_direct(filename):
+    """Direct endpoint to set About page image from existing file"""
+    try:
+        import json
+        data_dir = '/data'
+        about_image_file = os.path.join(data_dir, 'about_minds_eye_image.json')
+        
+        # Check if the image file exists
+        image_path = os.path.join(data_dir, filename)
+        if not os.path.exists(image_path):
+            return f"Image {filename} not found in /data directory"
+        
+        # Update the about image JSON
+        image_data = {"filename": filename}
+        with open(about_image_file, 'w') as f:
+            json.dump(image_data, f, indent=2)
+        
+        return f"✅ Set About page image to: {filename}"
+    except Exception as e:
+        return f"Error: {str(e)}"
@@ -352,7 +352,7 @@ def slideshow_background_manager():
             <div class="preview-section">
                 <div class="preview-container">
                     {% for bg in slideshow_backgrounds %}
-                    <img src="/assets/{{ bg.image.filename }}" alt="{{ bg.image.title }}" 
+                    <img src="/derivatives/640/{{ bg.image.filename }}" alt="{{ bg.image.title }}" 
                          class="preview-image {% if loop.first %}active{% endif %}">
                     {% endfor %}
                 </div>
@@ -372,7 +372,7 @@ def slideshow_background_manager():
                 {% for bg in slideshow_backgrounds %}
                 <div class="slideshow-item">
                     <div class="order">{{ bg.display_order }}</div>
-                    <img src="/assets/{{ bg.image.filename }}" alt="{{ bg.image.title }}">
+                    <img src="/derivatives/320/{{ bg.image.filename }}" alt="{{ bg.image.title }}">
                     <div class="info">
                         <h4>{{ bg.image.title }}</h4>
                         <button class="btn btn-danger" onclick="removeFromSlideshow({{ bg.id }})">
@@ -395,7 +395,7 @@ def slideshow_background_manager():
             <div class="portfolio-grid">
                 {% for image in portfolio_images %}
                 <div class="portfolio-item {% if image.id in slideshow_image_ids %}in-slideshow{% endif %}">
-                    <img src="/assets/{{ image.filename }}" alt="{{ image.title }}">
+                    <img src="/derivatives/320/{{ image.filename }}" alt="{{ image.title }}" loading="lazy">
                     <div class="info">
                         <h4>{{ image.title }}</h4>
                         {% if image.id not in slideshow_image_ids %}
@@ -1,25 +1,22 @@
 import os
 import json
 from flask import Blueprint, request, render_template_string, redirect, url_for, session, jsonify
-from PIL import Image as PILImage
-from PIL.ExifTags import TAGS
 from datetime import datetime
 from ..config import PHOTOGRAPHY_ASSETS_DIR, PORTFOLIO_DATA_FILE
+from ..exif import apply_exif, FEATURED_EXIF_FIELDS
 
 def load_portfolio_data():
     """Load portfolio data from SQL database - EXACT SAME AS ADMIN DASHBOARD"""
     try:
-        from ..models import Image, Category
+        from ..portfolio_queries import load_portfolio_images, category_names
         
-        # Get all images from database - sorted by capture date newest to oldest
-        images = Image.query.order_by(
-            Image.upload_date.desc()
-        ).all()
+        # Get all images from database - sorted by upload date newest to oldest
+        images = load_portfolio_images(include_about=True, newest_first=True)
         portfolio_data = []
         
         for image in images:
-            # Get categories for this image
-            image_categories = [cat.category.name for cat in image.categories]
+            # Categories come preloaded with the images
+            image_categories = category_names(image)
             
             portfolio_data.append({
                 'id': image.id,
@@ -35,7 +32,15 @@ def load_portfolio_data():
         print(f"Error loading portfolio data from SQL: {e}")
     return []
 
+def store_missing_exif(image):
+    """Read EXIF for an image uploaded before it was stored at upload time"""
+    try:
+        apply_exif(image, os.path.join(PHOTOGRAPHY_ASSETS_DIR, image.filename))
+    except Exception as e:
+        print(f"Error extracting EXIF data for {image.filename}: {e}")
+
 featured_bp = Blueprint('featured', __name__)
+featured_admin_bp = Blueprint('featured_admin', __name__)  # Registered only with ENABLE_ADMIN_ROUTES
 
 # File paths
 FEATURED_DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'static', 'assets', 'featured-image.json')
@@ -61,7 +66,7 @@ def load_featured_data():
                 'categories': image_categories,
                 'story': featured_image.featured_story or '',
                 'set_date': featured_image.upload_date.strftime('%Y-%m-%d %H:%M:%S') if featured_image.upload_date else 'Unknown',
-                'exif_data': {}  # Will be populated if needed
+                'exif_data': featured_image.exif_dict([f for f in FEATURED_EXIF_FIELDS if f != 'capture_date'])
             }
     except Exception as e:
         print(f"Error loading featured data from SQL: {e}")
@@ -80,6 +85,8 @@ def save_featured_data(image_id, story):
         if featured_image:
             featured_image.is_featured = True
             featured_image.featured_story = story
+            if not featured_image.exif_extracted:
+                store_missing_exif(featured_image)
             
             db.session.commit()
             return True
@@ -92,91 +99,13 @@ def save_featured_data(image_id, story):
         db.session.rollback()
         return False
 
-def extract_exif_data(image_path):
-    """Extract EXIF data from image"""
-    try:
-        with PILImage.open(image_path) as image:
-            exif_data = {}
-            
-            # Get basic EXIF data
-            exif = image._getexif()
-            if exif is not None:
-                for tag_id, value in exif.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    
-                    # Convert bytes to string if needed
-                    if isinstance(value, bytes):
-                        try:
-                            value = value.decode('utf-8')
-                        except:
-                            value = str(value)
-                    
-                    # Format common EXIF tags
-                    if tag == 'Make':
-                        exif_data['camera_make'] = str(value)
-                    elif tag == 'Model':
-                        exif_data['camera_model'] = str(value)
-                    elif tag == 'LensModel':
-                        exif_data['lens_model'] = str(value)
-                    elif tag == 'FocalLength':
-                        if isinstance(value, tuple) and len(value) == 2:
-                            focal_length = value[0] / value[1] if value[1] != 0 else value[0]
-                            exif_data['focal_length'] = f"{focal_length:.1f}mm"
-                        else:
-                            exif_data['focal_length'] = f"{value}mm"
-                    elif tag == 'FNumber':
-                        if isinstance(value, tuple) and len(value) == 2:
-                            f_number = value[0] / value[1] if value[1] != 0 else value[0]
-                            exif_data['aperture'] = f"f/{f_number:.1f}"
-                        else:
-                            exif_data['aperture'] = f"f/{value}"
-                    elif tag == 'ExposureTime':
-                        if isinstance(value, tuple) and len(value) == 2:
-                            if value[0] < value[1]:
-                                exif_data['shutter_speed'] = f"1/{int(value[1]/value[0])}"
-                            else:
-                                exif_data['shutter_speed'] = f"{value[0]/value[1]:.2f}s"
-                        else:
-                            exif_data['shutter_speed'] = str(value)
-                    elif tag == 'ISOSpeedRatings':
-                        exif_data['iso'] = f"ISO {value}"
-                    elif tag == 'Flash':
-                        flash_fired = value & 1
-                        exif_data['flash'] = "Yes" if flash_fired else "No"
-            
-            return exif_data
-            
-    except Exception as e:
-        print(f"Error extracting EXIF data from {image_path}: {e}")
-        return {}
-
 @featured_bp.route('/api/featured')
 def get_featured_image():
-    """API endpoint to get current featured image data with EXIF"""
+    """API endpoint to get current featured image data with EXIF (stored at upload)"""
     featured_data = load_featured_data()
-    
-    if featured_data and featured_data.get('image'):
-        # Try multiple possible image locations
-        possible_paths = [
-            os.path.join(STATIC_ASSETS_DIR, featured_data['image']),  # Photography assets dir
-            os.path.join(os.path.dirname(__file__), '..', 'static', 'assets', featured_data['image']),  # Static assets
-            os.path.join('/home/ubuntu/mindseye-complete-restore/src/static/assets', featured_data['image'])  # Absolute static path
-        ]
-        
-        exif_data = {}
-        for image_path in possible_paths:
-            if os.path.exists(image_path):
-                print(f"Found image at: {image_path}")
-                exif_data = extract_exif_data(image_path)
-                break
-            else:
-                print(f"Image not found at: {image_path}")
-        
-        featured_data['exif_data'] = exif_data
-    
     return jsonify(featured_data)
 
-@featured_bp.route('/admin/featured-image')
+@featured_admin_bp.route('/admin/featured-image')
 def featured_admin():
     """Featured image admin interface"""
     if not session.get('admin_logged_in'):
@@ -353,7 +282,7 @@ def featured_admin():
                 <div class="current-featured">
                     <h2 style="color: #ff6b35; margin-bottom: 15px;">Current Featured Image</h2>
                     <div style="display: flex; gap: 20px; align-items: flex-start;">
-                        <img src="/static/assets/{{ featured_data.image }}" 
+                        <img src="/derivatives/640/{{ featured_data.image }}" 
                              alt="{{ featured_data.title }}" 
                              style="width: 300px; height: 200px; object-fit: cover; border-radius: 8px;">
                         <div style="flex: 1;">
@@ -387,7 +316,7 @@ def featured_admin():
             <div class="portfolio-grid">
                 {% for image in portfolio_data %}
                     <div class="portfolio-item">
-                        <img src="/static/assets/{{ image.image }}" alt="{{ image.title }}">
+                        <img src="/derivatives/320/{{ image.image }}" alt="{{ image.title }}" loading="lazy">
                         <div class="portfolio-item-info">
                             <h3>{{ image.title }}</h3>
                             <p>{{ image.description }}</p>
@@ -422,7 +351,7 @@ def featured_admin():
     except Exception as e:
         return f"Error loading featured admin: {str(e)}"
 
-@featured_bp.route('/admin/featured/set', methods=['POST'])
+@featured_admin_bp.route('/admin/featured/set', methods=['POST'])
 def set_featured_image():
     """Set an image as featured and save story to SQL database"""
     if not session.get('admin_logged_in'):
@@ -443,12 +372,15 @@ def set_featured_image():
         if image:
             image.is_featured = True
             image.featured_story = featured_story
+            if not image.exif_extracted:
+                # Uploaded before EXIF was stored - read it once now
+                store_missing_exif(image)
             db.session.commit()
             
-            return redirect(url_for('featured.featured_admin') + '?success=Featured image and story saved successfully!')
+            return redirect(url_for('featured_admin.featured_admin') + '?success=Featured image and story saved successfully!')
         else:
-            return redirect(url_for('featured.featured_admin') + '?error=Image not found')
+            return redirect(url_for('featured_admin.featured_admin') + '?error=Image not found')
             
     except Exception as e:
-        return redirect(url_for('featured.featured_admin') + f'?error=Error setting featured image: {str(e)}')
+        return redirect(url_for('featured_admin.featured_admin') + f'?error=Error setting featured image: {str(e)}')
 
@@ -5,6 +5,7 @@ Serves the current featured image for social media previews
 import os
 from flask import Blueprint, send_file, abort
 from ..models import Image
+from ..http_cache import send_image
 
 og_bp = Blueprint('og', __name__)
 
@@ -25,7 +26,7 @@ def featured_image_og():
         
         # Check if file exists in photography assets
         if os.path.exists(image_path):
-            return send_file(image_path, mimetype='image/jpeg')
+            return send_image(image_path, mimetype='image/jpeg', etag=featured_image.content_hash)
         
         # Try static assets as fallback
         static_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'assets', featured_image.filename)
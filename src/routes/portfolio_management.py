@@ -65,16 +65,15 @@ def portfolio_management():
     
     # Load data from SQL database instead of JSON files
     from ..models import Image, Category
+    from ..portfolio_queries import load_portfolio_images, category_names
     
-    # Get all images from database - sorted by capture date newest to oldest
-    images = Image.query.order_by(
-        Image.upload_date.desc()
-    ).all()
+    # Get all images from database - sorted by upload date newest to oldest
+    images = load_portfolio_images(include_about=True, newest_first=True)
     portfolio_data = []
     
     for image in images:
-        # Get categories for this image
-        image_categories = [cat.category.name for cat in image.categories]
+        # Categories come preloaded with the images
+        image_categories = category_names(image)
         
         portfolio_data.append({
             'id': image.id,
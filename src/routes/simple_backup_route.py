@@ -2,12 +2,11 @@
 Simple backup route that actually works
 """
 
-from flask import Blueprint, send_file, jsonify
+from flask import Blueprint, jsonify
 import os
-import shutil
-import tarfile
-import tempfile
 from datetime import datetime
+from src.models import db
+from src.sqlite_tuning import snapshot
 
 simple_backup_bp = Blueprint('simple_backup', __name__)
 
@@ -15,38 +14,29 @@ simple_backup_bp = Blueprint('simple_backup', __name__)
 def simple_backup_download():
     """Simple backup that actually works"""
     try:
+        from src.backup_stream import archive_response, tree_entries  # tarfile only loads once a backup runs
+        
         # Get current timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_name = f"working_backup_{timestamp}"
         
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        backup_dir = os.path.join(temp_dir, backup_name)
-        os.makedirs(backup_dir)
-        
-        # Copy ALL SOURCE CODE - COMPLETE BACKUP
-        import subprocess
-        
+        # COMPLETE SOURCE CODE BACKUP - files are read in place as the archive streams
         # Get the actual project directory (GitHub repository)
         project_root = "/home/ubuntu/minds-eye-recovery"
+        entries = []
         if os.path.exists(project_root):
-            # Copy entire project except node_modules and other large dirs
-            for item in os.listdir(project_root):
-                if item not in ['node_modules', '.git', '__pycache__', '.next', 'dist', 'build']:
-                    source_path = os.path.join(project_root, item)
-                    dest_path = os.path.join(backup_dir, item)
-                    
-                    if os.path.isdir(source_path):
-                        shutil.copytree(source_path, dest_path, ignore=shutil.ignore_patterns('__pycache__', '*.pyc', 'node_modules'))
-                    else:
-                        shutil.copy2(source_path, dest_path)
+            # Entire project except node_modules and other large dirs
+            entries = tree_entries(project_root, ignore=('node_modules', '.git', '__pycache__', '.next', 'dist',
+                                                         'build', '*.pyc'))
         
-        source_file_count = sum([len(files) for r, d, files in os.walk(backup_dir)])
+        source_file_count = len(entries)
         
-        # Copy database file
-        db_source = "/data/mindseye.db"
+        # Database file, as a consistent snapshot - the live file may be mid-commit
+        db_source = db.engine.url.database
+        snapshot_path = None
         if os.path.exists(db_source):
-            shutil.copy2(db_source, backup_dir)
+            snapshot_path = snapshot(db_source)
+            entries.append(('mindseye.db', snapshot_path))
         
         # Create backup info
         info_content = f"""COMPLETE SOURCE CODE BACKUP: {datetime.now()}
@@ -54,22 +44,13 @@ Database: {'✅ Included' if os.path.exists(db_source) else '❌ Not found'}
 Total Files: {source_file_count} files
 INCLUDES: Complete source code, frontend, backend, all files
 """
-        with open(os.path.join(backup_dir, "backup_info.txt"), 'w') as f:
-            f.write(info_content)
-        
-        # Create tar.gz file
-        tar_path = os.path.join(temp_dir, f"{backup_name}.tar.gz")
-        
-        with tarfile.open(tar_path, 'w:gz') as tar:
-            for item in os.listdir(backup_dir):
-                item_path = os.path.join(backup_dir, item)
-                tar.add(item_path, arcname=item)
+        entries.append(("backup_info.txt", info_content.encode('utf-8')))
         
-        # Return the file
-        return send_file(tar_path, 
-                        as_attachment=True, 
-                        download_name=f"{backup_name}.tar.gz",
-                        mimetype='application/gzip')
+        # Stream the tar.gz as it is compressed
+        response = archive_response(entries, f"{backup_name}.tar.gz")
+        if snapshot_path:
+            response.call_on_close(lambda: os.remove(snapshot_path))
+        return response
         
     except Exception as e:
         return jsonify({'error': f'Backup failed: {str(e)}'}), 500
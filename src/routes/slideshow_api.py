@@ -5,8 +5,10 @@ Uses existing Image table with is_slideshow_background field
 
 from flask import Blueprint, request, jsonify, session, redirect, url_for
 from ..models import db, Image
+from ..http_cache import image_url
 
 slideshow_api_bp = Blueprint('slideshow_api', __name__)
+slideshow_admin_bp = Blueprint('slideshow_admin', __name__)  # Registered only with ENABLE_ADMIN_ROUTES
 
 @slideshow_api_bp.route('/api/slideshow-images')
 def get_slideshow_images():
@@ -21,7 +23,7 @@ def get_slideshow_images():
                 'id': image.id,
                 'filename': image.filename,
                 'title': image.title,
-                'url': f'https://minds-eye-master-production.up.railway.app/static/assets/{image.filename}'
+                'url': image_url(image)
             })
         
         return jsonify({
@@ -38,7 +40,7 @@ def get_slideshow_images():
             'images': []
         }), 500
 
-@slideshow_api_bp.route('/admin/slideshow-toggle', methods=['POST'])
+@slideshow_admin_bp.route('/admin/slideshow-toggle', methods=['POST'])
 def toggle_slideshow_image():
     """Toggle slideshow status for an image"""
     print(f"🔍 Slideshow toggle called - Session: {session.get('admin_logged_in')}")
@@ -231,7 +231,7 @@ def slideshow_manager():
                     {% for bg in slideshow_images %}
                     <div class="slideshow-item">
                         <div class="order">{{ bg.display_order }}</div>
-                        <img src="/static/assets/{{ bg.image.filename }}" alt="{{ bg.image.title }}">
+                        <img src="/derivatives/320/{{ bg.image.filename }}" alt="{{ bg.image.title }}">
                         <div class="info">
                             <h4>{{ bg.image.title }}</h4>
                             <form method="POST" action="/admin/slideshow-manager/remove" style="margin: 5px 0;">
@@ -304,7 +304,7 @@ def slideshow_manager():
                     {% if in_slideshow %}
                     <div class="in-slideshow">IN SLIDESHOW</div>
                     {% endif %}
-                    <img src="/static/assets/{{ image.filename }}" alt="{{ image.title }}">
+                    <img src="/derivatives/320/{{ image.filename }}" alt="{{ image.title }}" loading="lazy">
                     <div class="info">
                         <h4>{{ image.title }}</h4>
                         <div class="categories">
@@ -0,0 +1,113 @@
+"""
+SQLite connection setup for Mind's Eye Photography
+Every new SQLite connection gets the pragmas from config: WAL journaling (so
+admin writes no longer block public reads across gunicorn workers),
+synchronous=NORMAL, a larger page cache, mmap reads, in-memory temp storage
+and a busy timeout. Importing this module installs the hook for every engine.
+
+snapshot() makes the consistent copy of the database that backups archive -
+copying the live file could capture a page written half-way through a commit.
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import (SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_CACHE_SIZE_MB, SQLITE_MMAP_SIZE_MB,
+                     SQLITE_TEMP_STORE, SQLITE_BUSY_TIMEOUT_MS, SQLITE_BACKUP_STEP_PAGES,
+                     SQLITE_BACKUP_STEP_PAUSE_MS)
+
+JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+SYNCHRONOUS_MODES = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+TEMP_STORES = {'DEFAULT', 'FILE', 'MEMORY'}
+
+
+def _choice(name, value, allowed):
+    value = value.upper()
+    if value not in allowed:
+        raise ValueError(f"{name} must be one of {', '.join(sorted(allowed))}, got {value!r}")
+    return value
+
+
+# Order matters: busy_timeout first so switching the journal mode waits out other connections
+PRAGMAS = (
+    ('busy_timeout', SQLITE_BUSY_TIMEOUT_MS),
+    ('journal_mode', _choice('SQLITE_JOURNAL_MODE', SQLITE_JOURNAL_MODE, JOURNAL_MODES)),
+    ('synchronous', _choice('SQLITE_SYNCHRONOUS', SQLITE_SYNCHRONOUS, SYNCHRONOUS_MODES)),
+    ('cache_size', -SQLITE_CACHE_SIZE_MB * 1024),  # Negative means KiB rather than pages
+    ('mmap_size', SQLITE_MMAP_SIZE_MB * 1024 * 1024),
+    ('temp_store', _choice('SQLITE_TEMP_STORE', SQLITE_TEMP_STORE, TEMP_STORES)),
+)
+
+
+@event.listens_for(Engine, 'connect')
+def configure_connection(dbapi_connection, connection_record=None):
+    """Apply PRAGMAS to a new SQLite connection (other databases are left alone)"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def current_settings(connection):
+    """The pragmas as SQLite reports them on a SQLAlchemy connection, for the debug endpoints"""
+    return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name, _ in PRAGMAS}
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def snapshot(database_path, dest_path=None, pages=SQLITE_BACKUP_STEP_PAGES,
+             pause=SQLITE_BACKUP_STEP_PAUSE_MS / 1000, max_restarts=3):
+    """
+    Consistent copy of the SQLite database at database_path, returns its path
+    Uses the online backup API `pages` pages per step, pausing between steps, so
+    a long copy never holds a lock or the disk for long. A commit from another
+    connection between steps restarts the copy; after max_restarts the rest is
+    copied in one step instead, a single read transaction (which in WAL mode
+    blocks no one). Without dest_path the copy goes to a new temp file, which
+    the caller removes. The copy is a self-contained rollback-journal database.
+    """
+    if dest_path is None:
+        handle, dest_path = tempfile.mkstemp(prefix='mindseye-snapshot-', suffix='.db')
+        os.close(handle)
+    source = sqlite3.connect(database_path)
+    configure_connection(source)
+    try:
+        restarts = 0
+        last_remaining = None
+
+        def progress(status, remaining, total):
+            nonlocal restarts, last_remaining
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts > max_restarts:
+                    raise _TooManyRestarts()
+            last_remaining = remaining
+            if remaining and pause:
+                time.sleep(pause)
+
+        target = sqlite3.connect(dest_path)
+        try:
+            try:
+                source.backup(target, pages=pages, progress=progress)
+            except _TooManyRestarts:
+                print(f"⚠️ Snapshot of {database_path} kept restarting under writes - copying in one step")
+                source.backup(target, pages=-1)
+            target.execute("PRAGMA journal_mode=DELETE")  # The live database's WAL flag is copied too
+        finally:
+            target.close()
+    except Exception:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    finally:
+        source.close()
+    return dest_path
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 WSGI Entry Point for Mind's Eye Photography
-Railway deployment configuration
+Railway deployment configuration - gunicorn settings live in gunicorn.conf.py
 """
 import os
 import sys
@@ -9,10 +9,10 @@ import sys
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Import the Flask app
-from main import app
+# Build the Flask app (one-time initialization; gunicorn runs init_worker in each worker after fork)
+from main import create_app, init_worker
+app = create_app()
 
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
-
+    init_worker(app).run(host='0.0.0.0', port=port, debug=False)